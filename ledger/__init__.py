@@ -25,6 +25,8 @@ Usage:
     result = ledger.execute(tx)
 """
 
+import importlib
+
 # Core types
 from .core import (
     LedgerView,
@@ -36,6 +38,7 @@ from .core import (
     OriginType,
     build_transaction,
     empty_pending_transaction,
+    merge_pending_transactions,
     Unit,
     UnitStateChange,
     ExecuteResult,
@@ -46,6 +49,7 @@ from .core import (
     UnitNotRegistered,
     WalletNotRegistered,
     bilateral_transfer_rule,
+    is_terminal_state,
     cash,
     SYSTEM_WALLET,
     UNIT_TYPE_CASH,
@@ -68,234 +72,299 @@ from .core import (
 # Ledger
 from .ledger import Ledger
 
-# Black-Scholes pricing and Greeks
-from .black_scholes import (
-    call, put,
-    call_delta, put_delta,
-    call_gamma, put_gamma,
-    call_vega, put_vega,
-    call_theta, put_theta,
-    call_impvol, put_impvol,
-    gamma, vega,
-)
-
-# Options
-from .units.option import (
-    create_option_unit,
-    compute_option_settlement,
-    compute_option_exercise,
-    get_option_intrinsic_value,
-    get_option_moneyness,
-    option_contract,
-    transact as option_transact,
-)
-
-# Forwards
-from .units.forward import (
-    create_forward_unit,
-    compute_forward_settlement,
-    compute_early_termination,
-    get_forward_value,
-    forward_contract,
-    transact as forward_transact,
-)
-
-# Delta hedge
-from .strategies.delta_hedge import (
-    create_delta_hedge_unit,
-    compute_rebalance,
-    compute_liquidation,
-    get_hedge_state,
-    compute_hedge_pnl_breakdown,
-    delta_hedge_contract,
-)
-
-# Stocks
-from .units.stock import (
-    Dividend,
-    SplitAdjustment,
-    BorrowSplitAdjustment,
-    create_stock_unit,
-    process_dividends,
-    compute_stock_split,
-    compute_split_adjustments,
-    stock_contract,
-    transact as stock_transact,
-)
-
-# DeferredCash
-from .units.deferred_cash import (
-    create_deferred_cash_unit,
-    compute_deferred_cash_settlement,
-    transact as deferred_cash_transact,
-    deferred_cash_contract,
-)
-
-# Bonds
-from .units.bond import (
-    Coupon,
-    CouponEntitlement,
-    create_bond_unit,
-    compute_accrued_interest,
-    compute_coupon_entitlements,
-    process_coupons,
-    compute_redemption,
-    transact as bond_transact,
-    bond_contract,
-    year_fraction,
-)
-
-# Futures
-from .units.future import (
-    create_future,
-    mark_to_market as future_mark_to_market,
-    future_contract,
-    transact as future_transact,
-)
-
-# Autocallables
-from .units.autocallable import (
-    create_autocallable,
-    compute_observation,
-    compute_maturity_payoff,
-    autocallable_contract,
-    transact as autocallable_transact,
-    get_autocallable_status,
-    get_total_coupons_paid,
-)
-
-# Margin Loans
-from .units.margin_loan import (
-    # Frozen dataclasses (pure function architecture)
-    MarginLoanTerms,
-    MarginLoanState,
-    MarginStatusResult,
-    # Adapter functions
-    load_margin_loan,
-    to_state_dict,
-    # Pure calculation functions (no LedgerView, all inputs explicit)
-    calculate_collateral_value,
-    calculate_pending_interest,
-    calculate_total_debt,
-    calculate_margin_status,
-    calculate_interest_accrual,
-    # Convenience functions (load + calculate)
-    create_margin_loan,
-    compute_collateral_value,
-    compute_margin_status,
-    compute_interest_accrual,
-    compute_margin_call,
-    compute_margin_cure,
-    compute_liquidation as compute_margin_loan_liquidation,
-    compute_repayment,
-    compute_add_collateral,
-    transact as margin_loan_transact,
-    margin_loan_contract,
-    MARGIN_STATUS_HEALTHY,
-    MARGIN_STATUS_WARNING,
-    MARGIN_STATUS_BREACH,
-    MARGIN_STATUS_LIQUIDATION,
-)
-
-# Portfolio Swaps
-from .units.portfolio_swap import (
-    create_portfolio_swap,
-    compute_portfolio_nav,
-    compute_funding_amount,
-    compute_swap_reset,
-    compute_termination as compute_swap_termination,
-    transact as portfolio_swap_transact,
-    portfolio_swap_contract,
-)
-
-# Structured Notes
-from .units.structured_note import (
-    create_structured_note,
-    compute_performance,
-    compute_payoff_rate,
-    compute_coupon_payment as compute_structured_note_coupon,
-    compute_maturity_payoff as compute_structured_note_maturity,
-    structured_note_contract,
-    transact as structured_note_transact,
-    generate_structured_note_coupon_schedule,
-)
-
-# Borrow Records (SBL)
-from .units.borrow_record import (
-    create_borrow_record_unit,
-    initiate_borrow,
-    compute_borrow_return,
-    initiate_recall,
-    compute_available_position,
-    compute_borrow_fee,
-    compute_required_collateral,
-    validate_short_sale,
-    get_active_borrows,
-    get_total_borrowed,
-    borrow_record_contract,
-    BorrowStatus,
-    ContractType as BorrowContractType,
-)
+# Everything else resolves on first access (module __getattr__ below), so
+# `import ledger` only loads the core types and the Ledger; NumPy, SciPy and
+# the unit modules load when a name that needs them is first used.
+# Module -> public names ('name as alias' re-exports under another name).
+_LAZY_IMPORTS = {
+    # Black-Scholes pricing and Greeks
+    '.black_scholes': (
+        'call', 'put',
+        'call_delta', 'put_delta',
+        'call_gamma', 'put_gamma',
+        'call_vega', 'put_vega',
+        'call_theta', 'put_theta',
+        'call_impvol', 'put_impvol',
+        'gamma', 'vega',
+        'bs_greeks', 'bs_batch', 'call_impvol_batch', 'put_impvol_batch',
+        'implied_vol', 'ImpliedVolResult',
+    ),
+    # Options
+    '.units.option': (
+        'create_option_unit',
+        'compute_option_settlement',
+        'compute_option_exercise',
+        'get_option_intrinsic_value',
+        'get_option_moneyness',
+        'option_contract',
+        'option_wake_time',
+        'transact as option_transact',
+    ),
+    # Forwards
+    '.units.forward': (
+        'create_forward_unit',
+        'compute_forward_settlement',
+        'compute_early_termination',
+        'get_forward_value',
+        'forward_contract',
+        'forward_wake_time',
+        'transact as forward_transact',
+    ),
+    # Delta hedge
+    '.strategies.delta_hedge': (
+        'create_delta_hedge_unit',
+        'compute_rebalance',
+        'compute_liquidation',
+        'get_hedge_state',
+        'compute_hedge_pnl_breakdown',
+        'delta_hedge_contract',
+    ),
+    # Stocks
+    '.units.stock': (
+        'Dividend',
+        'SplitAdjustment',
+        'BorrowSplitAdjustment',
+        'create_stock_unit',
+        'process_dividends',
+        'compute_stock_split',
+        'compute_split_adjustments',
+        'stock_contract',
+        'transact as stock_transact',
+    ),
+    # DeferredCash
+    '.units.deferred_cash': (
+        'create_deferred_cash_unit',
+        'compute_deferred_cash_settlement',
+        'transact as deferred_cash_transact',
+        'deferred_cash_contract',
+        'deferred_cash_wake_time',
+    ),
+    # Bonds
+    '.units.bond': (
+        'Coupon',
+        'CouponEntitlement',
+        'create_bond_unit',
+        'compute_accrued_interest',
+        'compute_coupon_entitlements',
+        'process_coupons',
+        'compute_redemption',
+        'transact as bond_transact',
+        'bond_contract',
+        'year_fraction',
+    ),
+    # Futures
+    '.units.future': (
+        'create_future',
+        'mark_to_market as future_mark_to_market',
+        'future_contract',
+        'transact as future_transact',
+    ),
+    # Autocallables
+    '.units.autocallable': (
+        'create_autocallable',
+        'compute_observation',
+        'compute_maturity_payoff',
+        'autocallable_contract',
+        'transact as autocallable_transact',
+        'get_autocallable_status',
+        'get_total_coupons_paid',
+    ),
+    # Margin Loans
+    '.units.margin_loan': (
+        # Frozen dataclasses (pure function architecture)
+        'MarginLoanTerms',
+        'MarginLoanState',
+        'MarginStatusResult',
+        # Adapter functions
+        'load_margin_loan',
+        'to_state_dict',
+        # Pure calculation functions (no LedgerView, all inputs explicit)
+        'calculate_collateral_value',
+        'calculate_pending_interest',
+        'calculate_total_debt',
+        'calculate_margin_status',
+        'calculate_interest_accrual',
+        # Convenience functions (load + calculate)
+        'create_margin_loan',
+        'compute_collateral_value',
+        'compute_margin_status',
+        'compute_interest_accrual',
+        'compute_margin_call',
+        'compute_margin_cure',
+        'compute_liquidation as compute_margin_loan_liquidation',
+        'compute_repayment',
+        'compute_add_collateral',
+        'transact as margin_loan_transact',
+        'margin_loan_contract',
+        'MARGIN_STATUS_HEALTHY',
+        'MARGIN_STATUS_WARNING',
+        'MARGIN_STATUS_BREACH',
+        'MARGIN_STATUS_LIQUIDATION',
+    ),
+    # Portfolio Swaps
+    '.units.portfolio_swap': (
+        'create_portfolio_swap',
+        'compute_portfolio_nav',
+        'compute_funding_amount',
+        'compute_swap_reset',
+        'compute_termination as compute_swap_termination',
+        'transact as portfolio_swap_transact',
+        'portfolio_swap_contract',
+    ),
+    # Structured Notes
+    '.units.structured_note': (
+        'create_structured_note',
+        'compute_performance',
+        'compute_payoff_rate',
+        'compute_coupon_payment as compute_structured_note_coupon',
+        'compute_maturity_payoff as compute_structured_note_maturity',
+        'structured_note_contract',
+        'transact as structured_note_transact',
+        'generate_structured_note_coupon_schedule',
+    ),
+    # Borrow Records (SBL)
+    '.units.borrow_record': (
+        'create_borrow_record_unit',
+        'initiate_borrow',
+        'compute_borrow_return',
+        'initiate_recall',
+        'compute_available_position',
+        'compute_borrow_fee',
+        'compute_required_collateral',
+        'validate_short_sale',
+        'get_active_borrows',
+        'get_total_borrowed',
+        'borrow_record_contract',
+        'BorrowStatus',
+        'ContractType as BorrowContractType',
+    ),
+    # Lifecycle
+    '.lifecycle_engine': (
+        'LifecycleEngine', 'StepResult', 'EngineCheckpoint',
+    ),
+    '.engine_metrics': (
+        'EngineMetrics', 'LatencyHistogram',
+    ),
+    # Scheduled Events (simplified API)
+    '.scheduled_events': (
+        'Event',
+        'EventScheduler',
+        'CalendarEventScheduler',
+        'EventHandler',
+        'event_key',
+        'RecurrenceRule',
+        'RecurringEvent',
+        'SchedulerSnapshot',
+        'dividend_event',
+        'coupon_event',
+        'recurring_coupon_event',
+        'maturity_event',
+        'expiry_event',
+        'settlement_event',
+        'split_event',
+    ),
+    '.event_handlers': (
+        'handle_dividend',
+        'handle_coupon',
+        'handle_maturity',
+        'handle_expiry',
+        'handle_settlement',
+        'handle_split',
+        'DEFAULT_HANDLERS',
+        'create_default_scheduler',
+    ),
+    # Pricing sources
+    '.pricing_source': (
+        'PricingSource',
+        'StaticPricingSource',
+        'TimeSeriesPricingSource',
+        'PriceCursor',
+        'PriceColumn',
+        'to_epoch_us',
+        'from_epoch_us',
+    ),
+    '.price_store': (
+        'PriceStoreWriter',
+        'DiskPricingSource',
+    ),
+    '.price_snapshot': (
+        'PriceSnapshot',
+        'validate_price',
+    ),
+    '.price_feed': (
+        'PriceFeedIngestor',
+        'FeedReplayer',
+        'parse_update',
+        'format_update',
+        'benchmark_latency',
+    ),
+    '.resampling': (
+        'ResampledPrices',
+        'resample',
+        'regular_grid',
+        'daily_grid',
+    ),
+    '.fx_pricing': (
+        'FXRateGraph',
+        'MultiCurrencyPricingSource',
+    ),
+    '.portfolio_valuation': (
+        'PortfolioValuation',
+    ),
+    '.pnl_attribution': (
+        'PNL_COMPONENTS',
+        'PnLStore',
+        'PnLAttribution',
+    ),
+    '.vol_surface': (
+        'VolSurface',
+        'VolSurfaceCache',
+    ),
+    '.bitemporal_pricing': (
+        'PriceObservation',
+        'BitemporalPricingSource',
+        'KnownTimePricingView',
+    ),
+    # QIS (Quantitative Investment Strategy)
+    '.units.qis': (
+        'create_qis',
+        'compute_nav as compute_qis_nav',
+        'accrue_financing as accrue_qis_financing',
+        'compute_rebalance as compute_qis_rebalance',
+        'compute_payoff as compute_qis_payoff',
+        'compute_qis_settlement',
+        'qis_contract',
+        'leveraged_strategy',
+        'fixed_weight_strategy',
+        'get_qis_nav',
+        'get_qis_return',
+        'get_qis_leverage',
+        'Strategy as QISStrategy',
+    ),
+}
 
-# Lifecycle
-from .lifecycle_engine import LifecycleEngine
 
-# Scheduled Events (simplified API)
-from .scheduled_events import (
-    Event,
-    EventScheduler,
-    EventHandler,
-    dividend_event,
-    coupon_event,
-    maturity_event,
-    expiry_event,
-    settlement_event,
-    split_event,
-)
 
-from .event_handlers import (
-    handle_dividend,
-    handle_coupon,
-    handle_maturity,
-    handle_expiry,
-    handle_settlement,
-    handle_split,
-    DEFAULT_HANDLERS,
-    create_default_scheduler,
-)
+def _lazy_attrs():
+    """Public name -> (module, attribute) for every entry of _LAZY_IMPORTS."""
+    attrs = {}
+    for module, names in _LAZY_IMPORTS.items():
+        for entry in names:
+            name, _, alias = entry.partition(' as ')
+            attrs[alias or name] = (module, name)
+    return attrs
 
-# Pricing sources
-from .pricing_source import (
-    PricingSource,
-    StaticPricingSource,
-    TimeSeriesPricingSource,
-)
 
-# QIS (Quantitative Investment Strategy)
-from .units.qis import (
-    create_qis,
-    compute_nav as compute_qis_nav,
-    accrue_financing as accrue_qis_financing,
-    compute_rebalance as compute_qis_rebalance,
-    compute_payoff as compute_qis_payoff,
-    compute_qis_settlement,
-    qis_contract,
-    leveraged_strategy,
-    fixed_weight_strategy,
-    get_qis_nav,
-    get_qis_return,
-    get_qis_leverage,
-    Strategy as QISStrategy,
-)
+_LAZY_ATTRS = _lazy_attrs()
 
 __all__ = [
     # Core
     'LedgerView', 'Move', 'Transaction', 'PendingTransaction', 'TransactionOrigin', 'OriginType',
-    'build_transaction', 'empty_pending_transaction',
+    'build_transaction', 'empty_pending_transaction', 'merge_pending_transactions',
     'Unit', 'UnitStateChange',
     'ExecuteResult', 'LedgerError', 'InsufficientFunds', 'BalanceConstraintViolation',
     'TransferRuleViolation', 'UnitNotRegistered', 'WalletNotRegistered',
-    'bilateral_transfer_rule', 'cash',
+    'bilateral_transfer_rule', 'is_terminal_state', 'cash',
     'SYSTEM_WALLET',
     'UNIT_TYPE_CASH', 'UNIT_TYPE_STOCK', 'UNIT_TYPE_BILATERAL_OPTION',
     'UNIT_TYPE_BILATERAL_FORWARD', 'UNIT_TYPE_DEFERRED_CASH', 'UNIT_TYPE_DELTA_HEDGE_STRATEGY',
@@ -306,14 +375,15 @@ __all__ = [
     # Black-Scholes
     'call', 'put', 'call_delta', 'put_delta', 'call_gamma', 'put_gamma',
     'call_vega', 'put_vega', 'call_theta', 'put_theta', 'call_impvol', 'put_impvol',
-    'gamma', 'vega',
+    'gamma', 'vega', 'bs_greeks', 'bs_batch', 'call_impvol_batch', 'put_impvol_batch',
+    'implied_vol', 'ImpliedVolResult',
     # Options
     'create_option_unit', 'compute_option_settlement',
     'compute_option_exercise', 'get_option_intrinsic_value', 'get_option_moneyness',
-    'option_contract', 'option_transact',
+    'option_contract', 'option_wake_time', 'option_transact',
     # Forwards
     'create_forward_unit', 'compute_forward_settlement', 'compute_early_termination',
-    'get_forward_value', 'forward_contract', 'forward_transact',
+    'get_forward_value', 'forward_contract', 'forward_wake_time', 'forward_transact',
     # Delta hedge
     'create_delta_hedge_unit', 'compute_rebalance', 'compute_liquidation',
     'get_hedge_state', 'compute_hedge_pnl_breakdown', 'delta_hedge_contract',
@@ -323,7 +393,7 @@ __all__ = [
     'compute_split_adjustments', 'stock_contract', 'stock_transact',
     # DeferredCash
     'create_deferred_cash_unit', 'compute_deferred_cash_settlement',
-    'deferred_cash_transact', 'deferred_cash_contract',
+    'deferred_cash_transact', 'deferred_cash_contract', 'deferred_cash_wake_time',
     # Bonds
     'Coupon', 'CouponEntitlement',
     'create_bond_unit', 'compute_accrued_interest', 'compute_coupon_entitlements',
@@ -361,17 +431,30 @@ __all__ = [
     'compute_required_collateral', 'validate_short_sale', 'get_active_borrows',
     'get_total_borrowed', 'borrow_record_contract', 'BorrowStatus', 'BorrowContractType',
     # Lifecycle
-    'SmartContract', 'LifecycleEngine',
+    'SmartContract', 'LifecycleEngine', 'StepResult', 'EngineCheckpoint',
+    'EngineMetrics', 'LatencyHistogram',
     # Scheduled Events (simplified)
-    'Event', 'EventScheduler', 'EventHandler',
-    'dividend_event', 'coupon_event', 'maturity_event',
+    'Event', 'EventScheduler', 'CalendarEventScheduler', 'EventHandler', 'event_key',
+    'RecurrenceRule', 'RecurringEvent', 'SchedulerSnapshot',
+    'dividend_event', 'coupon_event', 'recurring_coupon_event', 'maturity_event',
     'expiry_event', 'settlement_event', 'split_event',
     # Event Handlers
     'handle_dividend', 'handle_coupon', 'handle_maturity',
     'handle_expiry', 'handle_settlement', 'handle_split',
     'DEFAULT_HANDLERS', 'create_default_scheduler',
     # Pricing
-    'PricingSource', 'StaticPricingSource', 'TimeSeriesPricingSource',
+    'PricingSource', 'StaticPricingSource', 'TimeSeriesPricingSource', 'PriceCursor', 'PriceColumn',
+    'to_epoch_us', 'from_epoch_us',
+    'PriceStoreWriter', 'DiskPricingSource',
+    'PriceObservation', 'BitemporalPricingSource', 'KnownTimePricingView',
+    'PriceSnapshot', 'validate_price', 'FXRateGraph', 'MultiCurrencyPricingSource',
+    'ResampledPrices', 'resample', 'regular_grid', 'daily_grid',
+    'PriceFeedIngestor', 'FeedReplayer', 'parse_update', 'format_update', 'benchmark_latency',
+    'PortfolioValuation',
+    # P&L attribution
+    'PNL_COMPONENTS', 'PnLStore', 'PnLAttribution',
+    # Volatility surfaces
+    'VolSurface', 'VolSurfaceCache',
     # QIS
     'UNIT_TYPE_QIS', 'create_qis', 'compute_qis_nav', 'accrue_qis_financing',
     'compute_qis_rebalance', 'compute_qis_payoff', 'compute_qis_settlement',
@@ -380,3 +463,17 @@ __all__ = [
 ]
 
 __version__ = '4.0.0'
+
+
+def __getattr__(name):
+    try:
+        module, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
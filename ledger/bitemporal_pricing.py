@@ -0,0 +1,320 @@
+"""
+bitemporal_pricing.py - Bitemporal price observations
+
+Implements the bitemporal model of the market data specification
+(Ledger_Spec_v11.0/market_data_mvp_v2.0.tex, sections 5-6) for prices:
+
+- Every observation carries t_obs (when the price happened) and t_known
+  (when we admitted it), with t_obs <= t_known up to a clock-skew tolerance
+- Nothing is overwritten: a restatement is a new row with the same t_obs,
+  a later t_known and restates_ref pointing at the row it corrects
+- Two query modes:
+    * What did we know at T?  -> as_known(T) / known_at(unit, t, T)
+    * Best current estimate of the truth at T_o -> best_estimate(unit, T_o)
+- A "current" projection (latest-known value per (unit, t_obs)) is kept
+  up to date on every write and serves get_price()/get_prices(), so live
+  pricing does not pay the bitemporal query cost
+
+Index structures (no history scans):
+- projection: per unit, a time-sorted PriceColumn of distinct t_obs
+- versions: per (unit, t_obs), known times and row ids sorted by t_known
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from .pricing_source import PriceColumn, to_epoch_us
+
+
+# Permitted clock skew for t_obs <= t_known (spec: on the order of one second)
+DEFAULT_SKEW_TOLERANCE = timedelta(seconds=1)
+
+
+@dataclass(frozen=True, slots=True)
+class PriceObservation:
+    """
+    One bitemporal price row. Rows are never modified.
+
+    Attributes:
+        row_id: Surrogate id (position in the append-only row log)
+        unit: Unit symbol (the business key together with t_obs)
+        value: Price in base currency
+        t_obs: When the price occurred in the world
+        t_known: When the platform admitted the row
+        source: Name of the delivering source
+        restates_ref: row_id of the row this one corrects (None on originals)
+    """
+    row_id: int
+    unit: str
+    value: Decimal
+    t_obs: datetime
+    t_known: datetime
+    source: str = ""
+    restates_ref: Optional[int] = None
+
+
+class BitemporalPricingSource:
+    """
+    PricingSource over append-only bitemporal price observations.
+
+    get_price()/get_prices() answer from the current projection: the best
+    current estimate of the latest price at or before the timestamp. For
+    reproducing past results, as_known(T) returns a PricingSource that sees
+    only rows admitted by T.
+
+    Example:
+        pricer = BitemporalPricingSource()
+        r1 = pricer.record("EURUSD", Decimal("1.0852"), t_obs=t, t_known=t)
+        pricer.restate(r1, Decimal("1.0853"), t_known=t_later)
+        pricer.as_known(before_restatement).get_price("EURUSD", t)  # 1.0852
+        pricer.get_price("EURUSD", t)                                # 1.0853
+    """
+
+    def __init__(
+        self,
+        base_currency: str = "USD",
+        skew_tolerance: timedelta = DEFAULT_SKEW_TOLERANCE,
+    ):
+        """
+        Create an empty source.
+
+        Args:
+            base_currency: Base currency (always prices at 1.0)
+            skew_tolerance: Allowed amount by which t_obs may exceed t_known
+        """
+        self.base_currency = base_currency
+        self.skew_tolerance = skew_tolerance
+        self.rows: List[PriceObservation] = []
+        self._projection: Dict[str, PriceColumn] = {}
+        self._versions: Dict[Tuple[str, int], Tuple[List[int], List[int]]] = {}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        unit: str,
+        value: Decimal,
+        t_obs: datetime,
+        t_known: datetime,
+        source: str = "",
+        restates_ref: Optional[int] = None,
+    ) -> int:
+        """
+        Append an observation.
+
+        Args:
+            unit: Unit symbol
+            value: Price in base currency
+            t_obs: Observation time
+            t_known: Admission time
+            source: Source name
+            restates_ref: row_id being corrected (must be same unit and t_obs)
+
+        Returns:
+            row_id of the new row
+
+        Raises:
+            ValueError: If t_obs exceeds t_known by more than the skew
+                        tolerance, or restates_ref does not match
+        """
+        if t_obs - t_known > self.skew_tolerance:
+            raise ValueError(f"t_obs {t_obs} is after t_known {t_known} beyond tolerance")
+        if restates_ref is not None:
+            prior = self.rows[restates_ref]
+            if prior.unit != unit or prior.t_obs != t_obs:
+                raise ValueError(f"Row {restates_ref} is not an observation of {unit} at {t_obs}")
+
+        row_id = len(self.rows)
+        row = PriceObservation(row_id, unit, value, t_obs, t_known, source, restates_ref)
+        self.rows.append(row)
+
+        obs_us = to_epoch_us(t_obs)
+        known_us = to_epoch_us(t_known)
+        versions = self._versions.get((unit, obs_us))
+        if versions is None:
+            self._versions[(unit, obs_us)] = ([known_us], [row_id])
+            self._project_new(unit, row)
+        else:
+            known, row_ids = versions
+            pos = bisect_right(known, known_us)
+            known.insert(pos, known_us)
+            row_ids.insert(pos, row_id)
+            if pos == len(known) - 1:
+                self._project_update(unit, obs_us, row)
+        return row_id
+
+    def restate(
+        self,
+        row_id: int,
+        value: Decimal,
+        t_known: datetime,
+        source: Optional[str] = None,
+    ) -> int:
+        """
+        Correct an existing row by appending a restatement.
+
+        Args:
+            row_id: Row being corrected
+            value: Corrected price
+            t_known: When the correction was admitted
+            source: Source name (defaults to the corrected row's)
+
+        Returns:
+            row_id of the restatement
+        """
+        prior = self.rows[row_id]
+        return self.record(
+            prior.unit, value, prior.t_obs, t_known,
+            source=prior.source if source is None else source,
+            restates_ref=row_id,
+        )
+
+    def _project_new(self, unit: str, row: PriceObservation) -> None:
+        """Add a new t_obs to the current projection."""
+        column = self._projection.get(unit)
+        if column is None:
+            column = self._projection[unit] = PriceColumn()
+        column.append(row.t_obs, row.value)
+
+    def _project_update(self, unit: str, obs_us: int, row: PriceObservation) -> None:
+        """Replace the projected value for an existing t_obs."""
+        column = self._projection[unit]
+        idx = column.index_at(obs_us)
+        column.values[idx] = row.value
+        column.floats[idx] = float(row.value)
+
+    # ------------------------------------------------------------------
+    # Current projection (hot path)
+    # ------------------------------------------------------------------
+
+    def get_price(self, unit_symbol: str, timestamp: datetime) -> Optional[Decimal]:
+        """Best current estimate of the latest price at or before timestamp."""
+        if unit_symbol == self.base_currency:
+            return Decimal("1.0")
+        column = self._projection.get(unit_symbol)
+        if column is None:
+            return None
+        idx = column.index_at(to_epoch_us(timestamp))
+        return column.values[idx] if idx >= 0 else None
+
+    def get_prices(self, units: Set[str], timestamp: datetime) -> Dict[str, Decimal]:
+        """Best current estimates for multiple units at a specific timestamp."""
+        prices = {}
+        for unit in units:
+            price = self.get_price(unit, timestamp)
+            if price is not None:
+                prices[unit] = price
+        return prices
+
+    # ------------------------------------------------------------------
+    # Bitemporal queries
+    # ------------------------------------------------------------------
+
+    def best_estimate(
+        self,
+        unit: str,
+        t_obs: datetime,
+        known_time: Optional[datetime] = None,
+    ) -> Optional[PriceObservation]:
+        """
+        Row with the latest t_known among rows observed exactly at t_obs.
+
+        Args:
+            unit: Unit symbol
+            t_obs: Observation time (exact match)
+            known_time: Only consider rows admitted at or before this time
+
+        Returns:
+            The winning row, or None
+        """
+        versions = self._versions.get((unit, to_epoch_us(t_obs)))
+        if versions is None:
+            return None
+        known, row_ids = versions
+        pos = len(known) if known_time is None else bisect_right(known, to_epoch_us(known_time))
+        return self.rows[row_ids[pos - 1]] if pos else None
+
+    def known_at(
+        self,
+        unit: str,
+        timestamp: datetime,
+        known_time: datetime,
+    ) -> Optional[PriceObservation]:
+        """
+        What we knew at known_time about the price in effect at timestamp.
+
+        Among rows admitted by known_time, takes the latest t_obs at or
+        before timestamp and, for it, the latest admitted row.
+
+        Cost is O(log n) plus one step per later t_obs not yet admitted by
+        known_time (late-arriving observations), never a history scan.
+        """
+        column = self._projection.get(unit)
+        if column is None:
+            return None
+        known_us = to_epoch_us(known_time)
+        # Nothing observed after known_time (+ skew) can have been known by then
+        limit = min(to_epoch_us(timestamp), to_epoch_us(known_time + self.skew_tolerance))
+        idx = column.index_at(limit)
+        times = column.times
+        while idx >= 0:
+            known, row_ids = self._versions[(unit, int(times[idx]))]
+            pos = bisect_right(known, known_us)
+            if pos:
+                return self.rows[row_ids[pos - 1]]
+            idx -= 1
+        return None
+
+    def as_known(self, known_time: datetime) -> KnownTimePricingView:
+        """PricingSource view restricted to rows admitted at or before known_time."""
+        return KnownTimePricingView(self, known_time)
+
+    def versions(self, unit: str, t_obs: datetime) -> List[PriceObservation]:
+        """All rows for (unit, t_obs), in t_known order."""
+        versions = self._versions.get((unit, to_epoch_us(t_obs)))
+        if versions is None:
+            return []
+        return [self.rows[row_id] for row_id in versions[1]]
+
+    def __repr__(self):
+        return (f"BitemporalPricingSource({len(self._projection)} units, "
+                f"{len(self.rows)} rows, base={self.base_currency})")
+
+
+class KnownTimePricingView:
+    """
+    PricingSource answering "what did we know at known_time?".
+
+    Used to reproduce numbers published in the past exactly, e.g. a NAV
+    computed with the data available on its publication date.
+    """
+
+    def __init__(self, source: BitemporalPricingSource, known_time: datetime):
+        self.source = source
+        self.known_time = known_time
+        self.base_currency = source.base_currency
+
+    def get_price(self, unit_symbol: str, timestamp: datetime) -> Optional[Decimal]:
+        """Price at or before timestamp as known at known_time."""
+        if unit_symbol == self.base_currency:
+            return Decimal("1.0")
+        row = self.source.known_at(unit_symbol, timestamp, self.known_time)
+        return row.value if row is not None else None
+
+    def get_prices(self, units: Set[str], timestamp: datetime) -> Dict[str, Decimal]:
+        """Prices for multiple units as known at known_time."""
+        prices = {}
+        for unit in units:
+            price = self.get_price(unit, timestamp)
+            if price is not None:
+                prices[unit] = price
+        return prices
+
+    def __repr__(self):
+        return f"KnownTimePricingView(known_time={self.known_time.isoformat()})"
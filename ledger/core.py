@@ -198,7 +198,7 @@ class SmartContract(Protocol):
         view: LedgerView,
         symbol: str,
         timestamp: datetime,
-        prices: Dict[str, Decimal]  # HIGH-1 FIX (v4.1): Use Decimal for consistency
+        prices: Mapping[str, Decimal]  # HIGH-1 FIX (v4.1): Use Decimal for consistency
     ) -> 'PendingTransaction':
         """
         Check if lifecycle events should fire.
@@ -207,7 +207,8 @@ class SmartContract(Protocol):
             view: Read-only ledger access
             symbol: Unit symbol to check
             timestamp: Current timestamp
-            prices: Current market prices
+            prices: Current market prices (a PriceSnapshot when called by
+                    the LifecycleEngine; treat as read-only)
 
         Returns:
             PendingTransaction with moves/state updates, or empty if nothing to do.
@@ -641,6 +642,58 @@ def empty_pending_transaction(view: LedgerView) -> PendingTransaction:
     )
 
 
+def merge_pending_transactions(
+    pendings: List[PendingTransaction],
+    origin: TransactionOrigin,
+) -> PendingTransaction:
+    """
+    Merge several pending transactions into one grouped transaction.
+
+    Used to coalesce many independent lifecycle settlements (e.g. a mass
+    option expiry) into a single execution. Moves keep their per-instrument
+    contract_ids and every UnitStateChange is kept, so the grouped record
+    carries the same audit detail as the individual ones.
+
+    The merged transaction applies atomically: balance constraints are
+    checked against the net effect of all constituents together.
+
+    Args:
+        pendings: Non-empty list of pending transactions to merge; no two
+                  may change the state of the same unit
+        origin: Origin recorded on the grouped transaction
+
+    Returns:
+        A single PendingTransaction containing all moves, state changes
+        and units to create, in input order
+
+    Raises:
+        ValueError: If pendings is empty or two pendings change the same unit's state
+    """
+    if not pendings:
+        raise ValueError("Cannot merge an empty list of pending transactions")
+
+    moves: List[Move] = []
+    state_changes: List[UnitStateChange] = []
+    units_to_create: List['Unit'] = []
+    changed_units: Set[str] = set()
+    for pending in pendings:
+        moves.extend(pending.moves)
+        for sc in pending.state_changes:
+            if sc.unit in changed_units:
+                raise ValueError(f"Cannot merge two state changes for unit {sc.unit}")
+            changed_units.add(sc.unit)
+            state_changes.append(sc)
+        units_to_create.extend(pending.units_to_create)
+
+    return PendingTransaction(
+        moves=tuple(moves),
+        state_changes=tuple(state_changes),
+        origin=origin,
+        timestamp=max(p.timestamp for p in pendings),
+        units_to_create=tuple(units_to_create),
+    )
+
+
 @dataclass(frozen=True, slots=True)
 class Transaction:
     """
@@ -861,6 +914,50 @@ def bilateral_transfer_rule(view: LedgerView, move: Move) -> None:
 
 
 
+# ============================================================================
+# LIFECYCLE TERMINALITY
+# ============================================================================
+
+# State flags that mark a unit's lifecycle as finished, by unit type.
+# Any truthy flag is terminal: the unit's contract will never fire again.
+TERMINAL_STATE_FLAGS: Dict[str, Tuple[str, ...]] = {
+    UNIT_TYPE_BILATERAL_OPTION: ('settled',),
+    UNIT_TYPE_BILATERAL_FORWARD: ('settled',),
+    UNIT_TYPE_DEFERRED_CASH: ('settled',),
+    UNIT_TYPE_FUTURE: ('settled',),
+    UNIT_TYPE_BOND: ('redeemed',),
+    UNIT_TYPE_AUTOCALLABLE: ('settled', 'autocalled'),
+    UNIT_TYPE_PORTFOLIO_SWAP: ('terminated',),
+    UNIT_TYPE_QIS: ('terminated',),
+    UNIT_TYPE_MARGIN_LOAN: ('liquidated',),
+    UNIT_TYPE_DELTA_HEDGE_STRATEGY: ('liquidated',),
+}
+
+# Borrow records track their lifecycle in a 'status' field instead of a flag.
+TERMINAL_BORROW_STATUSES = frozenset({"returned", "bought_in"})
+
+
+def is_terminal_state(unit_type: str, state: UnitState) -> bool:
+    """
+    Return True if a unit's state marks its lifecycle as finished.
+
+    Terminal units (settled options, terminated swaps, liquidated loans, ...)
+    have contracts that only ever return an empty PendingTransaction.
+    Unit types without a terminal state (cash, stocks) are never terminal.
+
+    Args:
+        unit_type: The unit's type string (e.g., UNIT_TYPE_BILATERAL_OPTION)
+        state: The unit's current state dictionary
+
+    Returns:
+        True if the state is terminal for this unit type
+    """
+    if unit_type == UNIT_TYPE_BORROW_RECORD:
+        return state.get('status') in TERMINAL_BORROW_STATUSES
+    flags = TERMINAL_STATE_FLAGS.get(unit_type, ())
+    return any(state.get(flag) for flag in flags)
+
+
 # ============================================================================
 # UNIT FACTORIES
 # ============================================================================
@@ -0,0 +1,175 @@
+"""
+engine_metrics.py - In-process latency metrics for the LifecycleEngine
+
+Cheap enough to leave on in production:
+- Latencies are recorded in integer nanoseconds (time.perf_counter_ns)
+- Histograms use power-of-two buckets, so recording is O(1) with no allocation
+- No locks, no background threads: the engine is single-threaded
+
+Recorded by LifecycleEngine.step() when an EngineMetrics is attached:
+    Histograms: step, advance_time, scheduled_events, execute, pass,
+                poll:<unit_type> (one per polled contract type)
+    Counters:   steps, passes, polls, empty_polls, applied, rejections,
+                already_applied, coalesced_settlements (settlements applied
+                inside grouped transactions; a rejected group counts as one
+                rejection before its settlements are retried individually)
+"""
+
+from __future__ import annotations
+import math
+from typing import Dict, Any, Optional, Callable, List
+
+
+# Bucket i holds latencies with bit_length i, i.e. in [2**(i-1), 2**i) ns.
+# 64 buckets cover every latency representable in an unsigned 64-bit int.
+_NUM_BUCKETS = 64
+
+
+class LatencyHistogram:
+    """
+    Power-of-two bucketed latency histogram in nanoseconds.
+
+    Percentiles are reported as the upper bound of the bucket that contains
+    them, so they are accurate to within a factor of two.
+    """
+
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+        self.buckets: List[int] = [0] * _NUM_BUCKETS
+
+    def record(self, elapsed_ns: int) -> None:
+        """Record one latency observation."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), _NUM_BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> int:
+        """
+        Approximate latency percentile in nanoseconds.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Upper bound of the bucket holding the q-th percentile
+            (0 if nothing has been recorded)
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"percentile must be in [0, 100], got {q}")
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min((1 << i) - 1, self.max_ns) if i else 0
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary statistics as a plain dict."""
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns // self.count if self.count else 0,
+            'min_ns': self.min_ns or 0,
+            'max_ns': self.max_ns,
+            'p50_ns': self.percentile(50),
+            'p99_ns': self.percentile(99),
+        }
+
+
+class EngineMetrics:
+    """
+    Latency histograms and event counters for a LifecycleEngine.
+
+    Attach with LifecycleEngine(ledger, metrics=EngineMetrics()). Read with
+    snapshot(); or pass export_hook to have snapshots pushed every
+    export_every steps (e.g. to a log line or a metrics backend).
+
+    Example:
+        metrics = EngineMetrics()
+        engine = LifecycleEngine(ledger, metrics=metrics)
+        engine.run(timestamps, prices_fn)
+        slowest = max(metrics.poll_types(), key=lambda t: metrics.histogram(f"poll:{t}").total_ns)
+    """
+
+    def __init__(
+        self,
+        export_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+        export_every: int = 1000,
+    ):
+        """
+        Create an empty metrics object.
+
+        Args:
+            export_hook: Optional callback receiving snapshot() every export_every steps
+            export_every: Steps between exports (ignored without export_hook)
+        """
+        if export_every <= 0:
+            raise ValueError(f"export_every must be positive, got {export_every}")
+        self.export_hook = export_hook
+        self.export_every = export_every
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """Record a latency observation for a named phase."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Return the histogram for a phase (empty if never recorded)."""
+        return self.histograms.get(name) or LatencyHistogram()
+
+    def count(self, name: str) -> int:
+        """Return a counter value (0 if never incremented)."""
+        return self.counters.get(name, 0)
+
+    def poll_types(self) -> List[str]:
+        """Unit types that have been polled, sorted."""
+        return sorted(name[5:] for name in self.histograms if name.startswith('poll:'))
+
+    def step_completed(self) -> None:
+        """Called by the engine after each step; drives the export hook."""
+        self.incr('steps')
+        if self.export_hook is not None and self.counters['steps'] % self.export_every == 0:
+            self.export_hook(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all metrics as plain, JSON-serializable data.
+
+        Returns:
+            {'counters': {...}, 'histograms': {name: summary, ...}}
+        """
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'histograms': {
+                name: self.histograms[name].snapshot()
+                for name in sorted(self.histograms)
+            },
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        self.histograms.clear()
+        self.counters.clear()
+
+    def __repr__(self):
+        return f"EngineMetrics({len(self.histograms)} histograms, {self.count('steps')} steps)"
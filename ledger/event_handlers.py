@@ -11,12 +11,13 @@ Following expert recommendations:
 """
 
 from __future__ import annotations
+from concurrent.futures import Executor
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional
 
 from .core import LedgerView, PendingTransaction, empty_pending_transaction
-from .scheduled_events import Event, EventScheduler
+from .scheduled_events import Event, EventScheduler, CalendarEventScheduler
 
 # Import pure functions from unit modules
 from .units.stock import process_dividends, compute_stock_split
@@ -160,11 +161,20 @@ DEFAULT_HANDLERS: Dict[str, callable] = {
 }
 
 
-def create_default_scheduler() -> EventScheduler:
+def create_default_scheduler(
+    calendar: bool = False,
+    executor: Optional[Executor] = None,
+) -> EventScheduler:
     """
     Create an EventScheduler with all default handlers registered.
+
+    Args:
+        calendar: If True, use the CalendarEventScheduler backend
+        executor: Optional executor for concurrent handler execution
+                  (the default handlers are pure over the LedgerView)
     """
-    scheduler = EventScheduler()
+    cls = CalendarEventScheduler if calendar else EventScheduler
+    scheduler = cls(executor=executor)
     for action, handler in DEFAULT_HANDLERS.items():
         scheduler.register(action, handler)
     return scheduler
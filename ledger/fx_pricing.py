@@ -0,0 +1,405 @@
+"""
+fx_pricing.py - Multi-currency pricing over an FX rate graph
+
+StaticPricingSource and TimeSeriesPricingSource quote everything in a single
+base currency. This module adds a layer that converts a unit's price from its
+own quote currency into any reporting currency:
+
+- FXRateGraph: currencies are nodes, quoted pairs are edges (both directions).
+  Cross rates follow the fewest-hop path to the target currency; ties are
+  broken by currency code so results are deterministic.
+- MultiCurrencyPricingSource: PricingSource combining local prices, each
+  unit's quote currency, and an FXRateGraph.
+
+Time: set_rate(..., timestamp=t) records a timestamped observation, and
+rate()/convert() take the time to convert at, so historical prices are
+converted at the FX rates of their own time (the PricingSource point-in-time
+contract). A pair's rate at t is its last observation at or before t; a pair
+not yet observed at t is absent from the graph at t. Rates set without a
+timestamp are static: valid at all times, like StaticPricingSource.
+
+Caching: for each reporting currency the graph keeps a shortest-path tree
+(parent = next hop toward the target) and the conversion factors computed so
+far. When a quoted pair ticks, only factors below that edge in each cached
+tree are dropped; a new pair changes the topology and drops the trees.
+Queries at or after the latest observation (or without a time) use these
+live trees; earlier times rebuild the graph as of that time, cached for the
+most recent such time until the next set_rate(). Valuing a book first sums
+positions per quote currency and then converts each subtotal once per
+reporting currency, so no path is searched per instrument.
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .pricing_source import PricingSource
+
+
+class _ConversionTree:
+    """Shortest-path tree toward one target currency, with cached factors."""
+
+    __slots__ = ('target', 'parent', 'children', 'factors')
+
+    def __init__(self, target: str, rates: Dict[str, Dict[str, Decimal]]):
+        self.target = target
+        self.parent: Dict[str, Optional[str]] = {target: None}
+        self.children: Dict[str, List[str]] = {}
+        self.factors: Dict[str, Decimal] = {target: Decimal("1")}
+        queue = deque([target])
+        while queue:
+            node = queue.popleft()
+            for neighbour in sorted(rates.get(node, ())):
+                if neighbour not in self.parent:
+                    self.parent[neighbour] = node
+                    self.children.setdefault(node, []).append(neighbour)
+                    queue.append(neighbour)
+
+    def factor(self, currency: str, rates: Dict[str, Dict[str, Decimal]]) -> Optional[Decimal]:
+        """Units of target per one unit of currency (None if unreachable)."""
+        factor = self.factors.get(currency)
+        if factor is not None:
+            return factor
+        if currency not in self.parent:
+            return None
+        # Walk up to the nearest cached ancestor, then fill factors back down
+        path = []
+        node = currency
+        while node not in self.factors:
+            path.append(node)
+            node = self.parent[node]
+        factor = self.factors[node]
+        for node in reversed(path):
+            factor = rates[node][self.parent[node]] * factor
+            self.factors[node] = factor
+        return factor
+
+    def invalidate_edge(self, a: str, b: str) -> None:
+        """Drop cached factors that depend on the a-b rate."""
+        if self.parent.get(a) == b:
+            child = a
+        elif self.parent.get(b) == a:
+            child = b
+        else:
+            return  # Not a tree edge: no cached factor uses it
+        # A node's factor is only cached if its parent's is, so stop at the
+        # first uncached node
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            if self.factors.pop(node, None) is not None:
+                stack.extend(self.children.get(node, ()))
+
+
+class FXRateGraph:
+    """
+    FX rates as a currency graph with cached cross rates.
+
+    Example:
+        fx = FXRateGraph()
+        fx.set_rate("EUR", "USD", Decimal("1.08"))   # 1 EUR = 1.08 USD
+        fx.set_rate("USD", "JPY", Decimal("150"))
+        fx.rate("EUR", "JPY")                          # Decimal('162.00') via USD
+
+        fx.set_rate("EUR", "USD", Decimal("1.10"), timestamp=t1)
+        fx.rate("EUR", "USD", t0)                      # None if EUR/USD is only observed from t1
+    """
+
+    def __init__(self, rates: Optional[Mapping[tuple, Decimal]] = None):
+        """
+        Create a graph.
+
+        Args:
+            rates: Optional {(base, quote): rate} static pairs to load
+        """
+        self._rates: Dict[str, Dict[str, Decimal]] = {}
+        self._trees: Dict[str, _ConversionTree] = {}
+        # Timestamped pairs: sorted pair -> (observation times, (base, quote, rate) per time)
+        self._history: Dict[Tuple[str, str], Tuple[List[datetime], List[Tuple[str, str, Decimal]]]] = {}
+        self.as_of: Optional[datetime] = None  # Latest observation time
+        self._at_cache: Optional[Tuple[datetime, Dict[str, Dict[str, Decimal]], Dict[str, _ConversionTree]]] = None
+        self.version = 0
+        for (base, quote), rate in (rates or {}).items():
+            self.set_rate(base, quote, rate)
+
+    def set_rate(self, base: str, quote: str, rate: Decimal, timestamp: Optional[datetime] = None) -> None:
+        """
+        Set the rate for a pair: one unit of base costs `rate` units of quote.
+
+        The inverse direction is set to 1 / rate.
+
+        Args:
+            base: Base currency
+            quote: Quote currency
+            rate: Units of quote per unit of base
+            timestamp: Observation time. Without one the pair's rate is
+                       static (valid at all times, replacing its history);
+                       with one it is added to the pair's history and becomes
+                       the live rate if it is the pair's latest observation
+
+        Raises:
+            ValueError: If rate is not positive or base == quote
+        """
+        if base == quote:
+            raise ValueError(f"FX pair needs two currencies, got {base}/{quote}")
+        if not rate > 0:
+            raise ValueError(f"FX rate must be positive, got {rate} for {base}/{quote}")
+        pair = (base, quote) if base < quote else (quote, base)
+        self._at_cache = None
+        if timestamp is None:
+            self._history.pop(pair, None)
+            self._set_live(base, quote, rate)
+            return
+
+        times, observations = self._history.setdefault(pair, ([], []))
+        i = bisect_right(times, timestamp)
+        if i and times[i - 1] == timestamp:
+            observations[i - 1] = (base, quote, rate)
+            latest = i == len(times)
+        else:
+            times.insert(i, timestamp)
+            observations.insert(i, (base, quote, rate))
+            latest = i == len(times) - 1
+        if self.as_of is None or timestamp > self.as_of:
+            self.as_of = timestamp
+        if latest:
+            self._set_live(base, quote, rate)
+        else:
+            self.version += 1  # Historical correction: live rates unchanged
+
+    def _set_live(self, base: str, quote: str, rate: Decimal) -> None:
+        """Set a pair's live rate, dropping only the cached factors that used it."""
+        forward = self._rates.setdefault(base, {})
+        is_new = quote not in forward
+        forward[quote] = rate
+        self._rates.setdefault(quote, {})[base] = Decimal("1") / rate
+        self.version += 1
+        if is_new:
+            self._trees.clear()
+        else:
+            for tree in self._trees.values():
+                tree.invalidate_edge(base, quote)
+
+    def set_rates(self, rates: Mapping[tuple, Decimal], timestamp: Optional[datetime] = None) -> None:
+        """Apply several {(base, quote): rate} ticks (observed at timestamp, if given)."""
+        for (base, quote), rate in rates.items():
+            self.set_rate(base, quote, rate, timestamp)
+
+    def currencies(self) -> Set[str]:
+        """Currencies that appear in at least one quoted pair."""
+        return set(self._rates)
+
+    def has_currency(self, currency: str) -> bool:
+        """True if the currency appears in at least one quoted pair."""
+        return currency in self._rates
+
+    def _tree(self, target: str) -> _ConversionTree:
+        tree = self._trees.get(target)
+        if tree is None:
+            tree = self._trees[target] = _ConversionTree(target, self._rates)
+        return tree
+
+    def _rates_at(self, timestamp: datetime) -> Tuple[Dict[str, Dict[str, Decimal]], Dict[str, _ConversionTree]]:
+        """Rates (and a tree cache) as of a time before the latest observation."""
+        cached = self._at_cache
+        if cached is not None and cached[0] == timestamp:
+            return cached[1], cached[2]
+        history = self._history
+        rates: Dict[str, Dict[str, Decimal]] = {}
+        for a, neighbours in self._rates.items():
+            for b, rate in neighbours.items():
+                if ((a, b) if a < b else (b, a)) not in history:
+                    rates.setdefault(a, {})[b] = rate  # Static pair
+        for times, observations in history.values():
+            i = bisect_right(times, timestamp)
+            if i:
+                base, quote, rate = observations[i - 1]
+                rates.setdefault(base, {})[quote] = rate
+                rates.setdefault(quote, {})[base] = Decimal("1") / rate
+        trees: Dict[str, _ConversionTree] = {}
+        self._at_cache = (timestamp, rates, trees)
+        return rates, trees
+
+    def rate(self, from_ccy: str, to_ccy: str, timestamp: Optional[datetime] = None) -> Optional[Decimal]:
+        """
+        Units of to_ccy per one unit of from_ccy.
+
+        Args:
+            from_ccy: Currency converted from
+            to_ccy: Currency converted to
+            timestamp: Time of the rates to use (default: latest)
+
+        Returns:
+            The (possibly cross) rate, or None if no path connects them
+        """
+        if from_ccy == to_ccy:
+            return Decimal("1")
+        if timestamp is None or self.as_of is None or timestamp >= self.as_of:
+            return self._tree(to_ccy).factor(from_ccy, self._rates)
+        rates, trees = self._rates_at(timestamp)
+        tree = trees.get(to_ccy)
+        if tree is None:
+            tree = trees[to_ccy] = _ConversionTree(to_ccy, rates)
+        return tree.factor(from_ccy, rates)
+
+    def convert(
+        self,
+        amount: Decimal,
+        from_ccy: str,
+        to_ccy: str,
+        timestamp: Optional[datetime] = None,
+    ) -> Decimal:
+        """
+        Convert an amount between currencies (at the rates of timestamp, if given).
+
+        Raises:
+            ValueError: If no path connects the currencies
+        """
+        rate = self.rate(from_ccy, to_ccy, timestamp)
+        if rate is None:
+            raise ValueError(f"No FX path from {from_ccy} to {to_ccy}")
+        return amount * rate
+
+    def __repr__(self):
+        pairs = sum(len(v) for v in self._rates.values()) // 2
+        return f"FXRateGraph({len(self._rates)} currencies, {pairs} pairs, v{self.version})"
+
+
+class MultiCurrencyPricingSource:
+    """
+    PricingSource that converts local-currency prices into reporting currencies.
+
+    Each unit's price from `local` is taken to be in that unit's quote
+    currency (quote_currencies, defaulting to local.base_currency). A
+    currency that appears in the FX graph, has no local price and is not in
+    quote_currencies is priced at 1 in itself.
+
+    Example:
+        pricer = MultiCurrencyPricingSource(
+            local, {"SAP": "EUR", "TOYOTA": "JPY"}, fx, base_currency="USD")
+        pricer.get_price("SAP", t)                          # in USD
+        pricer.value(positions, t, ["USD", "EUR", "JPY"])   # book in three currencies
+    """
+
+    def __init__(
+        self,
+        local: PricingSource,
+        quote_currencies: Mapping[str, str],
+        fx: FXRateGraph,
+        base_currency: str = "USD",
+    ):
+        """
+        Args:
+            local: Source of prices in each unit's own quote currency
+            quote_currencies: Unit symbol -> currency its local price is quoted in
+            fx: FX graph used for conversion, at the rates of each query's timestamp
+            base_currency: Currency returned by get_price()/get_prices()
+        """
+        self.local = local
+        self.quote_currencies = dict(quote_currencies)
+        self.fx = fx
+        self.base_currency = base_currency
+
+    def quote_currency(self, unit_symbol: str, timestamp: datetime) -> str:
+        """Currency the unit's price at timestamp is quoted in."""
+        quote = self._local_quote(unit_symbol, timestamp)
+        return quote[1] if quote is not None else self.quote_currencies.get(unit_symbol, self.local.base_currency)
+
+    def _local_quote(self, unit_symbol: str, timestamp: datetime) -> Optional[Tuple[Decimal, str]]:
+        """
+        Local price and the currency it is in (None if unpriced).
+
+        A local price is in the unit's quote currency. An FX currency
+        without one, and without an explicit quote currency, is 1 in itself.
+        """
+        ccy = self.quote_currencies.get(unit_symbol)
+        price = self.local.get_price(unit_symbol, timestamp)
+        if price is not None:
+            return price, ccy if ccy is not None else self.local.base_currency
+        if ccy is None and self.fx.has_currency(unit_symbol):
+            return Decimal("1"), unit_symbol
+        return None
+
+    def get_price_in(self, unit_symbol: str, timestamp: datetime, currency: str) -> Optional[Decimal]:
+        """Price of one unit in the given currency (None if unpriced or unconvertible)."""
+        if unit_symbol == currency:
+            return Decimal("1.0")
+        quote = self._local_quote(unit_symbol, timestamp)
+        if quote is None:
+            return None
+        price, ccy = quote
+        rate = self.fx.rate(ccy, currency, timestamp)
+        return price * rate if rate is not None else None
+
+    def get_prices_in(self, units: Set[str], timestamp: datetime, currency: str) -> Dict[str, Decimal]:
+        """Prices for several units in one currency; one rate lookup per quote currency."""
+        rates: Dict[str, Optional[Decimal]] = {}
+        prices = {}
+        for unit in units:
+            if unit == currency:
+                prices[unit] = Decimal("1.0")
+                continue
+            quote = self._local_quote(unit, timestamp)
+            if quote is None:
+                continue
+            price, ccy = quote
+            if ccy not in rates:
+                rates[ccy] = self.fx.rate(ccy, currency, timestamp)
+            rate = rates[ccy]
+            if rate is not None:
+                prices[unit] = price * rate
+        return prices
+
+    def get_price(self, unit_symbol: str, timestamp: datetime) -> Optional[Decimal]:
+        """Price in base currency."""
+        return self.get_price_in(unit_symbol, timestamp, self.base_currency)
+
+    def get_prices(self, units: Set[str], timestamp: datetime) -> Dict[str, Decimal]:
+        """Prices for multiple units in base currency."""
+        return self.get_prices_in(units, timestamp, self.base_currency)
+
+    def value(
+        self,
+        positions: Mapping[str, Decimal],
+        timestamp: datetime,
+        currencies: Iterable[str],
+    ) -> Dict[str, Decimal]:
+        """
+        Value a book in several reporting currencies at once.
+
+        Positions are summed per quote currency in local terms, then each
+        subtotal is converted once per reporting currency.
+
+        Args:
+            positions: Unit symbol -> quantity
+            timestamp: Valuation time for local prices and FX rates
+            currencies: Reporting currencies
+
+        Returns:
+            Reporting currency -> total value
+
+        Raises:
+            ValueError: If a position has no price or a currency has no FX path
+        """
+        subtotals: Dict[str, Decimal] = {}
+        for unit, qty in positions.items():
+            quote = self._local_quote(unit, timestamp)
+            if quote is None:
+                raise ValueError(f"Missing price for '{unit}' in valuation")
+            price, ccy = quote
+            subtotals[ccy] = subtotals.get(ccy, Decimal("0")) + qty * price
+
+        totals = {}
+        for currency in currencies:
+            total = Decimal("0")
+            for ccy in sorted(subtotals):
+                total += self.fx.convert(subtotals[ccy], ccy, currency, timestamp)
+            totals[currency] = total
+        return totals
+
+    def __repr__(self):
+        return (f"MultiCurrencyPricingSource({len(self.quote_currencies)} quoted units, "
+                f"base={self.base_currency})")
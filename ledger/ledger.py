@@ -35,6 +35,7 @@ from .core import (
     TransferRuleViolation, UnitNotRegistered, WalletNotRegistered,
     # Helper functions
     _freeze_state, _thaw_state,
+    is_terminal_state,
 )
 
 
@@ -97,6 +98,12 @@ class Ledger:
         self._next_sequence: int = 0
         # Inverted index mapping unit -> {wallet -> quantity} for O(1) position lookups
         self._positions_by_unit: Dict[str, Dict[str, Decimal]] = defaultdict(dict)
+        # Units whose lifecycle is finished and whose positions are flat.
+        # Derived from unit state and the position index, so replay rebuilds it.
+        self._retired_units: Set[str] = set()
+        # Sorted live units, rebuilt lazily after a unit is added, removed,
+        # retired or revived (None: stale)
+        self._active_units: Optional[List[str]] = None
 
         # Auto-register the system wallet (used for unit issuance/redemption)
         self.registered_wallets.add(SYSTEM_WALLET)
@@ -111,6 +118,11 @@ class Ledger:
         """Current logical time of the ledger."""
         return self._current_time
 
+    @property
+    def next_sequence(self) -> int:
+        """Sequence number the next applied transaction will receive."""
+        return self._next_sequence
+
     def get_balance(self, wallet_id: str, unit_symbol: str) -> Decimal:
         """
         Get the balance of a specific unit in a wallet.
@@ -175,6 +187,33 @@ class Ledger:
         """List all registered unit symbols."""
         return sorted(self.units.keys())
 
+    def list_active_units(self) -> List[str]:
+        """
+        List registered unit symbols that are still live.
+
+        A unit is live unless it has been retired (see list_retired_units).
+        This is the set the LifecycleEngine polls, so polling cost tracks
+        the live book rather than every unit ever created. The sorted list
+        is cached until the set of registered or retired units changes.
+        """
+        if self._active_units is None:
+            self._active_units = sorted(s for s in self.units if s not in self._retired_units)
+        return list(self._active_units)
+
+    def list_retired_units(self) -> List[str]:
+        """
+        List retired unit symbols.
+
+        A unit is retired once its state is terminal (settled, terminated,
+        liquidated, ...) and no wallet holds a non-zero position in it.
+        Retired units stay registered and fully queryable.
+        """
+        return sorted(self._retired_units)
+
+    def is_retired(self, unit_symbol: str) -> bool:
+        """Check if a unit has been retired from lifecycle processing."""
+        return unit_symbol in self._retired_units
+
     def get_unit(self, symbol: str) -> Unit:
         """Return the Unit object for a given symbol."""
         if symbol not in self.units:
@@ -346,6 +385,7 @@ class Ledger:
         if unit.symbol in self.units:
             raise ValueError(f"Unit {unit.symbol} already registered")
         self.units[unit.symbol] = unit
+        self._active_units = None
         if self.verbose:
             rule_str = f", rule={unit.transfer_rule.__name__}" if unit.transfer_rule else ""
             print(f"📝 Registered: {unit.symbol} ({unit.name}) [{unit.unit_type}]{rule_str}")
@@ -381,6 +421,7 @@ class Ledger:
             quantity = Decimal(str(quantity))
         self.balances[wallet_id][unit_symbol] = quantity
         self._update_position_index(wallet_id, unit_symbol, quantity)
+        self._refresh_retirement(unit_symbol)
 
     def update_unit_state(self, unit_symbol: str, state_updates: UnitState) -> None:
         """
@@ -407,6 +448,31 @@ class Ledger:
         # Create new Unit instance with updated state (freeze the dict first)
         new_unit = replace(old_unit, _frozen_state=_freeze_state(new_state))
         self.units[unit_symbol] = new_unit
+        self._refresh_retirement(unit_symbol)
+
+    def _refresh_retirement(self, unit_symbol: str) -> None:
+        """
+        Move a unit between the active and retired sets.
+
+        A unit is retired when its state is terminal for its unit type and
+        its positions are flat. Either condition lapsing (e.g. a new position
+        is opened) returns the unit to the active set.
+
+        Args:
+            unit_symbol: Unit symbol whose state or positions changed
+        """
+        unit = self.units.get(unit_symbol)
+        if (
+            unit is not None
+            and not self._positions_by_unit.get(unit_symbol)
+            and is_terminal_state(unit.unit_type, unit.state)
+        ):
+            if unit_symbol not in self._retired_units:
+                self._retired_units.add(unit_symbol)
+                self._active_units = None
+        elif unit_symbol in self._retired_units:
+            self._retired_units.discard(unit_symbol)
+            self._active_units = None
 
     # ========================================================================
     # TRANSACTION EXECUTION (Mutating)
@@ -473,6 +539,7 @@ class Ledger:
                 # Rollback: unregister any units we added
                 for sym in newly_registered_units:
                     del self.units[sym]
+                self._active_units = None
                 if self.verbose:
                     print(f"✗ REJECTED: unit not registered: {move.unit_symbol}")
                 return ExecuteResult.REJECTED
@@ -480,6 +547,7 @@ class Ledger:
                 # Rollback: unregister any units we added
                 for sym in newly_registered_units:
                     del self.units[sym]
+                self._active_units = None
                 if self.verbose:
                     print(f"✗ REJECTED: wallet not registered: {move.source}")
                 return ExecuteResult.REJECTED
@@ -487,6 +555,7 @@ class Ledger:
                 # Rollback: unregister any units we added
                 for sym in newly_registered_units:
                     del self.units[sym]
+                self._active_units = None
                 if self.verbose:
                     print(f"✗ REJECTED: wallet not registered: {move.dest}")
                 return ExecuteResult.REJECTED
@@ -497,6 +566,7 @@ class Ledger:
             # Rollback: unregister any units we added
             for sym in newly_registered_units:
                 del self.units[sym]
+            self._active_units = None
             if self.verbose:
                 print(f"✗ REJECTED: {reason}")
             return ExecuteResult.REJECTED
@@ -559,6 +629,11 @@ class Ledger:
                 new_unit = replace(old_unit, _frozen_state=_freeze_state(new_state))
                 self.units[sc.unit] = new_unit
 
+        # Retire units whose lifecycle this transaction finished (or revive them)
+        touched = {m.unit_symbol for m in tx.moves} | {sc.unit for sc in tx.state_changes}
+        for symbol in touched:
+            self._refresh_retirement(symbol)
+
         # Log transaction (always - audit trail is mandatory)
         self.transaction_log.append(tx)
         self.seen_intent_ids.add(pending.intent_id)
@@ -780,8 +855,35 @@ class Ledger:
         for unit_symbol, positions in self._positions_by_unit.items():
             cloned._positions_by_unit[unit_symbol] = dict(positions)
 
+        cloned._retired_units = set(self._retired_units)
+        cloned._active_units = None
+
         return cloned
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Return picklable state, used to persist checkpoints to disk.
+
+        Balances are held in defaultdicts with a lambda factory, which pickle
+        cannot serialize, so they are stored as plain dicts and restored in
+        __setstate__. Units pickle by reference to their transfer rule, which
+        must therefore be a module-level function.
+        """
+        state = self.__dict__.copy()
+        state['balances'] = {w: dict(bals) for w, bals in self.balances.items()}
+        state['_positions_by_unit'] = dict(self._positions_by_unit)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore state produced by __getstate__."""
+        self.__dict__.update(state)
+        self._active_units = None
+        self.balances = {
+            w: defaultdict(lambda: Decimal("0"), bals)
+            for w, bals in state['balances'].items()
+        }
+        self._positions_by_unit = defaultdict(dict, state['_positions_by_unit'])
+
     def clone_at(self, target_time: datetime) -> Ledger:
         """
         Create a deep copy of this ledger as it existed at a specific past time.
@@ -870,6 +972,12 @@ class Ledger:
                 if unit.symbol in cloned._positions_by_unit:
                     del cloned._positions_by_unit[unit.symbol]
 
+        # Re-derive retirement from the unwound state and positions
+        cloned._retired_units = set()
+        cloned._active_units = None
+        for symbol in cloned.units:
+            cloned._refresh_retirement(symbol)
+
         return cloned
 
     def replay(self, from_tx: int = 0) -> Ledger:
@@ -6,25 +6,105 @@ Combines scheduled events and smart contract polling into a unified lifecycle en
 Execution order each step():
 1. Advance ledger time
 2. Process scheduled events (in priority order)
-3. Run smart contract polling (discovery)
+3. Run smart contract polling (discovery) over active, non-retired units
 4. Repeat until no more events fire (cascading effects)
 
 The transaction log is the audit trail - no separate event status tracking needed.
+
+run() processes a materialized list of timestamps; run_stream() and
+arun_stream() consume (timestamp, prices) iterators step by step, with
+optional periodic checkpoints from which a run can be resumed.
+
+With fast_forward=True, timestamps at which nothing can fire are skipped:
+no scheduled event is due, no contract has reached its declared wake time,
+and no price-sensitive contract sees a price change. Contracts registered
+without a wake time are polled at every timestamp, as before.
+
+Each step converts its prices once into an immutable PriceSnapshot (chained
+to the previous step's for versioning and diffs); every handler and
+contract polled during the step receives that same object.
+
+Unit types registered with coalesce=True have their lifecycle settlements
+merged per polling pass into grouped transactions (see _execute_coalesced),
+so a mass expiry costs a handful of executions instead of one per unit.
+
+Step listeners (add_step_listener) are called after every completed step
+with its timestamp, PriceSnapshot and executed transactions, e.g. to keep
+P&L attribution (pnl_attribution) up to date without rescanning the log.
+While any listener is registered, fast-forward treats the engine as
+price-sensitive: only timestamps with unchanged prices are skipped.
 """
 
 from __future__ import annotations
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Callable
+from time import perf_counter_ns
+from typing import (
+    Dict, List, Mapping, Optional, Callable, Iterable, Iterator,
+    AsyncIterable, AsyncIterator, Set, Tuple,
+)
 
 from .core import (
-    LedgerView, PendingTransaction, Transaction,
-    ExecuteResult, LedgerError,
-    SmartContract,
+    LedgerView, PendingTransaction, Transaction, SYSTEM_WALLET,
+    ExecuteResult, LedgerError, OriginType, TransactionOrigin,
+    SmartContract, merge_pending_transactions,
 )
 from .ledger import Ledger
-from .scheduled_events import Event, EventScheduler
+from .scheduled_events import Event, EventScheduler, RecurringEvent, SchedulerSnapshot
 from .event_handlers import create_default_scheduler
+from .engine_metrics import EngineMetrics
+from .price_snapshot import PriceSnapshot
+
+
+# A price feed item: the step timestamp and the market prices at that time
+PriceFeedItem = Tuple[datetime, Dict[str, Decimal]]
+
+# Wake-time declaration: (view, symbol) -> earliest time the unit's contract
+# can fire with prices unchanged, or None if it will never fire again.
+WakeTimeFn = Callable[[LedgerView, str], Optional[datetime]]
+
+# Step listener: (timestamp, prices, transactions executed during the step)
+StepListener = Callable[[datetime, PriceSnapshot, List[Transaction]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class StepResult:
+    """
+    Outcome of a single engine step, yielded by run_stream().
+
+    Attributes:
+        step_index: Number of steps completed by the engine, including this one
+        timestamp: Timestamp the step was run at
+        transactions: Transactions executed during the step
+    """
+    step_index: int
+    timestamp: datetime
+    transactions: Tuple[Transaction, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class EngineCheckpoint:
+    """
+    Snapshot of engine state after a completed step.
+
+    The ledger and scheduler are independent copies, so the running engine
+    can continue without affecting the checkpoint. A checkpoint is picklable
+    when the registered handlers and transfer rules are module-level functions.
+
+    Attributes:
+        step_index: Number of steps completed when the checkpoint was taken
+        timestamp: Timestamp of the last completed step
+        ledger: Copy of the ledger
+        scheduler: Copy of the event scheduler
+    """
+    step_index: int
+    timestamp: datetime
+    ledger: Ledger
+    scheduler: EventScheduler
+
+
+RestoreListener = Callable[[EngineCheckpoint], None]
 
 
 class LifecycleEngine:
@@ -36,6 +116,7 @@ class LifecycleEngine:
     - Smart contract polling for event discovery
     - Cascading event support (repeat until stable)
     - Full audit trail via transaction log
+    - Optional per-phase and per-unit-type latency metrics
     """
 
     def __init__(
@@ -43,6 +124,7 @@ class LifecycleEngine:
         ledger: Ledger,
         scheduler: Optional[EventScheduler] = None,
         contracts: Optional[Dict[str, SmartContract]] = None,
+        metrics: Optional[EngineMetrics] = None,
     ):
         """
         Initialize lifecycle engine.
@@ -51,24 +133,80 @@ class LifecycleEngine:
             ledger: The ledger to operate on
             scheduler: Event scheduler (created with default handlers if not provided)
             contracts: Smart contracts for polling (unit_type -> contract)
+            metrics: Optional EngineMetrics to record step latencies and counters
         """
         self.ledger = ledger
+        self.metrics = metrics
         self.scheduler = scheduler or create_default_scheduler()
         self.contracts: Dict[str, SmartContract] = contracts or {}
+        # Fast-forward declarations (unit_type -> wake-time function / flag)
+        self.wake_times: Dict[str, WakeTimeFn] = {}
+        self.price_sensitive: Set[str] = set()
+        # Unit types whose settlements are merged into grouped transactions
+        self.coalesce: Set[str] = set()
+        # Called after every completed step / after restore()
+        self.step_listeners: List[StepListener] = []
+        self.restore_listeners: List[RestoreListener] = []
 
         # Configuration
         self.max_passes = 10  # Safety limit for cascading events
+        self.coalesce_batch_size = 1000  # Max settlements per grouped transaction
         self.verbose = ledger.verbose
 
-    def register(self, unit_type: str, contract: SmartContract) -> None:
+        # Progress tracking for streaming runs and checkpoints
+        self.step_count = 0
+        self._last_step_time: Optional[datetime] = None
+        self._resume_after: Optional[datetime] = None
+
+        # Fast-forward bookkeeping
+        self.skipped_steps = 0
+        self._last_prices: Optional[PriceSnapshot] = None
+        self._wake_cache: Optional[Tuple[Optional[datetime], bool]] = None
+
+    def register(
+        self,
+        unit_type: str,
+        contract: SmartContract,
+        wake_time: Optional[WakeTimeFn] = None,
+        price_sensitive: bool = False,
+        coalesce: bool = False,
+    ) -> None:
         """
         Register a smart contract for a unit type.
 
+        The optional declarations let fast-forward runs skip idle timestamps.
+        A contract with a wake_time must return an empty transaction for any
+        timestamp before that time, given unchanged ledger state and prices.
+
         Args:
             unit_type: Type of unit (e.g., "STOCK", "BOND", "DELTA_HEDGE_STRATEGY")
             contract: SmartContract implementation (callable or object with check_lifecycle)
+            wake_time: Function returning the next time the contract can fire
+                       for a unit (e.g. option_wake_time). Without it, units of
+                       this type are polled at every timestamp.
+            price_sensitive: If True, the contract may also fire whenever
+                             prices change, so steps with new prices are not skipped
+            coalesce: If True, settlements produced for units of this type in
+                      a polling pass are merged into grouped transactions,
+                      executed after the pass's non-coalesced settlements.
+                      Only safe when each unit's settlement does not depend
+                      on another unit's settlement in the same pass (true
+                      for option, forward and deferred cash settlement).
         """
         self.contracts[unit_type] = contract
+        self._wake_cache = None
+        if wake_time is not None:
+            self.wake_times[unit_type] = wake_time
+        else:
+            self.wake_times.pop(unit_type, None)
+        if price_sensitive:
+            self.price_sensitive.add(unit_type)
+        else:
+            self.price_sensitive.discard(unit_type)
+        if coalesce:
+            self.coalesce.add(unit_type)
+        else:
+            self.coalesce.discard(unit_type)
 
     def schedule(self, event: Event) -> str:
         """
@@ -80,16 +218,52 @@ class LifecycleEngine:
         Returns:
             Event ID
         """
+        self._wake_cache = None
         return self.scheduler.schedule(event)
 
     def schedule_many(self, events: List[Event]) -> List[str]:
         """Schedule multiple events."""
+        self._wake_cache = None
         return self.scheduler.schedule_many(events)
 
+    def schedule_recurring(self, recurring: RecurringEvent) -> Optional[str]:
+        """Schedule a recurring event; occurrences are generated lazily."""
+        self._wake_cache = None
+        return self.scheduler.schedule_recurring(recurring)
+
+    def cancel(self, event: Event) -> bool:
+        """Cancel a pending scheduled event. Returns True if it was pending."""
+        self._wake_cache = None
+        return self.scheduler.cancel(event)
+
+    def reschedule(self, event: Event, trigger_time: datetime) -> str:
+        """Move a pending scheduled event to a new trigger time."""
+        self._wake_cache = None
+        return self.scheduler.reschedule(event, trigger_time)
+
+    def add_step_listener(self, listener: StepListener) -> None:
+        """
+        Call listener(timestamp, prices, transactions) after every step.
+
+        Listeners run in registration order once the step's cascade has
+        finished; transactions are those the engine executed in the step.
+        With listeners registered, fast-forward never skips a price change.
+        """
+        self.step_listeners.append(listener)
+
+    def add_restore_listener(self, listener: RestoreListener) -> None:
+        """
+        Call listener(checkpoint) after every restore().
+
+        Lets step listeners that keep incremental state (e.g. how much of
+        the transaction log they have read) rewind with the engine.
+        """
+        self.restore_listeners.append(listener)
+
     def step(
         self,
         timestamp: datetime,
-        prices: Dict[str, Decimal],
+        prices: Mapping[str, Decimal],
     ) -> List[Transaction]:
         """
         Advance time and execute all pending lifecycle events.
@@ -102,15 +276,26 @@ class LifecycleEngine:
 
         Args:
             timestamp: New timestamp
-            prices: Current market prices
+            prices: Current market prices (a dict, or a prebuilt PriceSnapshot)
 
         Returns:
             List of executed transactions
+
+        Raises:
+            ValueError: If a price is not a finite number
         """
+        prices = PriceSnapshot.of(prices, timestamp, self._last_prices)
+        metrics = self.metrics
+        if metrics is not None:
+            step_start = perf_counter_ns()
         self.ledger.advance_time(timestamp)
+        if metrics is not None:
+            metrics.record('advance_time', perf_counter_ns() - step_start)
         executed: List[Transaction] = []
 
         for pass_num in range(self.max_passes):
+            if metrics is not None:
+                pass_start = perf_counter_ns()
             pass_executed: List[Transaction] = []
 
             # Phase 1: Process scheduled events
@@ -123,22 +308,41 @@ class LifecycleEngine:
 
             executed.extend(pass_executed)
 
+            if metrics is not None:
+                metrics.record('pass', perf_counter_ns() - pass_start)
+                metrics.incr('passes')
+
             # If no events fired this pass, we're done
             if not pass_executed:
                 break
 
+        if metrics is not None:
+            metrics.record('step', perf_counter_ns() - step_start)
+            metrics.step_completed()
+
+        self.step_count += 1
+        self._last_step_time = timestamp
+        self._last_prices = prices
+        self._wake_cache = None
+        for listener in self.step_listeners:
+            listener(timestamp, prices, executed)
         return executed
 
     def _process_scheduled_events(
         self,
         timestamp: datetime,
-        prices: Dict[str, Decimal],
+        prices: Mapping[str, Decimal],
     ) -> List[Transaction]:
         """Process all scheduled events due at or before timestamp."""
         executed: List[Transaction] = []
 
         # Get pending transactions from scheduler
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter_ns()
         pending_txs = self.scheduler.step(timestamp, self.ledger, prices)
+        if metrics is not None:
+            metrics.record('scheduled_events', perf_counter_ns() - start)
 
         for pending_tx in pending_txs:
             if pending_tx.is_empty():
@@ -147,57 +351,210 @@ class LifecycleEngine:
             if self.verbose:
                 print(f"[SCHEDULED] Executing event transaction")
 
-            exec_result = self.ledger.execute(pending_tx)
+            exec_result = self._execute(pending_tx)
 
             if exec_result == ExecuteResult.APPLIED and self.ledger.transaction_log:
                 executed.append(self.ledger.transaction_log[-1])
 
         return executed
 
+    def _execute(self, pending: PendingTransaction) -> ExecuteResult:
+        """Execute a pending transaction, recording latency and outcome."""
+        metrics = self.metrics
+        if metrics is None:
+            return self.ledger.execute(pending)
+        start = perf_counter_ns()
+        exec_result = self.ledger.execute(pending)
+        metrics.record('execute', perf_counter_ns() - start)
+        if exec_result == ExecuteResult.APPLIED:
+            metrics.incr('applied')
+        elif exec_result == ExecuteResult.ALREADY_APPLIED:
+            metrics.incr('already_applied')
+        else:
+            metrics.incr('rejections')
+        return exec_result
+
     def _process_smart_contracts(
         self,
         timestamp: datetime,
-        prices: Dict[str, Decimal],
+        prices: Mapping[str, Decimal],
     ) -> List[Transaction]:
         """Run smart contract polling for event discovery."""
         executed: List[Transaction] = []
+        metrics = self.metrics
+        coalesced: Dict[str, List[Tuple[str, PendingTransaction]]] = {}
 
-        # Sort units for deterministic iteration order
-        for symbol in sorted(self.ledger.units.keys()):
+        # Retired units (terminal state, flat positions) are never polled.
+        # list_active_units() is sorted for deterministic iteration order.
+        for symbol in self.ledger.list_active_units():
             unit = self.ledger.units[symbol]
             contract = self.contracts.get(unit.unit_type)
 
             if not contract:
                 continue
 
+            if metrics is not None:
+                start = perf_counter_ns()
+
             # Support both callables and objects with check_lifecycle method
             if hasattr(contract, 'check_lifecycle'):
                 pending = contract.check_lifecycle(self.ledger, symbol, timestamp, prices)
             else:
                 pending = contract(self.ledger, symbol, timestamp, prices)
 
+            if metrics is not None:
+                metrics.record('poll:' + unit.unit_type, perf_counter_ns() - start)
+                metrics.incr('polls')
+
             if not isinstance(pending, PendingTransaction):
                 raise LedgerError(
                     f"Contract for {symbol} must return PendingTransaction, got {type(pending)}"
                 )
 
             if pending.is_empty():
+                if metrics is not None:
+                    metrics.incr('empty_polls')
                 continue
 
-            exec_result = self.ledger.execute(pending)
+            if unit.unit_type in self.coalesce:
+                coalesced.setdefault(unit.unit_type, []).append((symbol, pending))
+                continue
 
-            if exec_result == ExecuteResult.REJECTED:
-                raise LedgerError(f"Lifecycle event failed for {symbol}: contract execution rejected")
+            executed.extend(self._execute_settlement(symbol, pending))
 
-            if exec_result == ExecuteResult.APPLIED and self.ledger.transaction_log:
-                executed.append(self.ledger.transaction_log[-1])
+        # Coalesced settlements run after every non-coalesced one of the pass
+        for unit_type in sorted(coalesced):
+            executed.extend(self._execute_coalesced(unit_type, coalesced[unit_type]))
 
         return executed
 
+    def _execute_settlement(self, symbol: str, pending: PendingTransaction) -> List[Transaction]:
+        """Execute one contract's pending transaction; raise if it is rejected."""
+        exec_result = self._execute(pending)
+
+        if exec_result == ExecuteResult.REJECTED:
+            raise LedgerError(f"Lifecycle event failed for {symbol}: contract execution rejected")
+
+        if exec_result == ExecuteResult.APPLIED and self.ledger.transaction_log:
+            return [self.ledger.transaction_log[-1]]
+        return []
+
+    def _execute_coalesced(
+        self,
+        unit_type: str,
+        settlements: List[Tuple[str, PendingTransaction]],
+    ) -> List[Transaction]:
+        """
+        Execute a pass's settlements for one unit type as grouped transactions.
+
+        Settlements are merged in symbol order, up to coalesce_batch_size per
+        group. Each grouped transaction keeps every move (with its per-unit
+        contract_id) and every UnitStateChange, so the audit detail matches
+        individual execution. A settlement whose intent was already applied
+        (or repeats one in the current group) is executed on its own so it
+        is reported as ALREADY_APPLIED.
+
+        The ledger validates a grouped transaction against its net effect,
+        which alone would accept a settlement funded only by a later one in
+        the group. A group is therefore executed only if balances stay within
+        unit limits after every settlement in order (_group_within_limits);
+        otherwise, or if the group is rejected, its settlements are executed
+        one by one in symbol order, so final balances (and which settlement
+        fails) are the same as without coalescing.
+
+        Differences from individual execution: coalesced settlements of a
+        pass run after all non-coalesced ones (see _process_smart_contracts),
+        and unit transfer rules see the ledger state before the group.
+        """
+        executed: List[Transaction] = []
+        origin = TransactionOrigin(
+            origin_type=OriginType.LIFECYCLE,
+            source_id="coalesced_settlement",
+            event_type=unit_type,
+        )
+
+        batch: List[Tuple[str, PendingTransaction]] = []
+        batch_units: Set[str] = set()
+        batch_intents: Set[str] = set()
+
+        def flush() -> None:
+            if len(batch) == 1:
+                executed.extend(self._execute_settlement(*batch[0]))
+            elif batch:
+                if self._group_within_limits(batch):
+                    grouped = merge_pending_transactions([p for _, p in batch], origin)
+                    if self.verbose:
+                        print(f"[COALESCED] {len(batch)} {unit_type} settlements")
+                    exec_result = self._execute(grouped)
+                else:
+                    exec_result = ExecuteResult.REJECTED
+                if exec_result == ExecuteResult.REJECTED:
+                    for symbol, pending in batch:
+                        executed.extend(self._execute_settlement(symbol, pending))
+                elif exec_result == ExecuteResult.APPLIED:
+                    executed.append(self.ledger.transaction_log[-1])
+                    if self.metrics is not None:
+                        self.metrics.incr('coalesced_settlements', len(batch))
+            batch.clear()
+            batch_units.clear()
+            batch_intents.clear()
+
+        for symbol, pending in settlements:
+            if pending.intent_id in self.ledger.seen_intent_ids:
+                executed.extend(self._execute_settlement(symbol, pending))
+                continue
+            if pending.intent_id in batch_intents:
+                flush()
+                executed.extend(self._execute_settlement(symbol, pending))
+                continue
+            changed = {sc.unit for sc in pending.state_changes}
+            if len(batch) >= self.coalesce_batch_size or not changed.isdisjoint(batch_units):
+                flush()
+            batch.append((symbol, pending))
+            batch_units.update(changed)
+            batch_intents.add(pending.intent_id)
+        flush()
+
+        return executed
+
+    def _group_within_limits(self, batch: List[Tuple[str, PendingTransaction]]) -> bool:
+        """
+        True if balances stay within unit limits after each settlement in order.
+
+        Replays the group's moves as running balance changes, checking the
+        (wallet, unit) pairs each settlement touches as individual execution
+        would; SYSTEM_WALLET is exempt, as in ledger validation. Cost is
+        linear in the number of moves.
+        """
+        ledger = self.ledger
+        units = ledger.units
+        balances = ledger.balances
+        running: Dict[Tuple[str, str], Decimal] = {}
+        for _, pending in batch:
+            touched: Set[Tuple[str, str]] = set()
+            for move in pending.moves:
+                unit = units.get(move.unit_symbol)
+                if unit is None:
+                    return False  # Let individual execution report it
+                for wallet, quantity in ((move.source, -move.quantity), (move.dest, move.quantity)):
+                    if wallet == SYSTEM_WALLET:
+                        continue
+                    key = (wallet, move.unit_symbol)
+                    running[key] = unit.round(running.get(key, Decimal("0")) + quantity)
+                    touched.add(key)
+            for wallet, symbol in touched:
+                unit = units[symbol]
+                current = balances.get(wallet, {}).get(symbol, Decimal("0"))
+                proposed = unit.round(current + running[(wallet, symbol)])
+                if proposed < unit.min_balance or proposed > unit.max_balance:
+                    return False
+        return True
+
     def run(
         self,
         timestamps: List[datetime],
         get_prices_at_timestamp: Callable[[datetime], Dict[str, Decimal]],
+        fast_forward: bool = False,
     ) -> List[Transaction]:
         """
         Run engine through a sequence of timestamps.
@@ -205,19 +562,294 @@ class LifecycleEngine:
         Args:
             timestamps: List of timestamps to process
             get_prices_at_timestamp: Callable returning prices for a timestamp
+            fast_forward: Skip timestamps at which nothing can fire; the count
+                          is accumulated in skipped_steps
 
         Returns:
             All executed transactions
         """
         all_transactions: List[Transaction] = []
 
+        if not fast_forward:
+            feed = ((t, get_prices_at_timestamp(t)) for t in timestamps)
+            for result in self.run_stream(feed):
+                all_transactions.extend(result.transactions)
+            return all_transactions
+
+        # Fast-forward: prices are only fetched for timestamps that may fire
+        # (or, with price-sensitive contracts, to detect a price change)
+        self._wake_cache = None
         for timestamp in timestamps:
-            prices = get_prices_at_timestamp(timestamp)
-            transactions = self.step(timestamp, prices)
-            all_transactions.extend(transactions)
+            prices: Optional[Dict[str, Decimal]] = None
+
+            def fetch_prices() -> Dict[str, Decimal]:
+                nonlocal prices
+                if prices is None:
+                    prices = get_prices_at_timestamp(timestamp)
+                return prices
+
+            if self._resume_after is not None:
+                if timestamp <= self._resume_after:
+                    continue
+                self._resume_after = None
+            if self._is_idle(timestamp, fetch_prices):
+                self.skipped_steps += 1
+                continue
+            all_transactions.extend(self.step(timestamp, fetch_prices()))
 
+        if timestamps:
+            self._advance_to(timestamps[-1])
         return all_transactions
 
+    def run_stream(
+        self,
+        feed: Iterable[PriceFeedItem],
+        checkpoint_every: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[EngineCheckpoint], None]] = None,
+        fast_forward: bool = False,
+    ) -> Iterator[StepResult]:
+        """
+        Run engine over a (timestamp, prices) feed, yielding one result per step.
+
+        Transactions are yielded as they execute and are not accumulated,
+        so a long backtest holds them only in the ledger's transaction log.
+        The feed is consumed lazily and may be any iterator.
+
+        If the engine was restored from a checkpoint, feed items at or before
+        the checkpoint timestamp are skipped, so the original feed can be
+        replayed from the start to resume.
+
+        Args:
+            feed: Iterable of (timestamp, prices) in non-decreasing time order
+            checkpoint_every: Take a checkpoint every N completed steps
+            on_checkpoint: Callback receiving each EngineCheckpoint
+                           (e.g. to pickle it to disk)
+            fast_forward: Skip idle timestamps (no StepResult is yielded for
+                          them); the count is accumulated in skipped_steps
+
+        Yields:
+            StepResult for each processed timestamp
+
+        Raises:
+            ValueError: If checkpoint_every is not positive, or is given
+                        without on_checkpoint
+        """
+        self._validate_checkpointing(checkpoint_every, on_checkpoint)
+        self._wake_cache = None
+        last_seen: Optional[datetime] = None
+        for timestamp, prices in feed:
+            last_seen = timestamp
+            result = self._stream_step(
+                timestamp, prices, checkpoint_every, on_checkpoint, fast_forward
+            )
+            if result is not None:
+                yield result
+        if fast_forward and last_seen is not None:
+            self._advance_to(last_seen)
+
+    async def arun_stream(
+        self,
+        feed: AsyncIterable[PriceFeedItem],
+        checkpoint_every: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[EngineCheckpoint], None]] = None,
+        fast_forward: bool = False,
+    ) -> AsyncIterator[StepResult]:
+        """
+        Async variant of run_stream() over an async (timestamp, prices) feed.
+
+        Steps themselves run synchronously; only feed consumption is awaited.
+        See run_stream() for arguments and resume semantics.
+        """
+        self._validate_checkpointing(checkpoint_every, on_checkpoint)
+        self._wake_cache = None
+        last_seen: Optional[datetime] = None
+        async for timestamp, prices in feed:
+            last_seen = timestamp
+            result = self._stream_step(
+                timestamp, prices, checkpoint_every, on_checkpoint, fast_forward
+            )
+            if result is not None:
+                yield result
+        if fast_forward and last_seen is not None:
+            self._advance_to(last_seen)
+
+    def _validate_checkpointing(
+        self,
+        checkpoint_every: Optional[int],
+        on_checkpoint: Optional[Callable[[EngineCheckpoint], None]],
+    ) -> None:
+        """Validate streaming checkpoint configuration."""
+        if checkpoint_every is None:
+            return
+        if checkpoint_every <= 0:
+            raise ValueError(f"checkpoint_every must be positive, got {checkpoint_every}")
+        if on_checkpoint is None:
+            raise ValueError("checkpoint_every requires an on_checkpoint callback")
+
+    def _stream_step(
+        self,
+        timestamp: datetime,
+        prices: Mapping[str, Decimal],
+        checkpoint_every: Optional[int],
+        on_checkpoint: Optional[Callable[[EngineCheckpoint], None]],
+        fast_forward: bool,
+    ) -> Optional[StepResult]:
+        """Run one streamed step, honouring resume, checkpoint and skip settings."""
+        if self._resume_after is not None:
+            if timestamp <= self._resume_after:
+                return None
+            self._resume_after = None
+
+        if fast_forward and self._is_idle(timestamp, lambda: prices):
+            self.skipped_steps += 1
+            return None
+
+        transactions = self.step(timestamp, prices)
+
+        if checkpoint_every and self.step_count % checkpoint_every == 0:
+            on_checkpoint(self.checkpoint())
+
+        return StepResult(
+            step_index=self.step_count,
+            timestamp=timestamp,
+            transactions=tuple(transactions),
+        )
+
+    # ========================================================================
+    # FAST-FORWARD
+    # ========================================================================
+
+    def next_wake_time(self) -> Optional[datetime]:
+        """
+        Earliest time at which anything can fire with prices unchanged.
+
+        Considers the next scheduled event and the declared wake time of
+        every active unit with a registered contract.
+
+        Returns:
+            The earliest wake time; the current ledger time if some polled
+            contract has no wake-time declaration; None if nothing is pending.
+        """
+        return self._wake_state()[0]
+
+    def _wake_state(self) -> Tuple[Optional[datetime], bool]:
+        """
+        Return (next wake time, any price-sensitive unit active).
+
+        Cached until the next step, since skipped timestamps change nothing.
+        """
+        if self._wake_cache is not None:
+            return self._wake_cache
+
+        wake: Optional[datetime] = None
+        next_event = self.scheduler.peek_next()
+        if next_event is not None:
+            wake = next_event.trigger_time
+
+        price_sensitive = False
+        for symbol in self.ledger.list_active_units():
+            unit_type = self.ledger.units[symbol].unit_type
+            if unit_type not in self.contracts:
+                continue
+            if unit_type in self.price_sensitive:
+                price_sensitive = True
+            wake_fn = self.wake_times.get(unit_type)
+            if wake_fn is None:
+                # Undeclared contract: it may fire at any timestamp
+                wake = self.ledger.current_time
+                continue
+            unit_wake = wake_fn(self.ledger, symbol)
+            if unit_wake is not None and (wake is None or unit_wake < wake):
+                wake = unit_wake
+
+        self._wake_cache = (wake, price_sensitive)
+        return self._wake_cache
+
+    def _is_idle(
+        self,
+        timestamp: datetime,
+        get_prices: Callable[[], Dict[str, Decimal]],
+    ) -> bool:
+        """Return True if stepping at timestamp cannot execute anything."""
+        wake, price_sensitive = self._wake_state()
+        if wake is not None and timestamp >= wake:
+            return False
+        if price_sensitive or self.step_listeners:
+            # Step listeners (e.g. P&L attribution) must see every price change.
+            # Compare the raw feed against the last snapshot without building one
+            return (self._last_prices is not None
+                    and self._last_prices.same_prices(get_prices()))
+        return True
+
+    def _advance_to(self, timestamp: datetime) -> None:
+        """Advance ledger time over trailing skipped timestamps."""
+        if timestamp > self.ledger.current_time:
+            self.ledger.advance_time(timestamp)
+
+    # ========================================================================
+    # CHECKPOINTING
+    # ========================================================================
+
+    def checkpoint(self) -> EngineCheckpoint:
+        """
+        Snapshot ledger and scheduler state after the last completed step.
+
+        Returns:
+            EngineCheckpoint holding independent copies of ledger and scheduler
+
+        Raises:
+            LedgerError: If no step has been run yet
+        """
+        if self._last_step_time is None:
+            raise LedgerError("Cannot checkpoint before the first step")
+        return EngineCheckpoint(
+            step_index=self.step_count,
+            timestamp=self._last_step_time,
+            ledger=self.ledger.clone(),
+            scheduler=self.scheduler.copy(),
+        )
+
+    def restore(self, checkpoint: EngineCheckpoint) -> None:
+        """
+        Restore ledger and scheduler state from a checkpoint.
+
+        The ledger state is copied into the engine's existing Ledger object,
+        so anything holding engine.ledger (PortfolioValuation, step
+        listeners) keeps a valid reference; the restored transaction log is
+        a new list, which such holders use to detect the restore. The
+        checkpoint itself is not modified and can be reused. Registered
+        contracts are kept; they are code, not state. The next run_stream()
+        skips feed items up to the checkpoint timestamp. Restore listeners
+        are called last.
+
+        Args:
+            checkpoint: Checkpoint produced by checkpoint() or run_stream()
+        """
+        self.ledger.__setstate__(checkpoint.ledger.clone().__getstate__())
+        self.scheduler = checkpoint.scheduler.copy()
+        self.verbose = self.ledger.verbose
+        self.step_count = checkpoint.step_index
+        self._last_step_time = checkpoint.timestamp
+        self._resume_after = checkpoint.timestamp
+        self._last_prices = None
+        self._wake_cache = None
+        for listener in self.restore_listeners:
+            listener(checkpoint)
+
+    def snapshot_scheduler(self) -> SchedulerSnapshot:
+        """Snapshot scheduler state, tagged with the ledger's next sequence number."""
+        return self.scheduler.snapshot(self.ledger.next_sequence)
+
+    def restore_scheduler(self, snapshot: SchedulerSnapshot) -> None:
+        """
+        Restore scheduler state saved alongside the current ledger.
+
+        Raises:
+            LedgerError: If the snapshot was taken at a different ledger sequence
+        """
+        self.scheduler.restore(snapshot, ledger_sequence=self.ledger.next_sequence)
+        self._wake_cache = None
+
     # ========================================================================
     # QUERY METHODS
     # ========================================================================
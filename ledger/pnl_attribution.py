@@ -0,0 +1,371 @@
+"""
+pnl_attribution.py - Per-step P&L attribution
+
+PnLAttribution listens to LifecycleEngine steps (add_step_listener) and
+splits each wallet's P&L over the step into:
+
+- price: start-of-step positions times the change in price
+- trading: transactions executed outside the engine since the last step in
+  which the wallet both gave and received (value received minus value given,
+  at the step's prices)
+- lifecycle: transactions executed by the engine during the step (coupons,
+  dividends, settlements, funding resets, ...)
+- fees: moves whose contract_id has a 'fee' token (e.g. return_X_fee),
+  whatever transaction they are in
+- transfers: other transactions executed outside the engine (deposits,
+  withdrawals, issuance); not P&L, kept so the components reconcile
+
+Flows are valued at the step's prices (the last known price for units the
+snapshot does not quote). A unit's first price only sets its baseline, so
+it produces no price P&L. With every held unit priced at consecutive steps:
+NAV(end) - NAV(start) = price + trading + lifecycle + fees + transfers.
+
+Only what changed is touched: the transactions appended to the ledger's log
+since the previous step, and the holders (from the ledger's position index)
+of units whose price changed. When the step's PriceSnapshot was built
+from the previous step's (its parent is that snapshot's serial), its
+changed set gives those units; otherwise every price is compared. One row per wallet with a non-zero
+component is appended to a PnLStore, a columnar store queried per wallet
+and date range, so attribution never needs to be reconstructed from the
+full transaction log. Attached to an engine, attribution follows
+LifecycleEngine.restore(): rows after the checkpoint are dropped and
+attribution resumes from the restored ledger.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .core import Move, SYSTEM_WALLET, Transaction
+from .ledger import Ledger
+from .price_snapshot import PriceSnapshot
+from .pricing_source import to_epoch_us
+
+
+PNL_COMPONENTS = ('price', 'trading', 'lifecycle', 'fees', 'transfers')
+
+_ZERO = Decimal("0")
+_PRICE, _TRADING, _LIFECYCLE, _FEES, _TRANSFERS = range(len(PNL_COMPONENTS))
+
+
+def _is_fee(move: Move) -> bool:
+    """True for moves tagged as fees (a 'fee' token in the contract_id)."""
+    return 'fee' in move.contract_id.lower().split('_')
+
+
+class PnLStore:
+    """
+    Columnar in-memory store of per-step, per-wallet P&L rows.
+
+    Columns are NumPy buffers with spare capacity (doubling) holding the row
+    time, wallet code and float64 components; exact Decimal components are
+    kept per row. Rows must be appended in non-decreasing time order. Each
+    wallet keeps its own row index, so a query touches only that wallet's
+    rows and finds the date range by binary search.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._codes = np.empty(capacity, dtype=np.int32)
+        self._values = np.empty((capacity, len(PNL_COMPONENTS)), dtype=np.float64)
+        self._timestamps: List[datetime] = []
+        self._exact: List[Tuple[Decimal, ...]] = []
+        self._wallets: List[str] = []
+        self._wallet_codes: Dict[str, int] = {}
+        self._rows_by_wallet: Dict[int, List[int]] = {}
+        self._size = 0
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._times)
+        n = self._size
+        times = np.empty(capacity, dtype=np.int64)
+        codes = np.empty(capacity, dtype=np.int32)
+        values = np.empty((capacity, len(PNL_COMPONENTS)), dtype=np.float64)
+        times[:n], codes[:n], values[:n] = self._times[:n], self._codes[:n], self._values[:n]
+        self._times, self._codes, self._values = times, codes, values
+
+    def append(self, timestamp: datetime, wallet: str, components: Sequence[Decimal]) -> None:
+        """
+        Add one row.
+
+        Raises:
+            ValueError: If timestamp is before the last row's, or components
+                        do not match PNL_COMPONENTS
+        """
+        if len(components) != len(PNL_COMPONENTS):
+            raise ValueError(f"Expected {len(PNL_COMPONENTS)} components, got {len(components)}")
+        us = to_epoch_us(timestamp)
+        n = self._size
+        if n and us < self._times[n - 1]:
+            raise ValueError(f"P&L rows must be appended in time order, got {timestamp} after "
+                             f"{self._timestamps[-1]}")
+        if n == len(self._times):
+            self._grow()
+        code = self._wallet_codes.get(wallet)
+        if code is None:
+            code = self._wallet_codes[wallet] = len(self._wallets)
+            self._wallets.append(wallet)
+            self._rows_by_wallet[code] = []
+        self._times[n] = us
+        self._codes[n] = code
+        self._values[n] = [float(c) for c in components]
+        self._timestamps.append(timestamp)
+        self._exact.append(tuple(components))
+        self._rows_by_wallet[code].append(n)
+        self._size = n + 1
+
+    def truncate(self, after: datetime) -> List[Tuple[str, Tuple[Decimal, ...]]]:
+        """
+        Drop rows timed after `after` (e.g. steps undone by a restore).
+
+        Returns:
+            The dropped rows as (wallet, exact components)
+        """
+        n = int(np.searchsorted(self._times[:self._size], to_epoch_us(after), side='right'))
+        dropped = [(self._wallets[code], exact)
+                   for code, exact in zip(self._codes[n:self._size].tolist(), self._exact[n:])]
+        for rows in self._rows_by_wallet.values():
+            while rows and rows[-1] >= n:
+                rows.pop()
+        del self._timestamps[n:]
+        del self._exact[n:]
+        self._size = n
+        return dropped
+
+    def _rows(self, wallet: Optional[str], start: Optional[datetime], end: Optional[datetime]) -> np.ndarray:
+        """Row numbers for a wallet (None: all) with start <= time <= end."""
+        if wallet is None:
+            rows = np.arange(self._size)
+        else:
+            code = self._wallet_codes.get(wallet)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            rows = np.asarray(self._rows_by_wallet[code], dtype=np.int64)
+        times = self._times[rows]
+        lo = 0 if start is None else int(np.searchsorted(times, to_epoch_us(start), side='left'))
+        hi = len(rows) if end is None else int(np.searchsorted(times, to_epoch_us(end), side='right'))
+        return rows[lo:hi]
+
+    def query(
+        self,
+        wallet: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rows for one wallet (or all) between start and end, both inclusive.
+
+        Returns:
+            Columns 'timestamp' (datetime64[us]), 'wallet' (object) and one
+            float64 column per PNL_COMPONENTS name plus 'total'
+        """
+        rows = self._rows(wallet, start, end)
+        values = self._values[rows]
+        wallets = np.array(self._wallets, dtype=object)
+        columns = {
+            'timestamp': self._times[rows].astype('datetime64[us]'),
+            'wallet': wallets[self._codes[rows]] if len(wallets) else np.empty(0, dtype=object),
+        }
+        for i, name in enumerate(PNL_COMPONENTS):
+            columns[name] = values[:, i]
+        columns['total'] = values.sum(axis=1)
+        return columns
+
+    def totals(
+        self,
+        wallet: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Decimal]:
+        """Exact component sums for one wallet (or all) between start and end."""
+        sums = [_ZERO] * len(PNL_COMPONENTS)
+        exact = self._exact
+        for row in self._rows(wallet, start, end).tolist():
+            sums = [a + b for a, b in zip(sums, exact[row])]
+        return dict(zip(PNL_COMPONENTS, sums))
+
+    @property
+    def wallets(self) -> List[str]:
+        """Wallets with at least one row, in first-seen order."""
+        return [wallet for code, wallet in enumerate(self._wallets) if self._rows_by_wallet[code]]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return f"PnLStore({self._size} rows, {len(self._wallets)} wallets)"
+
+
+class PnLAttribution:
+    """
+    Incremental per-step P&L attribution for every wallet of a ledger.
+
+    Example:
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.run(timestamps, price_fn)
+        attribution.store.totals("alice", start, end)
+    """
+
+    def __init__(
+        self,
+        ledger: Ledger,
+        store: Optional[PnLStore] = None,
+        initial_prices: Optional[Mapping[str, Decimal]] = None,
+        exclude_wallets: Iterable[str] = (SYSTEM_WALLET,),
+    ):
+        """
+        Start attributing from the ledger's current state.
+
+        Args:
+            ledger: Ledger the engine runs on
+            store: Destination for rows (default: a new PnLStore)
+            initial_prices: Prices the current positions are marked at; units
+                            without one take their first step price as baseline
+            exclude_wallets: Wallets not attributed (default: SYSTEM_WALLET)
+
+        Transactions already in the log are not attributed.
+        """
+        self.ledger = ledger
+        self.store = store if store is not None else PnLStore()
+        self._prices: Dict[str, Decimal] = dict(initial_prices or {})
+        self._excluded: Set[str] = set(exclude_wallets)
+        self._synced = len(ledger.transaction_log)
+        self._serial: Optional[int] = None  # Serial of the last step's PriceSnapshot
+        self._cumulative: Dict[str, List[Decimal]] = {}
+        self._engine = None
+
+    def attach(self, engine) -> PnLAttribution:
+        """Subscribe to an engine's steps and restores; returns self."""
+        self._engine = engine
+        engine.add_step_listener(self.on_step)
+        engine.add_restore_listener(self.on_restore)
+        return self
+
+    def on_restore(self, checkpoint) -> None:
+        """
+        Rewind with the engine after LifecycleEngine.restore().
+
+        Rows after the checkpoint are dropped and taken out of the running
+        totals, and the restored transaction log counts as already
+        attributed. Prices keep their last values, so the first step after
+        the restore marks the restored positions from those.
+        """
+        if self._engine is not None:
+            self.ledger = self._engine.ledger
+        self._synced = len(self.ledger.transaction_log)
+        self._serial = None
+        for wallet, row in self.store.truncate(checkpoint.timestamp):
+            cumulative = self._cumulative.get(wallet)
+            if cumulative is not None:
+                self._cumulative[wallet] = [a - b for a, b in zip(cumulative, row)]
+
+    def on_step(
+        self,
+        timestamp: datetime,
+        prices: Mapping[str, Decimal],
+        transactions: Sequence[Transaction],
+    ) -> None:
+        """
+        Attribute one engine step.
+
+        Args:
+            timestamp: Step timestamp
+            prices: Step prices (the engine's PriceSnapshot)
+            transactions: Transactions the engine executed during the step
+        """
+        if self._engine is not None:
+            self.ledger = self._engine.ledger  # Follow the engine's ledger
+        log = self.ledger.transaction_log
+        new = log[self._synced:]
+        self._synced = len(log)
+        lifecycle_ids = {tx.exec_id for tx in transactions}
+        excluded = self._excluded
+        last_prices = self._prices
+
+        def mark(unit: str) -> Optional[Decimal]:
+            price = prices.get(unit)
+            return last_prices.get(unit) if price is None else price
+
+        rows: Dict[str, List[Decimal]] = {}
+        deltas: Dict[str, Dict[str, Decimal]] = defaultdict(dict)  # unit -> wallet -> quantity
+
+        for tx in new:
+            if tx.exec_id in lifecycle_ids:
+                senders = receivers = None
+            else:
+                senders = {m.source for m in tx.moves}
+                receivers = {m.dest for m in tx.moves}
+            for move in tx.moves:
+                price = mark(move.unit_symbol)
+                unit_deltas = deltas[move.unit_symbol]
+                for wallet, quantity in ((move.source, -move.quantity), (move.dest, move.quantity)):
+                    if wallet in excluded:
+                        continue
+                    unit_deltas[wallet] = unit_deltas.get(wallet, _ZERO) + quantity
+                    if price is None:
+                        continue
+                    if _is_fee(move):
+                        component = _FEES
+                    elif senders is None:
+                        component = _LIFECYCLE
+                    elif wallet in senders and wallet in receivers:
+                        component = _TRADING
+                    else:
+                        component = _TRANSFERS
+                    row = rows.get(wallet)
+                    if row is None:
+                        row = rows[wallet] = [_ZERO] * len(PNL_COMPONENTS)
+                    row[component] += quantity * price
+
+        # Price P&L on start-of-step positions (current minus this step's flows)
+        serial = prices.serial if isinstance(prices, PriceSnapshot) else None
+        if serial is not None and self._serial is not None and prices.parent == self._serial:
+            candidates: Iterable[str] = prices.changed  # Diffed against the previous step's snapshot
+        else:
+            candidates = prices
+        self._serial = serial
+        positions_by_unit = self.ledger._positions_by_unit
+        for unit in candidates:
+            price = prices[unit]
+            previous = last_prices.get(unit)
+            if previous == price:
+                continue
+            last_prices[unit] = price
+            if previous is None:
+                continue  # First price: baseline only
+            move_size = price - previous
+            positions = positions_by_unit.get(unit, {})
+            unit_deltas = deltas.get(unit, {})
+            for wallet in set(positions) | set(unit_deltas):
+                if wallet in excluded:
+                    continue
+                start_quantity = positions.get(wallet, _ZERO) - unit_deltas.get(wallet, _ZERO)
+                if not start_quantity:
+                    continue
+                row = rows.get(wallet)
+                if row is None:
+                    row = rows[wallet] = [_ZERO] * len(PNL_COMPONENTS)
+                row[_PRICE] += start_quantity * move_size
+
+        for wallet in sorted(rows):
+            row = rows[wallet]
+            if not any(row):
+                continue
+            self.store.append(timestamp, wallet, row)
+            cumulative = self._cumulative.get(wallet)
+            if cumulative is None:
+                self._cumulative[wallet] = list(row)
+            else:
+                self._cumulative[wallet] = [a + b for a, b in zip(cumulative, row)]
+
+    def cumulative(self, wallet: str) -> Dict[str, Decimal]:
+        """Running component totals of a wallet since attribution started."""
+        totals = self._cumulative.get(wallet, [_ZERO] * len(PNL_COMPONENTS))
+        return dict(zip(PNL_COMPONENTS, totals))
+
+    def __repr__(self):
+        return f"PnLAttribution({self.ledger.name!r}, {len(self.store)} rows)"
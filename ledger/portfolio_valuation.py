@@ -0,0 +1,246 @@
+"""
+portfolio_valuation.py - Incremental mark-to-market valuation of a Ledger
+
+PortfolioValuation keeps the value of every (wallet, unit) position, the NAV
+of every wallet and the total value of every unit up to date without
+revaluing the whole book:
+
+- Trades: transactions appended to ledger.transaction_log since the last
+  sync are scanned for their moves; only the (wallet, unit) cells those
+  moves touched are re-read from the ledger's position index and revalued.
+- Price ticks: mark() / apply_prices() revalue only units whose price
+  changed, walking just that unit's holders in the position index.
+
+Each cell update adjusts the wallet NAV and unit total by the difference
+from the cell's previous value, so a trade costs a few Decimal operations
+and a tick costs one per holder of the ticked unit, regardless of how many
+wallets and units the ledger holds.
+
+Units held without a price contribute nothing and are listed in unpriced
+until a price arrives. A unit missing from a later mark() keeps its last
+price. Balances changed outside execute() (set_balance() in test mode) do
+not appear in the transaction log; call rebuild() after using it. A log
+that no longer ends with the last synced transaction (e.g. the ledger's
+state was restored from a checkpoint) triggers a rebuild on the next sync.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from .core import SYSTEM_WALLET, Transaction
+from .ledger import Ledger
+from .pricing_source import PricingSource
+
+
+_ZERO = Decimal("0")
+
+
+class PortfolioValuation:
+    """
+    Mark-to-market values per wallet and per unit, maintained incrementally.
+
+    Every query first syncs with transactions executed since the last call,
+    so results always reflect the ledger's current balances at the prices
+    of the last mark.
+    """
+
+    def __init__(
+        self,
+        ledger: Ledger,
+        source: PricingSource,
+        timestamp: Optional[datetime] = None,
+        exclude_wallets: Iterable[str] = (SYSTEM_WALLET,),
+    ):
+        """
+        Value the ledger from scratch at timestamp.
+
+        Args:
+            ledger: Ledger to value
+            source: Prices in a common base currency
+            timestamp: Pricing time (default: the ledger's current time)
+            exclude_wallets: Wallets left out of NAVs and unit totals
+                             (default: SYSTEM_WALLET, which holds issuance)
+        """
+        self._ledger = ledger
+        self._source = source
+        self._excluded: Set[str] = set(exclude_wallets)
+        self.rebuild(timestamp)
+
+    # ------------------------------------------------------------------
+    # Full and incremental updates
+    # ------------------------------------------------------------------
+
+    def rebuild(self, timestamp: Optional[datetime] = None) -> None:
+        """Revalue every position from scratch (prices re-read at timestamp)."""
+        self.timestamp = timestamp if timestamp is not None else self._ledger.current_time
+        positions_by_unit = self._ledger._positions_by_unit
+        held = {unit for unit, positions in positions_by_unit.items() if positions}
+        self._prices: Dict[str, Decimal] = dict(self._source.get_prices(held, self.timestamp))
+        self._cells: Dict[str, Dict[str, Decimal]] = defaultdict(dict)
+        self._wallet_navs: Dict[str, Decimal] = {}
+        self._unit_values: Dict[str, Decimal] = {}
+        self._unpriced: Set[str] = set()
+        for unit in held:
+            self._revalue_unit(unit)
+        self._mark_synced(self._ledger.transaction_log)
+
+    def _mark_synced(self, log: List[Transaction]) -> None:
+        """Remember the log and its last transaction, to detect replacement."""
+        self._log = log
+        self._synced = len(log)
+        self._last_tx: Optional[Transaction] = log[-1] if log else None
+
+    def sync(self) -> int:
+        """
+        Apply transactions executed since the last sync.
+
+        Returns:
+            Number of transactions applied
+        """
+        log = self._ledger.transaction_log
+        synced = self._synced
+        if log is not self._log or len(log) < synced or (synced and log[synced - 1] is not self._last_tx):
+            # Log was replaced (e.g. restored ledger state): start over
+            self.rebuild(self.timestamp)
+            return 0
+        pending = len(log) - self._synced
+        if not pending:
+            return 0
+
+        touched: Dict[str, Set[str]] = defaultdict(set)
+        for tx in log[synced:]:
+            for move in tx.moves:
+                wallets = touched[move.unit_symbol]
+                wallets.add(move.source)
+                wallets.add(move.dest)
+        self._mark_synced(log)
+
+        positions_by_unit = self._ledger._positions_by_unit
+        for unit, wallets in touched.items():
+            price = self._prices.get(unit)
+            if price is None:
+                # First trade in a unit without a price: try to price it now
+                price = self._source.get_price(unit, self.timestamp)
+                if price is not None:
+                    self._prices[unit] = price
+                self._revalue_unit(unit)
+                continue
+            positions = positions_by_unit.get(unit, {})
+            for wallet in wallets - self._excluded:
+                quantity = positions.get(wallet)
+                self._set_cell(unit, wallet, _ZERO if quantity is None else quantity * price)
+        return pending
+
+    def mark(self, timestamp: datetime) -> Set[str]:
+        """
+        Re-price every held unit at timestamp.
+
+        Returns:
+            Units whose price changed (only these were revalued)
+        """
+        self.sync()
+        self.timestamp = timestamp
+        held = {unit for unit, positions in self._ledger._positions_by_unit.items() if positions}
+        return self._apply(self._source.get_prices(held, timestamp))
+
+    def apply_prices(self, prices: Mapping[str, Decimal], timestamp: Optional[datetime] = None) -> Set[str]:
+        """
+        Apply a price tick (e.g. a PriceSnapshot or its changed units).
+
+        Args:
+            prices: New prices; units not listed keep their current price
+            timestamp: New pricing time (default: unchanged)
+
+        Returns:
+            Units whose price changed (only these were revalued)
+        """
+        self.sync()
+        if timestamp is not None:
+            self.timestamp = timestamp
+        return self._apply(prices)
+
+    def _apply(self, prices: Mapping[str, Decimal]) -> Set[str]:
+        changed = set()
+        for unit, price in prices.items():
+            if self._prices.get(unit) != price:
+                self._prices[unit] = price
+                changed.add(unit)
+                self._revalue_unit(unit)
+        return changed
+
+    def _revalue_unit(self, unit: str) -> None:
+        """Revalue every holder of one unit at its current price."""
+        positions = self._ledger._positions_by_unit.get(unit, {})
+        price = self._prices.get(unit)
+        if price is None:
+            self._check_unpriced(unit, positions)
+            return
+        self._unpriced.discard(unit)
+        cells = self._cells.get(unit, {})
+        for wallet in set(cells) - set(positions):
+            self._set_cell(unit, wallet, _ZERO)
+        excluded = self._excluded
+        for wallet, quantity in positions.items():
+            if wallet not in excluded:
+                self._set_cell(unit, wallet, quantity * price)
+
+    def _check_unpriced(self, unit: str, positions: Mapping[str, Decimal]) -> None:
+        if any(wallet not in self._excluded for wallet in positions):
+            self._unpriced.add(unit)
+        else:
+            self._unpriced.discard(unit)
+
+    def _set_cell(self, unit: str, wallet: str, value: Decimal) -> None:
+        """Set one position's value, adjusting its wallet NAV and unit total."""
+        cells = self._cells[unit]
+        old = cells.get(wallet, _ZERO)
+        if value == old:
+            return
+        if value:
+            cells[wallet] = value
+        else:
+            cells.pop(wallet, None)
+        difference = value - old
+        self._wallet_navs[wallet] = self._wallet_navs.get(wallet, _ZERO) + difference
+        self._unit_values[unit] = self._unit_values.get(unit, _ZERO) + difference
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def nav(self, wallet: str) -> Decimal:
+        """Net asset value of a wallet (sum of its priced positions)."""
+        self.sync()
+        return self._wallet_navs.get(wallet, _ZERO)
+
+    def navs(self) -> Dict[str, Decimal]:
+        """NAV of every wallet that has held a priced position."""
+        self.sync()
+        return dict(self._wallet_navs)
+
+    def unit_value(self, unit: str) -> Decimal:
+        """Total value of a unit across (non-excluded) wallets."""
+        self.sync()
+        return self._unit_values.get(unit, _ZERO)
+
+    def position_value(self, wallet: str, unit: str) -> Decimal:
+        """Value of one wallet's position in one unit."""
+        self.sync()
+        return self._cells.get(unit, {}).get(wallet, _ZERO)
+
+    def price(self, unit: str) -> Optional[Decimal]:
+        """Price currently used for a unit (None if unpriced)."""
+        return self._prices.get(unit)
+
+    @property
+    def unpriced(self) -> Set[str]:
+        """Units held by valued wallets that have no price."""
+        self.sync()
+        return set(self._unpriced)
+
+    def __repr__(self):
+        return (f"PortfolioValuation({self._ledger.name!r}, {len(self._wallet_navs)} wallets, "
+                f"at {self.timestamp})")
@@ -0,0 +1,380 @@
+"""
+price_feed.py - Asyncio price-feed ingestion with snapshot publication
+
+Consumes newline-delimited JSON price updates from a local stream (Unix
+socket, pipe, or a FeedReplayer standing in for a vendor feed), coalesces
+them into a pending buffer, and publishes immutable PriceSnapshots for the
+LifecycleEngine.
+
+Wire format, one JSON object per line:
+    {"t": "2025-01-02T09:30:00", "unit": "AAPL", "price": "187.25"}
+    {"t": "2025-01-02T09:30:00", "prices": {"AAPL": "187.25", "MSFT": "410.1"}}
+Prices are strings (or numbers) parsed as Decimal; a line with a missing,
+non-numeric or non-finite (NaN, Infinity) price is rejected as a whole.
+
+Publication:
+- Updates that arrive together (already buffered in the stream) are
+  coalesced: the latest price per unit wins, and one snapshot is published
+  once the reader has to wait for more data (or max_pending is reached).
+- Publishing derives the next PriceSnapshot from the current one with
+  PriceSnapshot.updated(), so only the buffered units are converted and
+  diffed, and swaps it in with one attribute assignment. Readers take `ingestor.snapshot` without locks and always see
+  a complete, immutable snapshot; the engine never waits on ingestion.
+- Latency from receipt of an update to its snapshot being visible is
+  recorded in a LatencyHistogram.
+
+Also provides FeedReplayer (replays a recorded feed file, optionally at
+recorded pace) and benchmark_latency(). Command line:
+    python -m ledger.price_feed replay FEED_FILE SOCKET_PATH [--speed X]
+    python -m ledger.price_feed bench [--updates N] [--units N]
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import socket
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter_ns
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Tuple, Union,
+)
+
+from .engine_metrics import LatencyHistogram
+from .price_snapshot import PriceSnapshot, validate_price
+
+
+# A parsed update: observation time and the prices it carries
+PriceUpdate = Tuple[datetime, Dict[str, Decimal]]
+
+
+def parse_update(line: Union[str, bytes]) -> PriceUpdate:
+    """
+    Parse one wire-format line.
+
+    Raises:
+        ValueError: If the line is not a valid update, or a price is not a
+                    finite number (NaN and Infinity included)
+    """
+    try:
+        message = json.loads(line)
+        timestamp = datetime.fromisoformat(message['t'])
+        if 'prices' in message:
+            prices = {unit: validate_price(unit, price) for unit, price in message['prices'].items()}
+        else:
+            prices = {message['unit']: validate_price(message['unit'], message['price'])}
+    except (KeyError, TypeError, AttributeError, ArithmeticError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid price update {line!r}: {e}") from None
+    return timestamp, prices
+
+
+def format_update(timestamp: datetime, prices: Mapping[str, Decimal]) -> str:
+    """Encode an update as one wire-format line (with trailing newline)."""
+    return json.dumps({
+        't': timestamp.isoformat(),
+        'prices': {unit: str(price) for unit, price in prices.items()},
+    }) + "\n"
+
+
+class PriceFeedIngestor:
+    """
+    Coalesces streamed price updates into atomically published snapshots.
+
+    Example:
+        ingestor = PriceFeedIngestor(initial=opening_prices, timestamp=open_time)
+        asyncio.create_task(ingestor.ingest_unix_socket("/tmp/feed.sock"))
+        async for timestamp, prices in ingestor.snapshots():
+            engine.step(timestamp, prices)
+
+    Or, for an engine loop on its own clock:
+        engine.step(now, ingestor.snapshot)
+    """
+
+    def __init__(
+        self,
+        initial: Optional[Mapping[str, Decimal]] = None,
+        timestamp: Optional[datetime] = None,
+        max_pending: int = 1000,
+    ):
+        """
+        Args:
+            initial: Prices visible before any update arrives
+            timestamp: Time of the initial prices
+            max_pending: Publish once this many updates are buffered, even
+                         if more input is immediately available
+        """
+        if max_pending <= 0:
+            raise ValueError(f"max_pending must be positive, got {max_pending}")
+        self.max_pending = max_pending
+        self.snapshot = PriceSnapshot(initial or {}, timestamp)
+        self.latency = LatencyHistogram()
+        self.updates_received = 0
+        self.snapshots_published = 0
+        self.rejected_lines = 0
+        self.rejected_prices = 0
+        self._pending: Dict[str, Decimal] = {}
+        self._pending_time: Optional[datetime] = None
+        self._received_ns: List[int] = []
+        self._publish_scheduled = False
+        self._published = asyncio.Event()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Buffering and publication (synchronous; safe to call from the loop)
+    # ------------------------------------------------------------------
+
+    def submit(self, timestamp: datetime, prices: Mapping[str, Decimal]) -> None:
+        """Buffer an update; it becomes visible at the next publish()."""
+        self._pending.update(prices)
+        if self._pending_time is None or timestamp > self._pending_time:
+            self._pending_time = timestamp
+        self._received_ns.append(perf_counter_ns())
+        self.updates_received += 1
+        if len(self._received_ns) >= self.max_pending:
+            self.publish()
+
+    def publish(self) -> Optional[PriceSnapshot]:
+        """
+        Publish buffered updates as a new snapshot.
+
+        Invalid prices in the buffer (only possible through submit(), since
+        parse_update() rejects them) are dropped and counted in
+        rejected_prices; the rest of the buffer is still published.
+
+        Returns:
+            The new snapshot, or None if nothing was pending
+        """
+        self._publish_scheduled = False
+        if not self._received_ns:
+            return None
+        current = self.snapshot
+        timestamp = self._pending_time
+        if current.timestamp is not None and timestamp < current.timestamp:
+            timestamp = current.timestamp  # Snapshots never move backwards in time
+        try:
+            snapshot = current.updated(self._pending, timestamp)
+        except ValueError:
+            # An invalid price was submitted directly: drop it, publish the rest
+            pending = {}
+            for unit, price in self._pending.items():
+                try:
+                    pending[unit] = validate_price(unit, price)
+                except ValueError:
+                    self.rejected_prices += 1
+            snapshot = current.updated(pending, timestamp)
+        self.snapshot = snapshot  # The swap: a single reference assignment
+
+        now = perf_counter_ns()
+        for received in self._received_ns:
+            self.latency.record(now - received)
+        self._pending = {}
+        self._pending_time = None
+        self._received_ns = []
+        self.snapshots_published += 1
+        self._published.set()
+        return snapshot
+
+    def _schedule_publish(self) -> None:
+        """Publish once the reader next yields to the event loop."""
+        if not self._publish_scheduled:
+            self._publish_scheduled = True
+            asyncio.get_running_loop().call_soon(self.publish)
+
+    # ------------------------------------------------------------------
+    # Stream consumption
+    # ------------------------------------------------------------------
+
+    async def ingest(self, reader: asyncio.StreamReader) -> None:
+        """
+        Consume wire-format lines until EOF.
+
+        Malformed lines are counted in rejected_lines and skipped.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    timestamp, prices = parse_update(line)
+                except ValueError:
+                    self.rejected_lines += 1
+                    continue
+                self.submit(timestamp, prices)
+                self._schedule_publish()
+        finally:
+            self.publish()
+            self._closed = True
+            self._published.set()
+
+    async def ingest_unix_socket(self, path: Union[str, Path]) -> None:
+        """Connect to a Unix socket and ingest until the peer closes it."""
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        try:
+            await self.ingest(reader)
+        finally:
+            writer.close()
+
+    async def ingest_pipe(self, pipe: Any) -> None:
+        """Ingest from a readable file object (e.g. os.fdopen of a pipe)."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+        try:
+            await self.ingest(reader)
+        finally:
+            transport.close()
+
+    async def snapshots(self) -> AsyncIterator[Tuple[datetime, PriceSnapshot]]:
+        """
+        Yield (timestamp, snapshot) each time a new snapshot is published.
+
+        Intermediate snapshots published while the consumer was busy are
+        skipped: the consumer always gets the latest one. Ends after the
+        ingest stream closes. Suitable as a LifecycleEngine.arun_stream() feed.
+        """
+        last_version = None
+        while True:
+            snapshot = self.snapshot
+            if snapshot.version != last_version:
+                last_version = snapshot.version
+                if snapshot.timestamp is not None:
+                    yield snapshot.timestamp, snapshot
+                continue
+            if self._closed:
+                return
+            self._published.clear()
+            await self._published.wait()
+
+    def __repr__(self):
+        return (f"PriceFeedIngestor(v{self.snapshot.version}, "
+                f"{self.updates_received} updates, {self.snapshots_published} published)")
+
+
+class FeedReplayer:
+    """
+    Replays a recorded feed (wire-format lines) into a stream.
+
+    With speed=None lines are written as fast as the stream accepts them;
+    otherwise the gaps between recorded timestamps are reproduced, divided
+    by speed (speed=60 plays one recorded minute per second).
+    """
+
+    def __init__(self, lines: Iterable[str], speed: Optional[float] = None):
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed}")
+        self.lines = lines
+        self.speed = speed
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], speed: Optional[float] = None) -> FeedReplayer:
+        """Replay a file of wire-format lines."""
+        with open(path) as f:
+            return cls(f.readlines(), speed)
+
+    async def replay(self, writer: asyncio.StreamWriter, close: bool = True) -> int:
+        """
+        Write every line to writer.
+
+        Returns:
+            Number of lines written
+        """
+        count = 0
+        previous: Optional[datetime] = None
+        for line in self.lines:
+            if not line.endswith("\n"):
+                line += "\n"
+            if self.speed is not None:
+                timestamp, _ = parse_update(line)
+                if previous is not None and timestamp > previous:
+                    await asyncio.sleep((timestamp - previous).total_seconds() / self.speed)
+                previous = timestamp
+            writer.write(line.encode())
+            await writer.drain()
+            count += 1
+        if close:
+            writer.close()
+            await writer.wait_closed()
+        return count
+
+    async def serve_unix_socket(self, path: Union[str, Path]) -> int:
+        """Serve one client on a Unix socket, replay, then stop."""
+        done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if not done.done():
+                done.set_result(await self.replay(writer))
+
+        server = await asyncio.start_unix_server(on_connect, str(path))
+        async with server:
+            return await done
+
+
+async def benchmark_latency(
+    updates: int = 20_000,
+    units: int = 100,
+    max_pending: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Measure update-to-visible-snapshot latency over a local socket pair.
+
+    Returns:
+        {'updates', 'snapshots', 'seconds', 'updates_per_second', 'latency'}
+        where latency is LatencyHistogram.snapshot()
+    """
+    start = datetime(2025, 1, 2, 9, 30)
+    lines = [
+        json.dumps({'t': start.isoformat(), 'unit': f"U{i % units}", 'price': str(100 + i % 97)}) + "\n"
+        for i in range(updates)
+    ]
+    left, right = socket.socketpair()
+    reader, reader_side = await asyncio.open_connection(sock=left)
+    _, writer = await asyncio.open_connection(sock=right)
+    ingestor = PriceFeedIngestor(max_pending=max_pending)
+
+    begin = perf_counter_ns()
+    await asyncio.gather(ingestor.ingest(reader), FeedReplayer(lines).replay(writer))
+    elapsed = (perf_counter_ns() - begin) / 1e9
+    reader_side.close()
+    return {
+        'updates': ingestor.updates_received,
+        'snapshots': ingestor.snapshots_published,
+        'seconds': elapsed,
+        'updates_per_second': ingestor.updates_received / elapsed if elapsed else 0.0,
+        'latency': ingestor.latency.snapshot(),
+    }
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m ledger.price_feed")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay = commands.add_parser("replay", help="serve a recorded feed on a Unix socket")
+    replay.add_argument("feed_file")
+    replay.add_argument("socket_path")
+    replay.add_argument("--speed", type=float, default=None)
+    bench = commands.add_parser("bench", help="measure update-to-snapshot latency")
+    bench.add_argument("--updates", type=int, default=20_000)
+    bench.add_argument("--units", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        replayer = FeedReplayer.from_file(args.feed_file, args.speed)
+        count = asyncio.run(replayer.serve_unix_socket(args.socket_path))
+        print(f"Replayed {count} updates")
+    else:
+        result = asyncio.run(benchmark_latency(args.updates, args.units))
+        latency = result['latency']
+        print(f"{result['updates']} updates -> {result['snapshots']} snapshots "
+              f"in {result['seconds']:.3f}s ({result['updates_per_second']:,.0f}/s)")
+        print(f"latency p50={latency['p50_ns'] / 1000:.1f}us "
+              f"p99={latency['p99_ns'] / 1000:.1f}us max={latency['max_ns'] / 1000:.1f}us")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,239 @@
+"""
+price_snapshot.py - Immutable per-step market prices
+
+The LifecycleEngine builds one PriceSnapshot per step and hands the same
+object to every scheduled-event handler and polled contract. Conversion and
+validation happen once, in the constructor, instead of in every contract
+that receives the prices.
+
+A PriceSnapshot is a read-only Mapping[str, Decimal], so contracts written
+against plain dicts keep working unchanged. It additionally exposes:
+- index: symbol -> position in symbols / array
+- array: read-only float64 prices parallel to symbols (vectorized consumers)
+- version / changed / removed: step counter and diff against the previous
+  snapshot in the chain
+- serial / parent: process-unique id of the snapshot and of the one it was
+  diffed against, so a consumer can tell whether changed is relative to
+  the snapshot it saw last (versions alone repeat across chains)
+- same_prices(): compare a raw feed against the snapshot without building
+  another one (used by fast-forward idle checks)
+- updated(): derive the next snapshot from a partial update, converting
+  and diffing only the updated symbols (used by the price feed)
+"""
+
+from __future__ import annotations
+from collections.abc import Mapping
+from itertools import count
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+_serials = count()
+
+def validate_price(symbol: str, value: Any) -> Decimal:
+    """
+    Convert a price to a finite Decimal, or raise ValueError.
+
+    The check every PriceSnapshot applies; feeds use it to reject a bad
+    price before it is buffered.
+    """
+    if not isinstance(value, Decimal):
+        try:
+            value = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f"Invalid price for {symbol}: {value!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"Non-finite price for {symbol}: {value}")
+    return value
+
+
+class PriceSnapshot(Mapping):
+    """
+    Immutable, pre-validated market prices for one timestamp.
+
+    Example:
+        snapshot = PriceSnapshot({"AAPL": 150, "MSFT": Decimal("410.5")}, timestamp)
+        snapshot["AAPL"]                      # Decimal('150')
+        snapshot.array[snapshot.index["MSFT"]]  # 410.5
+
+        nxt = PriceSnapshot({"AAPL": 151, "MSFT": Decimal("410.5")}, later, previous=snapshot)
+        nxt.version, nxt.changed              # 1, frozenset({'AAPL'})
+    """
+
+    __slots__ = ('timestamp', 'version', 'serial', 'parent', 'symbols', 'index', 'array',
+                 'changed', 'removed', '_prices')
+
+    def __init__(
+        self,
+        prices: Mapping,
+        timestamp: Optional[datetime] = None,
+        previous: Optional[PriceSnapshot] = None,
+    ):
+        """
+        Build a snapshot.
+
+        Args:
+            prices: Symbol -> price (Decimal, int, float or numeric string)
+            timestamp: Time the prices apply to
+            previous: Prior snapshot in the chain; sets version and the diff
+
+        Raises:
+            ValueError: If a price is not a finite number
+        """
+        values: Dict[str, Decimal] = {s: validate_price(s, v) for s, v in prices.items()}
+        symbols = tuple(values)
+        if previous is not None and previous.symbols == symbols:
+            index = previous.index  # Same universe: share the (read-only) map
+        else:
+            index = {s: i for i, s in enumerate(symbols)}
+        array = np.fromiter((float(v) for v in values.values()), dtype=np.float64, count=len(values))
+        array.flags.writeable = False
+
+        if previous is None:
+            version = 0
+            changed: FrozenSet[str] = frozenset(symbols)
+            removed: FrozenSet[str] = frozenset()
+        else:
+            version = previous.version + 1
+            prior = previous._prices
+            changed = frozenset(s for s, v in values.items() if prior.get(s) != v)
+            removed = frozenset(s for s in prior if s not in values)
+
+        set_ = object.__setattr__
+        set_(self, '_prices', values)
+        set_(self, 'timestamp', timestamp)
+        set_(self, 'version', version)
+        set_(self, 'serial', next(_serials))
+        set_(self, 'parent', None if previous is None else previous.serial)
+        set_(self, 'symbols', symbols)
+        set_(self, 'index', index)
+        set_(self, 'array', array)
+        set_(self, 'changed', changed)
+        set_(self, 'removed', removed)
+
+    @classmethod
+    def of(
+        cls,
+        prices: Mapping,
+        timestamp: Optional[datetime] = None,
+        previous: Optional[PriceSnapshot] = None,
+    ) -> PriceSnapshot:
+        """Return prices unchanged if already a PriceSnapshot, else build one."""
+        if isinstance(prices, cls):
+            return prices
+        return cls(prices, timestamp, previous)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PriceSnapshot is immutable")
+
+    def __getitem__(self, symbol: str) -> Decimal:
+        return self._prices[symbol]
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._prices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._prices)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def get(self, symbol: str, default: Any = None) -> Any:
+        return self._prices.get(symbol, default)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PriceSnapshot):
+            return self._prices == other._prices
+        if isinstance(other, dict):
+            return self._prices == other
+        if isinstance(other, Mapping):
+            return self._prices == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # Compares equal to dicts, so unhashable like them
+
+    def same_prices(self, prices: Mapping) -> bool:
+        """
+        True if raw prices would build a snapshot equal to this one.
+
+        Compares value by value, converting non-Decimal values as the
+        constructor does, and stops at the first difference; no snapshot is
+        built. Invalid values compare unequal.
+        """
+        if isinstance(prices, PriceSnapshot):
+            return prices._prices == self._prices
+        own = self._prices
+        if len(prices) != len(own):
+            return False
+        for symbol, value in prices.items():
+            current = own.get(symbol)
+            if current is None:
+                return False
+            if not isinstance(value, Decimal):
+                try:
+                    value = Decimal(str(value))
+                except InvalidOperation:
+                    return False
+            if value != current:
+                return False
+        return True
+
+    def updated(self, updates: Mapping, timestamp: Optional[datetime] = None) -> PriceSnapshot:
+        """
+        Next snapshot in the chain: these prices with updates applied.
+
+        Equal to PriceSnapshot({**self, **updates}, timestamp, previous=self),
+        but only the updated symbols are validated, converted and diffed. The
+        index is shared unless a new symbol appears, and the array is copied
+        only if a price changed.
+
+        Raises:
+            ValueError: If an updated price is not a finite number
+        """
+        prior = self._prices
+        values = dict(prior)
+        changed: Dict[str, Decimal] = {}
+        for symbol, value in updates.items():
+            value = validate_price(symbol, value)
+            if prior.get(symbol) != value:
+                changed[symbol] = value
+            values[symbol] = value
+        added = [s for s in changed if s not in prior]
+
+        symbols, index, array = self.symbols, self.index, self.array
+        if added:
+            symbols = symbols + tuple(added)
+            index = {**index, **{s: len(self.symbols) + i for i, s in enumerate(added)}}
+        if changed:
+            array = np.concatenate((array, np.empty(len(added), dtype=np.float64)))
+            for symbol, value in changed.items():
+                array[index[symbol]] = float(value)
+            array.flags.writeable = False
+
+        snapshot = object.__new__(PriceSnapshot)
+        set_ = object.__setattr__
+        set_(snapshot, '_prices', values)
+        set_(snapshot, 'timestamp', timestamp)
+        set_(snapshot, 'version', self.version + 1)
+        set_(snapshot, 'serial', next(_serials))
+        set_(snapshot, 'parent', self.serial)
+        set_(snapshot, 'symbols', symbols)
+        set_(snapshot, 'index', index)
+        set_(snapshot, 'array', array)
+        set_(snapshot, 'changed', frozenset(changed))
+        set_(snapshot, 'removed', frozenset())
+        return snapshot
+
+    def float_prices(self, symbols: Tuple[str, ...]) -> np.ndarray:
+        """float64 prices for the given symbols, in order (KeyError if missing)."""
+        index = self.index
+        return self.array[[index[s] for s in symbols]]
+
+    def __reduce__(self):
+        return (PriceSnapshot, (self._prices, self.timestamp))
+
+    def __repr__(self):
+        return f"PriceSnapshot(v{self.version}, {len(self._prices)} prices, changed={len(self.changed)})"
@@ -0,0 +1,249 @@
+"""
+price_store.py - On-disk, memory-mapped price history
+
+For histories too large to hold as Python objects (years of tick-derived
+prices for thousands of names), prices are written once to a directory of
+NumPy columns and read back through memory maps. Only the units and years
+that queries actually touch are paged in.
+
+Layout (one directory per store):
+    manifest.json                   units, their partitions, base currency
+    <unit_dir>/<year>.times.npy     int64 microseconds since epoch (UTC), sorted
+    <unit_dir>/<year>.prices.npy    float64 prices (for vectorized consumers)
+    <unit_dir>/<year>.exact.npy     fixed-width ASCII decimal strings (exact)
+
+Unit directories are named by index (u000000, ...) so any symbol is safe.
+
+Classes:
+- PriceStoreWriter: Writes a store one unit at a time
+- DiskPricingSource: PricingSource reading a store through memory maps
+"""
+
+from __future__ import annotations
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+import json
+
+import numpy as np
+
+from .pricing_source import from_epoch_us, to_epoch_us
+
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+# A year partition is identified by the calendar year of its observations
+_Partition = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _year_of(us: int) -> int:
+    return from_epoch_us(us).year
+
+
+class PriceStoreWriter:
+    """
+    Write a DiskPricingSource directory, one unit at a time.
+
+    Each unit's history is sorted, split by calendar year and written as
+    column files, so peak memory is one unit's history.
+
+    Example:
+        with PriceStoreWriter("prices/", base_currency="USD") as writer:
+            for symbol, path in histories():
+                writer.write_unit(symbol, path)
+        pricer = DiskPricingSource("prices/")
+    """
+
+    def __init__(self, path: Union[str, Path], base_currency: str = "USD"):
+        """
+        Create (or overwrite) a store at path.
+
+        Args:
+            path: Directory to write; created if missing
+            base_currency: Base currency recorded in the manifest
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.base_currency = base_currency
+        self._units: Dict[str, Dict[str, Any]] = {}
+
+    def write_unit(self, unit_symbol: str, path: Iterable[Tuple[datetime, Decimal]]) -> None:
+        """
+        Write one unit's full history.
+
+        Args:
+            unit_symbol: Unit symbol
+            path: (timestamp, price) pairs in any order; equal timestamps keep
+                  their given order and the last one wins on lookup
+
+        Raises:
+            ValueError: If the unit was already written
+        """
+        if unit_symbol in self._units:
+            raise ValueError(f"Unit already written: {unit_symbol}")
+        observations = sorted(path, key=lambda x: x[0])
+        unit_dir = f"u{len(self._units):06d}"
+        (self.path / unit_dir).mkdir(exist_ok=True)
+
+        times = np.array([to_epoch_us(ts) for ts, _ in observations], dtype=np.int64)
+        floats = np.array([float(price) for _, price in observations], dtype=np.float64)
+        exact = np.array([str(price).encode('ascii') for _, price in observations], dtype=np.bytes_)
+
+        years: List[int] = []
+        if len(times):
+            year_of = times.astype('datetime64[us]').astype('datetime64[Y]').astype(np.int64) + 1970
+            boundaries = np.flatnonzero(np.diff(year_of)) + 1
+            for lo, hi in zip(np.concatenate(([0], boundaries)),
+                              np.concatenate((boundaries, [len(times)]))):
+                year = int(year_of[lo])
+                prefix = self.path / unit_dir / str(year)
+                np.save(f"{prefix}.times.npy", times[lo:hi])
+                np.save(f"{prefix}.prices.npy", floats[lo:hi])
+                np.save(f"{prefix}.exact.npy", exact[lo:hi])
+                years.append(year)
+
+        self._units[unit_symbol] = {'dir': unit_dir, 'years': years}
+
+    def close(self) -> None:
+        """Write the manifest. The store is readable only after this."""
+        manifest = {
+            'version': FORMAT_VERSION,
+            'base_currency': self.base_currency,
+            'units': self._units,
+        }
+        with open(self.path / MANIFEST, 'w') as f:
+            json.dump(manifest, f)
+
+    def __enter__(self) -> PriceStoreWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+
+class DiskPricingSource:
+    """
+    PricingSource over a PriceStoreWriter directory.
+
+    Partitions are opened with np.load(mmap_mode='r') on first use and kept
+    in a small LRU, so resident memory is bounded by the partitions in use
+    rather than the size of the store. Lookups are a bisect over the unit's
+    years plus a searchsorted within one partition.
+
+    Prices are returned as exact Decimals decoded from the stored strings.
+    """
+
+    def __init__(self, path: Union[str, Path], max_open_partitions: int = 256):
+        """
+        Open a store.
+
+        Args:
+            path: Store directory (must contain manifest.json)
+            max_open_partitions: Memory-mapped partitions kept open (LRU)
+
+        Raises:
+            FileNotFoundError: If the manifest is missing
+            ValueError: If the store format is not supported
+        """
+        self.path = Path(path)
+        with open(self.path / MANIFEST) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported price store version: {manifest.get('version')}")
+        self.base_currency: str = manifest['base_currency']
+        self._units: Dict[str, Dict[str, Any]] = manifest['units']
+        self.max_open_partitions = max_open_partitions
+        self._open: OrderedDict = OrderedDict()
+
+    def units(self) -> List[str]:
+        """Units in the store, sorted."""
+        return sorted(self._units)
+
+    def _partition(self, unit_symbol: str, year: int) -> _Partition:
+        """Memory-mapped (times, floats, exact) for one unit-year."""
+        key = (unit_symbol, year)
+        partition = self._open.get(key)
+        if partition is not None:
+            self._open.move_to_end(key)
+            return partition
+        prefix = self.path / self._units[unit_symbol]['dir'] / str(year)
+        partition = (
+            np.load(f"{prefix}.times.npy", mmap_mode='r'),
+            np.load(f"{prefix}.prices.npy", mmap_mode='r'),
+            np.load(f"{prefix}.exact.npy", mmap_mode='r'),
+        )
+        self._open[key] = partition
+        if len(self._open) > self.max_open_partitions:
+            self._open.popitem(last=False)
+        return partition
+
+    def _locate(self, unit_symbol: str, timestamp: datetime) -> Optional[Tuple[_Partition, int]]:
+        """Partition and index of the last observation at or before timestamp."""
+        info = self._units.get(unit_symbol)
+        if info is None or not info['years']:
+            return None
+        years = info['years']
+        us = to_epoch_us(timestamp)
+        i = bisect_right(years, _year_of(us)) - 1
+        while i >= 0:
+            partition = self._partition(unit_symbol, years[i])
+            idx = int(np.searchsorted(partition[0], us, side='right')) - 1
+            if idx >= 0:
+                return partition, idx
+            i -= 1  # Earlier than this year's first observation: use the previous year's last
+        return None
+
+    def get_price(self, unit_symbol: str, timestamp: datetime) -> Optional[Decimal]:
+        """Get the latest price at or before timestamp (None if none)."""
+        if unit_symbol == self.base_currency:
+            return Decimal("1.0")
+        found = self._locate(unit_symbol, timestamp)
+        if found is None:
+            return None
+        partition, idx = found
+        return Decimal(partition[2][idx].decode('ascii'))
+
+    def get_float_price(self, unit_symbol: str, timestamp: datetime) -> Optional[float]:
+        """Like get_price() but returns the float64 column value."""
+        if unit_symbol == self.base_currency:
+            return 1.0
+        found = self._locate(unit_symbol, timestamp)
+        if found is None:
+            return None
+        partition, idx = found
+        return float(partition[1][idx])
+
+    def get_prices(self, units: Set[str], timestamp: datetime) -> Dict[str, Decimal]:
+        """Get prices for multiple units at a specific timestamp."""
+        prices = {}
+        for unit in units:
+            price = self.get_price(unit, timestamp)
+            if price is not None:
+                prices[unit] = price
+        return prices
+
+    def get_all_timestamps(self, unit_symbol: str) -> List[datetime]:
+        """
+        All observation timestamps for one unit (pages in every partition).
+
+        The store keeps microseconds since the epoch only, so timestamps come
+        back as naive UTC datetimes: an aware input written as 09:30 New York
+        time reads back as 14:30 (or 13:30), naive. Lookups accept naive
+        (taken as UTC) or aware timestamps alike.
+        """
+        info = self._units.get(unit_symbol)
+        if info is None:
+            return []
+        timestamps: List[datetime] = []
+        for year in info['years']:
+            times = self._partition(unit_symbol, year)[0]
+            timestamps.extend(from_epoch_us(us) for us in times.tolist())
+        return timestamps
+
+    def __repr__(self):
+        return f"DiskPricingSource({self.path}, {len(self._units)} units, base={self.base_currency})"
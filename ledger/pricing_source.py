@@ -7,14 +7,54 @@ Classes:
 - PricingSource: Protocol defining the pricing interface
 - StaticPricingSource: Time-independent prices
 - TimeSeriesPricingSource: Time-varying prices with historical data
+- PriceCursor: Forward-only reader over a TimeSeriesPricingSource
+- PriceColumn: One unit's columnar history (TimeSeriesPricingSource.column())
 
 All prices are returned in a base currency (typically USD).
+
+TimeSeriesPricingSource stores each unit's history column-wise: an int64
+array of microsecond timestamps (the search index), a float64 mirror of the
+prices for vectorized consumers, and side lists holding the exact price and
+timestamp objects that were added. Lookups return the stored objects.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, Set, Optional, List, Tuple, Protocol, runtime_checkable
-from bisect import bisect_right
+from types import MappingProxyType
+from typing import (
+    Any, Dict, Set, Optional, List, Mapping, Tuple, Protocol, Iterable, Iterator, runtime_checkable,
+)
+from itertools import compress
+import heapq
+
+import numpy as np
+
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_NO_TAIL = np.iinfo(np.int64).max
+
+
+def to_epoch_us(ts: datetime) -> int:
+    """
+    Datetime -> int64 microseconds since the epoch, the time index of every
+    columnar price and P&L store.
+
+    Naive datetimes are taken as UTC; aware ones are converted to UTC.
+    """
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return (ts - EPOCH) // _ONE_US
+
+
+def from_epoch_us(us: int) -> datetime:
+    """
+    Microseconds since the epoch -> naive UTC datetime.
+
+    Inverse of to_epoch_us() up to time zone: the time zone of an aware
+    input is not recorded, so the result is always naive UTC.
+    """
+    return EPOCH + timedelta(microseconds=int(us))
 
 
 @runtime_checkable
@@ -79,6 +119,170 @@ class StaticPricingSource:
         return f"StaticPricingSource({len(self.prices)} prices, base={self.base_currency})"
 
 
+class PriceColumn:
+    """
+    One unit's price history as parallel columns, sorted by time.
+
+    times/floats are NumPy buffers with spare capacity (doubling), so
+    in-order appends are amortized O(1); only the first `size` slots are
+    valid. Equal timestamps keep insertion order; lookups return the last.
+    Columns handed out by TimeSeriesPricingSource.column() are live and
+    must only be read.
+    """
+
+    __slots__ = ('times', 'floats', 'datetimes', 'values', 'size')
+
+    def __init__(self, capacity: int = 16):
+        self.times = np.empty(capacity, dtype=np.int64)
+        self.floats = np.empty(capacity, dtype=np.float64)
+        self.datetimes: List[datetime] = []
+        self.values: List[Any] = []
+        self.size = 0
+
+    @classmethod
+    def from_path(cls, path: List[Tuple[datetime, Any]]) -> 'PriceColumn':
+        """Bulk-build from (timestamp, price) pairs in any order (stable sort)."""
+        path = sorted(path, key=lambda x: x[0])
+        column = cls(capacity=max(16, len(path)))
+        n = len(path)
+        column.times[:n] = [to_epoch_us(ts) for ts, _ in path]
+        column.floats[:n] = [float(price) for _, price in path]
+        column.datetimes = [ts for ts, _ in path]
+        column.values = [price for _, price in path]
+        column.size = n
+        return column
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.times)
+        times = np.empty(capacity, dtype=np.int64)
+        floats = np.empty(capacity, dtype=np.float64)
+        times[:self.size] = self.times[:self.size]
+        floats[:self.size] = self.floats[:self.size]
+        self.times, self.floats = times, floats
+
+    def append(self, ts: datetime, price: Any) -> bool:
+        """
+        Add an observation; O(1) if ts is not before the last one.
+
+        Returns:
+            True if it was appended at the end (in time order)
+        """
+        us = to_epoch_us(ts)
+        n = self.size
+        if n == len(self.times):
+            self._grow()
+        if n == 0 or us >= self.times[n - 1]:
+            idx = n
+        else:
+            idx = int(np.searchsorted(self.times[:n], us, side='right'))
+            self.times[idx + 1:n + 1] = self.times[idx:n]
+            self.floats[idx + 1:n + 1] = self.floats[idx:n]
+        self.times[idx] = us
+        self.floats[idx] = float(price)
+        self.datetimes.insert(idx, ts)
+        self.values.insert(idx, price)
+        self.size = n + 1
+        return idx == n
+
+    def index_at(self, us: int) -> int:
+        """Index of the last observation at or before us, or -1."""
+        return int(np.searchsorted(self.times[:self.size], us, side='right')) - 1
+
+    def time_array(self) -> np.ndarray:
+        return self.times[:self.size]
+
+    def float_array(self) -> np.ndarray:
+        return self.floats[:self.size]
+
+
+class _PricePanel:
+    """
+    All units' histories flattened for vectorized point-in-time lookups.
+
+    Timestamps are replaced by their rank on the union time axis, so the
+    sort key (unit_index, rank) packs into one int64 and a single
+    searchsorted answers a query for any number of units.
+
+    In-order appends after the build are not merged in; note_append()
+    records per unit where its un-panelled tail starts and its latest
+    observation. A lookup at or after a unit's latest time (the usual
+    "now" query) is answered from latest_values, one before its tail from
+    the panel, and only one inside the tail by searching the unit's column.
+    """
+
+    __slots__ = ('unit_index', 'starts', 'axis', 'keys', 'values', 'size',
+                 'tail_start', 'latest_us', 'latest_values')
+
+    def __init__(self, columns: Dict[str, PriceColumn]):
+        self.unit_index = {unit: i for i, unit in enumerate(columns)}
+        sizes = np.array([c.size for c in columns.values()], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(sizes)[:-1])) if len(sizes) else sizes
+        all_times = (np.concatenate([c.time_array() for c in columns.values()])
+                     if columns else np.empty(0, dtype=np.int64))
+        self.axis = np.unique(all_times)
+        ranks = np.searchsorted(self.axis, all_times)
+        unit_ids = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+        self.keys = unit_ids * max(len(self.axis), 1) + ranks
+        self.values = np.empty(len(all_times), dtype=object)
+        offset = 0
+        for column in columns.values():
+            self.values[offset:offset + column.size] = column.values
+            offset += column.size
+        self.size = len(all_times)
+        self.tail_start = np.full(len(sizes), _NO_TAIL, dtype=np.int64)
+        self.latest_us = np.array([c.times[c.size - 1] if c.size else _NO_TAIL for c in columns.values()],
+                                  dtype=np.int64)
+        self.latest_values = np.empty(len(sizes), dtype=object)
+        self.latest_values[:] = [c.values[-1] if c.size else None for c in columns.values()]
+
+    def note_append(self, i: int, us: int, price: Any) -> None:
+        """Record an in-order append to unit i made after the build."""
+        if self.tail_start[i] == _NO_TAIL:
+            self.tail_start[i] = us
+        self.latest_us[i] = us
+        self.latest_values[i] = price
+
+    def lookup(
+        self,
+        units: List[str],
+        us: int,
+        columns: Dict[str, PriceColumn],
+        dirty: Set[str],
+    ) -> Dict[str, Any]:
+        """Latest price at or before us per unit; dirty units search their column."""
+        prices: Dict[str, Any] = {}
+        known = []
+        for unit in units:
+            if unit in dirty or unit not in self.unit_index:
+                column = columns.get(unit)
+                if column is not None:
+                    idx = column.index_at(us)
+                    if idx >= 0:
+                        prices[unit] = column.values[idx]
+            else:
+                known.append(unit)
+        if not known:
+            return prices
+
+        idx = np.fromiter((self.unit_index[u] for u in known), dtype=np.int64, count=len(known))
+        latest = us >= self.latest_us[idx]
+        in_panel = ~latest & (us < self.tail_start[idx])
+        prices.update(zip(compress(known, latest), self.latest_values[idx[latest]]))
+
+        rank = int(np.searchsorted(self.axis, us, side='right')) - 1
+        if rank >= 0 and in_panel.any():
+            panel_units = list(compress(known, in_panel))
+            sel = idx[in_panel]
+            pos = np.searchsorted(self.keys, sel * max(len(self.axis), 1) + rank, side='right') - 1
+            found = pos >= self.starts[sel]
+            prices.update(zip(compress(panel_units, found), self.values[pos[found]]))
+
+        for unit in compress(known, ~(latest | in_panel)):
+            column = columns[unit]
+            prices[unit] = column.values[column.index_at(us)]  # us >= tail start: found
+        return prices
+
+
 class TimeSeriesPricingSource:
     """
     Pricing source with time-varying prices.
@@ -89,8 +293,18 @@ class TimeSeriesPricingSource:
     Supports two initialization patterns:
     - Empty initialization for incremental price addition via add_price()
     - Batch initialization with complete price paths for simulations
+
+    Appends in time order are amortized O(1) and lookups are an O(log n)
+    searchsorted. get_prices() for many units at once uses a vectorized
+    panel. In-order appends are tracked by the panel instead of dropping it
+    (out-of-order inserts and new units mark only that unit dirty); it is
+    rebuilt once as many observations have been added as it holds, so
+    interleaved appends and bulk lookups stay amortized O(log n) per append.
     """
 
+    # get_prices() switches to the vectorized panel at this many units
+    PANEL_THRESHOLD = 64
+
     def __init__(
         self,
         price_paths: Optional[Dict[str, List[Tuple[datetime, Decimal]]]] = None,
@@ -116,14 +330,43 @@ class TimeSeriesPricingSource:
             })
         """
         self.base_currency = base_currency
-        self.price_history: Dict[str, List[Tuple[datetime, Decimal]]] = {}
+        self._columns: Dict[str, PriceColumn] = {}
+        self._panel: Optional[_PricePanel] = None
+        self._dirty: Set[str] = set()  # Units the panel cannot answer for
+        self._unpanelled = 0  # Observations added since the panel was built
 
         if price_paths:
             for unit, path in price_paths.items():
                 if not path:
                     continue
-                # Sort by timestamp to ensure chronological order
-                self.price_history[unit] = sorted(path, key=lambda x: x[0])
+                # Sorted by timestamp to ensure chronological order
+                self._columns[unit] = PriceColumn.from_path(path)
+
+    def units(self) -> List[str]:
+        """Units with price history, in insertion order."""
+        return list(self._columns)
+
+    def column(self, unit_symbol: str) -> Optional[PriceColumn]:
+        """
+        The unit's live PriceColumn (None if it has no history).
+
+        For columnar consumers (cursors, resampling); read it, never
+        modify it - add observations through add_price().
+        """
+        return self._columns.get(unit_symbol)
+
+    @property
+    def price_history(self) -> Mapping[str, Tuple[Tuple[datetime, Decimal], ...]]:
+        """
+        Histories as a read-only {unit: ((timestamp, price), ...)} mapping.
+
+        Built on each access (O(total observations)); modify prices through
+        add_price() / add_prices(), since writes to the result would be lost.
+        """
+        return MappingProxyType({
+            unit: tuple(zip(column.datetimes, column.values))
+            for unit, column in self._columns.items()
+        })
 
     def add_price(self, unit_symbol: str, timestamp: datetime, price: Decimal):
         """
@@ -134,12 +377,24 @@ class TimeSeriesPricingSource:
             timestamp: Time of the price observation
             price: Price in base currency
         """
-        if unit_symbol not in self.price_history:
-            self.price_history[unit_symbol] = []
-
-        # Insert in sorted order (by timestamp)
-        self.price_history[unit_symbol].append((timestamp, price))
-        self.price_history[unit_symbol].sort(key=lambda x: x[0])
+        column = self._columns.get(unit_symbol)
+        if column is None:
+            column = self._columns[unit_symbol] = PriceColumn()
+
+        # Insert in sorted order (by timestamp); O(1) when appending in order
+        in_order = column.append(timestamp, price)
+        panel = self._panel
+        if panel is None:
+            return
+        self._unpanelled += 1
+        if self._unpanelled > panel.size:
+            self._panel = None  # Rebuilt on the next bulk lookup
+            return
+        i = panel.unit_index.get(unit_symbol)
+        if i is None or not in_order:
+            self._dirty.add(unit_symbol)
+        elif unit_symbol not in self._dirty:
+            panel.note_append(i, int(column.times[column.size - 1]), price)
 
     def add_prices(self, prices: Dict[str, Decimal], timestamp: datetime):
         """
@@ -159,40 +414,92 @@ class TimeSeriesPricingSource:
         Returns the most recent price at or before the requested time.
         Returns None if no price data is available before the timestamp.
 
-        Uses binary search for efficient O(log n) lookup.
+        Uses binary search (searchsorted) for O(log n) lookup.
         """
         # Base currency always prices at 1.0
         if unit_symbol == self.base_currency:
             return Decimal("1.0")
 
-        if unit_symbol not in self.price_history:
+        column = self._columns.get(unit_symbol)
+        if column is None:
             return None
 
-        history = self.price_history[unit_symbol]
-        if not history:
-            return None
-
-        # Binary search: find rightmost entry with ts <= timestamp
-        # Extract timestamps for bisect
-        timestamps = [ts for ts, _ in history]
-        idx = bisect_right(timestamps, timestamp)
-
-        if idx == 0:
+        # Rightmost entry with ts <= timestamp
+        idx = column.index_at(to_epoch_us(timestamp))
+        if idx < 0:
             # No price at or before timestamp
             return None
-
-        # Return the price at index idx-1 (last entry <= timestamp)
-        return history[idx - 1][1]
+        return column.values[idx]
 
     def get_prices(self, units: Set[str], timestamp: datetime) -> Dict[str, Decimal]:
-        """Get prices for multiple units at a specific timestamp."""
-        prices = {}
-        for unit in units:
-            price = self.get_price(unit, timestamp)
-            if price is not None:
-                prices[unit] = price
+        """
+        Get prices for multiple units at a specific timestamp.
+
+        Large requests are answered by one vectorized search over all units.
+        """
+        if len(units) < self.PANEL_THRESHOLD:
+            prices = {}
+            for unit in units:
+                price = self.get_price(unit, timestamp)
+                if price is not None:
+                    prices[unit] = price
+            return prices
+
+        if self._panel is None:
+            self._panel = _PricePanel(self._columns)
+            self._dirty.clear()
+            self._unpanelled = 0
+        prices = self._panel.lookup(list(units), to_epoch_us(timestamp), self._columns, self._dirty)
+        if self.base_currency in units:
+            prices[self.base_currency] = Decimal("1.0")
         return prices
 
+    def cursor(self, units: Optional[Iterable[str]] = None) -> 'PriceCursor':
+        """
+        Create a forward-only cursor for monotonically increasing queries.
+
+        Args:
+            units: Units to track (default: every unit with history)
+        """
+        return PriceCursor(self, units)
+
+    def iter_snapshots(
+        self,
+        units: Optional[Iterable[str]] = None,
+    ) -> Iterator[Tuple[datetime, Dict[str, Decimal]]]:
+        """
+        Yield (timestamp, prices) at every timestamp in the union of histories.
+
+        Each snapshot holds, for every tracked unit, its latest price at or
+        before the timestamp (as get_prices() would return). All histories
+        are merged in a single pass. The output can be passed directly to
+        LifecycleEngine.run_stream().
+
+        Args:
+            units: Units to include (default: every unit with history)
+        """
+        tracked = self.units() if units is None else list(units)
+        columns = [(unit, self.column(unit)) for unit in tracked if unit in self._columns]
+        base = {self.base_currency: Decimal("1.0")} if units is not None and self.base_currency in tracked else {}
+
+        streams = [
+            zip(column.time_array().tolist(), range(column.size), [i] * column.size)
+            for i, (_, column) in enumerate(columns)
+        ]
+        current: Dict[str, Decimal] = {}
+        pending_us: Optional[int] = None
+        pending_ts: Optional[datetime] = None
+        for us, idx, i in heapq.merge(*streams):
+            if us != pending_us:
+                if pending_us is not None:
+                    yield pending_ts, {**current, **base}
+                pending_us = us
+                pending_ts = columns[i][1].datetimes[idx]
+            unit, column = columns[i]
+            current[unit] = column.values[idx]
+        if pending_us is not None:
+            yield pending_ts, {**current, **base}
+
     def get_all_timestamps(self, unit_symbol: Optional[str] = None) -> List[datetime]:
         """
         Get all timestamps in the price history.
@@ -205,17 +512,81 @@ class TimeSeriesPricingSource:
             Sorted list of unique timestamps
         """
         if unit_symbol:
-            if unit_symbol in self.price_history:
-                return [ts for ts, _ in self.price_history[unit_symbol]]
+            if unit_symbol in self._columns:
+                return list(self._columns[unit_symbol].datetimes)
             return []
 
         # Get union of all timestamps
         all_times: Set[datetime] = set()
-        for path in self.price_history.values():
-            all_times.update(ts for ts, _ in path)
+        for column in self._columns.values():
+            all_times.update(column.datetimes)
 
         return sorted(all_times)
 
     def __repr__(self):
-        total_observations = sum(len(history) for history in self.price_history.values())
-        return f"TimeSeriesPricingSource({len(self.price_history)} units, {total_observations} observations, base={self.base_currency})"
+        total_observations = sum(column.size for column in self._columns.values())
+        return f"TimeSeriesPricingSource({len(self._columns)} units, {total_observations} observations, base={self.base_currency})"
+
+
+class PriceCursor:
+    """
+    Forward-only price reader over a TimeSeriesPricingSource.
+
+    Keeps a position per unit, so advancing to a later timestamp costs
+    amortized O(1) per unit (a binary search is only used to skip more
+    than one observation at once). Suited to backtests and engine runs,
+    which query prices at increasing timestamps.
+
+    Observations appended to the source in time order after the cursor's
+    position are picked up; inserting before it is not supported.
+
+    Example:
+        cursor = pricer.cursor()
+        for t in timestamps:
+            prices = cursor.advance(t)
+    """
+
+    def __init__(self, source: TimeSeriesPricingSource, units: Optional[Iterable[str]] = None):
+        self.source = source
+        tracked = source.units() if units is None else list(units)
+        columns = ((unit, source.column(unit)) for unit in tracked)
+        self._columns = [(unit, column) for unit, column in columns if column is not None]
+        self._positions = [-1] * len(self._columns)
+        self._include_base = units is not None and source.base_currency in tracked
+        self._prices: Dict[str, Decimal] = {}
+        self._us: Optional[int] = None
+        self.timestamp: Optional[datetime] = None
+
+    def advance(self, timestamp: datetime) -> Dict[str, Decimal]:
+        """
+        Move to timestamp and return prices at or before it.
+
+        Returns:
+            {unit: price} for tracked units with a price (same as get_prices())
+
+        Raises:
+            ValueError: If timestamp is before the previous one
+        """
+        us = to_epoch_us(timestamp)
+        if self._us is not None and us < self._us:
+            raise ValueError(f"PriceCursor cannot move backwards: {timestamp} < {self.timestamp}")
+        self._us = us
+        self.timestamp = timestamp
+
+        positions = self._positions
+        prices = self._prices
+        for i, (unit, column) in enumerate(self._columns):
+            pos = positions[i]
+            size = column.size
+            times = column.times
+            if pos + 1 < size and times[pos + 1] <= us:
+                if pos + 2 < size and times[pos + 2] <= us:
+                    pos = int(np.searchsorted(times[pos + 2:size], us, side='right')) + pos + 1
+                else:
+                    pos += 1
+                positions[i] = pos
+                prices[unit] = column.values[pos]
+
+        if self._include_base:
+            return {**prices, self.source.base_currency: Decimal("1.0")}
+        return dict(prices)
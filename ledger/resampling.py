@@ -0,0 +1,231 @@
+"""
+resampling.py - Regular-grid resampling of price histories
+
+Turns the irregular observations of a TimeSeriesPricingSource into prices on
+a grid of timestamps (daily closes, hourly bars, any custom calendar) in one
+vectorized pass per unit: a single searchsorted of the whole grid against
+the unit's time index, instead of a get_price() call per unit per grid point.
+
+Methods:
+- 'step': last observation at or before each grid time (as get_price())
+- 'linear': linear interpolation in time between the surrounding
+  observations; past the last observation the last price is carried forward
+
+ffill_limit bounds how long a price is carried forward: a grid time more
+than ffill_limit after the observation it would use has no price. With
+'linear' it only applies past the last observation.
+
+The float64 matrix is computed in bulk. Only the window of each unit's
+exact prices that the grid actually uses is copied, and exact Decimal prices
+are produced per grid point on demand (prices_at(), iteration), so feeding
+LifecycleEngine.run()/run_stream() costs one dict per step.
+"""
+
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .pricing_source import TimeSeriesPricingSource, to_epoch_us
+
+
+RESAMPLE_METHODS = ('step', 'linear')
+
+
+def regular_grid(start: datetime, end: datetime, step: timedelta) -> List[datetime]:
+    """
+    Timestamps start, start + step, ... up to and including end.
+
+    Raises:
+        ValueError: If step is not positive
+    """
+    if step <= timedelta(0):
+        raise ValueError(f"step must be positive, got {step}")
+    grid = []
+    t = start
+    while t <= end:
+        grid.append(t)
+        t += step
+    return grid
+
+
+def daily_grid(
+    start: date,
+    end: date,
+    at: time = time(16, 0),
+    weekdays_only: bool = True,
+    holidays: Iterable[date] = (),
+) -> List[datetime]:
+    """
+    One timestamp per business day at a fixed time (e.g. the daily close).
+
+    Args:
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        at: Time of day of each grid point
+        weekdays_only: Skip Saturdays and Sundays
+        holidays: Additional dates to skip
+    """
+    skip = set(holidays)
+    grid = []
+    day = start
+    while day <= end:
+        if not (weekdays_only and day.weekday() >= 5) and day not in skip:
+            grid.append(datetime.combine(day, at))
+        day += timedelta(days=1)
+    return grid
+
+
+class ResampledPrices:
+    """
+    Prices of several units on a common grid.
+
+    Attributes:
+        timestamps: Grid timestamps (as given)
+        units: Units, in row order
+        values: float64 array of shape (len(units), len(timestamps)),
+                NaN where a unit has no price
+
+    Iterating yields (timestamp, {unit: Decimal}) pairs, ready for
+    LifecycleEngine.run_stream(); price_fn() adapts to LifecycleEngine.run().
+    """
+
+    def __init__(
+        self,
+        timestamps: List[datetime],
+        units: List[str],
+        values: np.ndarray,
+        left: np.ndarray,
+        weights: Optional[Tuple[np.ndarray, np.ndarray]],
+        exact: List[List[Decimal]],
+        base_currency: Optional[str],
+    ):
+        self.timestamps = timestamps
+        self.units = units
+        self.values = values
+        self._left = left          # observation index used per cell (-1: none)
+        self._weights = weights    # linear: (numerator, denominator) in us; 0 denominators mean step
+        self._exact = exact        # per unit: exact prices in the window the grid uses, as of resampling
+        self._base_currency = base_currency
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def prices_at(self, i: int) -> Dict[str, Decimal]:
+        """Exact prices at grid point i (units without a price are omitted)."""
+        prices: Dict[str, Decimal] = {}
+        weights = self._weights
+        for row, unit in enumerate(self.units):
+            left = self._left[row, i]
+            if left < 0:
+                continue
+            exact_values = self._exact[row]
+            price = exact_values[left]
+            if weights is not None:
+                denominator = int(weights[1][row, i])
+                numerator = int(weights[0][row, i])
+                if denominator and numerator:
+                    upper = exact_values[left + 1]
+                    price = price + (upper - price) * Decimal(numerator) / Decimal(denominator)
+            prices[unit] = price
+        if self._base_currency is not None:
+            prices[self._base_currency] = Decimal("1.0")
+        return prices
+
+    def __iter__(self) -> Iterator[Tuple[datetime, Dict[str, Decimal]]]:
+        for i, timestamp in enumerate(self.timestamps):
+            yield timestamp, self.prices_at(i)
+
+    def price_fn(self) -> Callable[[datetime], Dict[str, Decimal]]:
+        """Adapter for LifecycleEngine.run(timestamps, get_prices_at_timestamp)."""
+        position = {ts: i for i, ts in enumerate(self.timestamps)}
+        return lambda ts: self.prices_at(position[ts])
+
+    def __repr__(self):
+        return f"ResampledPrices({len(self.units)} units x {len(self.timestamps)} timestamps)"
+
+
+def resample(
+    source: TimeSeriesPricingSource,
+    grid: Sequence[datetime],
+    units: Optional[Iterable[str]] = None,
+    method: str = 'step',
+    ffill_limit: Optional[timedelta] = None,
+) -> ResampledPrices:
+    """
+    Resample histories onto a grid of timestamps.
+
+    Args:
+        source: Price histories
+        grid: Grid timestamps in non-decreasing order
+        units: Units to resample (default: every unit with history). The
+               base currency, if listed, prices at 1.0 at every grid point.
+        method: 'step' or 'linear'
+        ffill_limit: Maximum age of a carried-forward price (None: unlimited)
+
+    Returns:
+        ResampledPrices over the grid
+
+    Raises:
+        ValueError: If method is unknown or the grid is not sorted
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resample method {method!r}; expected one of {RESAMPLE_METHODS}")
+    grid = list(grid)
+    grid_us = np.array([to_epoch_us(ts) for ts in grid], dtype=np.int64)
+    if len(grid_us) > 1 and np.any(np.diff(grid_us) < 0):
+        raise ValueError("Resampling grid must be in non-decreasing time order")
+
+    tracked = source.units() if units is None else list(units)
+    base = source.base_currency if units is not None and source.base_currency in tracked else None
+    rows = [unit for unit in tracked if source.column(unit) is not None and unit != source.base_currency]
+    limit_us = None if ffill_limit is None else ffill_limit // timedelta(microseconds=1)
+
+    shape = (len(rows), len(grid))
+    values = np.full(shape, np.nan)
+    left = np.full(shape, -1, dtype=np.int64)
+    weights = (np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)) if method == 'linear' else None
+    exact: List[List[Decimal]] = []
+
+    for row, unit in enumerate(rows):
+        column = source.column(unit)
+        times = column.time_array()
+        floats = column.float_array()
+        if column.size == 0 or not len(grid):
+            exact.append([])
+            continue
+
+        idx = np.searchsorted(times, grid_us, side='right') - 1
+        valid = idx >= 0
+        safe = np.where(valid, idx, 0)
+        if method == 'linear':
+            interior = valid & (safe + 1 < column.size)
+            upper = np.minimum(safe + 1, column.size - 1)
+            numerator = np.where(interior, grid_us - times[safe], 0)
+            denominator = np.where(interior, times[upper] - times[safe], 0)
+            if limit_us is not None:
+                valid &= interior | (grid_us - times[safe] <= limit_us)
+            fraction = np.divide(numerator, denominator, out=np.zeros(len(grid)), where=denominator > 0)
+            row_values = floats[safe] + fraction * (floats[upper] - floats[safe])
+            weights[0][row] = np.where(valid, numerator, 0)
+            weights[1][row] = np.where(valid, denominator, 0)
+        else:
+            if limit_us is not None:
+                valid &= grid_us - times[safe] <= limit_us
+            row_values = floats[safe]
+
+        values[row] = np.where(valid, row_values, np.nan)
+        # Keep only the exact prices the grid uses: idx is non-decreasing,
+        # so they form one window (plus the upper neighbour for 'linear')
+        used = idx[valid]
+        if not len(used):
+            exact.append([])
+            continue
+        lo = int(used[0])
+        hi = min(int(used[-1]) + (2 if method == 'linear' else 1), column.size)
+        exact.append(column.values[lo:hi])
+        left[row] = np.where(valid, idx - lo, -1)
+
+    return ResampledPrices(grid, rows, values, left, weights, exact, base)
@@ -11,22 +11,62 @@ Core concepts:
 1. Event: Immutable specification of what should happen and when
 2. EventScheduler: Simple priority queue for due event retrieval
 3. Handlers: Plain functions that process events -> PendingTransaction
+
+Events are identified internally by Event.key, a 64-bit hash of event_id;
+both are computed once per event and cached on it. The scheduler indexes
+pending events by key and symbol, so cancel() and reschedule() are O(1):
+cancelled heap entries are left in place and discarded when they reach
+the top (lazy deletion).
+
+Recurring schedules (coupons, dividends, observations) can be scheduled as a
+RecurringEvent: only the next occurrence is held, and the one after it is
+generated when it is popped, in exactly the order the expanded list would run.
+
+Scheduler state (pending events, recurrences, executed keys) can be saved as
+a SchedulerSnapshot tagged with the ledger sequence number it matches, and
+restored onto a scheduler with the same handlers for a warm restart.
+
+With an executor, handlers for due events sharing (trigger_time, priority)
+with distinct symbols run concurrently; results are still returned in heap
+order, so the engine sees exactly the sequence it would without one.
+
+Two storage backends share this behaviour and produce identical event order:
+- EventScheduler: a single binary heap
+- CalendarEventScheduler: a calendar queue of per-day buckets, for loading
+  multi-year corporate-action calendars with O(1) insertion
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from datetime import datetime
+from concurrent.futures import Executor
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Callable, Any, FrozenSet
+from typing import Dict, List, Optional, Callable, Any, FrozenSet, Tuple, Union, Iterator
+import calendar
+import hashlib
 import heapq
+import json
+import zlib
 
-from .core import LedgerView, PendingTransaction, empty_pending_transaction
+from .core import LedgerView, PendingTransaction, LedgerError, empty_pending_transaction
 
 
 # ============================================================================
 # EVENT DATA STRUCTURE
 # ============================================================================
 
+def event_key(event_id: str) -> int:
+    """
+    Compact 64-bit identity for an event_id string.
+
+    Deterministic across processes (unlike hash()), so keys can be persisted.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(event_id.encode(), digest_size=8).digest(), 'big'
+    )
+
+
 @dataclass(frozen=True, slots=True)
 class Event:
     """
@@ -46,6 +86,8 @@ class Event:
     symbol: str = ""
     action: str = ""
     params: tuple = ()  # Frozen for hashability: (("key1", "val1"), ("key2", "val2"))
+    _key: int = field(default=0, init=False, repr=False, compare=False)
+    _id: str = field(default='', init=False, repr=False, compare=False)
 
     def __lt__(self, other: 'Event') -> bool:
         """Enable heap ordering: time, then priority, then symbol."""
@@ -62,9 +104,213 @@ class Event:
 
     @property
     def event_id(self) -> str:
-        """Deterministic ID for deduplication (includes params for uniqueness)."""
-        params_str = "|".join(f"{k}={v}" for k, v in sorted(self.params))
-        return f"{self.action}:{self.symbol}:{self.trigger_time.isoformat()}:{params_str}"
+        """Deterministic ID for deduplication (includes params for uniqueness), computed once."""
+        event_id = self._id
+        if not event_id:
+            params_str = "|".join(f"{k}={v}" for k, v in sorted(self.params))
+            event_id = f"{self.action}:{self.symbol}:{self.trigger_time.isoformat()}:{params_str}"
+            object.__setattr__(self, '_id', event_id)
+        return event_id
+
+    @property
+    def key(self) -> int:
+        """Interned 64-bit event identity (event_key(event_id)), computed once."""
+        key = self._key
+        if not key:
+            key = event_key(self.event_id)
+            object.__setattr__(self, '_key', key)
+        return key
+
+
+# ============================================================================
+# RECURRING EVENTS
+# ============================================================================
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the end of the target month."""
+    year, month0 = divmod(dt.month - 1 + months, 12)
+    year += dt.year
+    day = min(dt.day, calendar.monthrange(year, month0 + 1)[1])
+    return dt.replace(year=year, month=month0 + 1, day=day)
+
+
+@dataclass(frozen=True, slots=True)
+class RecurrenceRule:
+    """
+    Regular schedule of datetimes: start, then every `months` or `days`.
+
+    Occurrence n is computed from start directly (not from occurrence n-1),
+    so month-end dates do not drift: Jan 31 -> Feb 29 -> Mar 31.
+
+    Attributes:
+        start: First occurrence
+        months: Step in calendar months (exclusive with days)
+        days: Step in days (exclusive with months)
+        count: Maximum number of occurrences (None for no limit)
+        until: Last allowed occurrence, inclusive (None for no limit)
+    """
+    start: datetime
+    months: int = 0
+    days: int = 0
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+
+    def __post_init__(self):
+        if (self.months > 0) == (self.days > 0) or self.months < 0 or self.days < 0:
+            raise ValueError("RecurrenceRule needs exactly one positive step: months or days")
+        if self.count is not None and self.count < 0:
+            raise ValueError(f"count must be non-negative, got {self.count}")
+
+    def occurrence(self, n: int) -> Optional[datetime]:
+        """The n-th occurrence (0-based), or None if past the end of the rule."""
+        if self.count is not None and n >= self.count:
+            return None
+        if self.months:
+            when = _add_months(self.start, self.months * n)
+        else:
+            when = self.start + timedelta(days=self.days * n)
+        if self.until is not None and when > self.until:
+            return None
+        return when
+
+    def occurrences(self) -> Iterator[datetime]:
+        """Iterate occurrences in order (infinite if neither count nor until is set)."""
+        n = 0
+        while (when := self.occurrence(n)) is not None:
+            yield when
+            n += 1
+
+
+@dataclass(frozen=True, slots=True)
+class RecurringEvent:
+    """
+    Event template repeated on a RecurrenceRule.
+
+    Each occurrence is an ordinary Event (same symbol, action, priority and
+    params, trigger_time from the rule), so event_ids, handlers and the
+    transaction log are the same as for a fully expanded schedule.
+    """
+    rule: RecurrenceRule
+    symbol: str
+    action: str
+    priority: int = 0
+    params: tuple = ()
+
+    def event_at(self, n: int) -> Optional[Event]:
+        """The n-th occurrence as an Event, or None past the end of the rule."""
+        when = self.rule.occurrence(n)
+        if when is None:
+            return None
+        return Event(
+            trigger_time=when,
+            priority=self.priority,
+            symbol=self.symbol,
+            action=self.action,
+            params=self.params,
+        )
+
+    def expand(self) -> List[Event]:
+        """All occurrences as Events (the rule must be bounded)."""
+        if self.rule.count is None and self.rule.until is None:
+            raise ValueError("Cannot expand an unbounded recurrence")
+        events = []
+        while (event := self.event_at(len(events))) is not None:
+            events.append(event)
+        return events
+
+
+# ============================================================================
+# SCHEDULER SNAPSHOTS
+# ============================================================================
+
+def _event_to_json(event: Event) -> list:
+    return [event.trigger_time.isoformat(), event.priority, event.symbol,
+            event.action, [list(p) for p in event.params]]
+
+
+def _event_from_json(data: list) -> Event:
+    when, priority, symbol, action, params = data
+    return Event(
+        trigger_time=datetime.fromisoformat(when),
+        priority=priority,
+        symbol=symbol,
+        action=action,
+        params=tuple(tuple(p) for p in params),
+    )
+
+
+def _rule_to_json(rule: RecurrenceRule) -> list:
+    return [rule.start.isoformat(), rule.months, rule.days, rule.count,
+            rule.until.isoformat() if rule.until else None]
+
+
+def _rule_from_json(data: list) -> RecurrenceRule:
+    start, months, days, count, until = data
+    return RecurrenceRule(
+        start=datetime.fromisoformat(start), months=months, days=days, count=count,
+        until=datetime.fromisoformat(until) if until else None,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerSnapshot:
+    """
+    Serializable EventScheduler state at a given ledger sequence number.
+
+    Handlers are not included (they are code); restore onto a scheduler
+    that has the same handlers registered.
+
+    Attributes:
+        ledger_sequence: Ledger.next_sequence when the snapshot was taken
+        seq: Scheduler's next tie-break sequence number
+        pending: (seq, event) for every pending event
+        recurrences: (position in pending, occurrence index, recurring event)
+                     for each pending occurrence of a recurrence
+        executed: Executed event keys, oldest first
+    """
+    ledger_sequence: int
+    seq: int
+    pending: Tuple[Tuple[int, Event], ...]
+    recurrences: Tuple[Tuple[int, int, RecurringEvent], ...]
+    executed: Tuple[int, ...]
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode as zlib-compressed JSON.
+
+        Event params must hold JSON-native values (the event factories
+        use strings). Raises TypeError otherwise.
+        """
+        data = {
+            'ledger_sequence': self.ledger_sequence,
+            'seq': self.seq,
+            'pending': [[seq, *_event_to_json(event)] for seq, event in self.pending],
+            'recurrences': [
+                [pos, n, _rule_to_json(r.rule), r.symbol, r.action, r.priority,
+                 [list(p) for p in r.params]]
+                for pos, n, r in self.recurrences
+            ],
+            'executed': list(self.executed),
+        }
+        return zlib.compress(json.dumps(data, separators=(',', ':')).encode())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SchedulerSnapshot':
+        """Decode a snapshot produced by to_bytes()."""
+        raw = json.loads(zlib.decompress(data))
+        return cls(
+            ledger_sequence=raw['ledger_sequence'],
+            seq=raw['seq'],
+            pending=tuple((item[0], _event_from_json(item[1:])) for item in raw['pending']),
+            recurrences=tuple(
+                (pos, n, RecurringEvent(
+                    rule=_rule_from_json(rule), symbol=symbol, action=action,
+                    priority=priority, params=tuple(tuple(p) for p in params),
+                ))
+                for pos, n, rule, symbol, action, priority, params in raw['recurrences']
+            ),
+            executed=tuple(raw['executed']),
+        )
 
 
 # ============================================================================
@@ -74,6 +320,13 @@ class Event:
 # Handler type: (event, view, prices) -> PendingTransaction
 EventHandler = Callable[[Event, LedgerView, Dict[str, Decimal]], PendingTransaction]
 
+# Heap entry: plain tuple so ordering never calls Event.__lt__.
+# seq breaks ties in insertion order, so equal-ranked events run FIFO.
+_Entry = Tuple[datetime, int, str, int, Event]
+
+# Default cap on remembered executed event keys
+DEFAULT_MAX_EXECUTED = 1_000_000
+
 
 class EventScheduler:
     """
@@ -84,12 +337,48 @@ class EventScheduler:
     - get_due() returns events ready to execute
     - After execution, the TRANSACTION LOG is the audit trail
     - No separate event status tracking needed
+
+    Pending events are indexed by key and by symbol. Scheduling an event
+    that is already pending is a no-op. cancel(), cancel_symbol() and
+    reschedule() drop index entries only; the stale heap entries are
+    skipped when popped and compacted away once they outnumber live ones.
+
+    Executed keys are remembered for deduplication up to max_executed;
+    beyond that the oldest are forgotten first.
+
+    Handlers must be pure over the LedgerView for the executor option to be
+    safe: every handler in a step() sees the same view either way.
     """
 
-    def __init__(self):
-        self._heap: List[Event] = []
+    def __init__(
+        self,
+        max_executed: Optional[int] = DEFAULT_MAX_EXECUTED,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Create an empty scheduler.
+
+        Args:
+            max_executed: Number of executed event keys kept for deduplication
+                          (None for unbounded)
+            executor: Optional concurrent.futures Executor used by step() to run
+                      handlers of independent same-(time, priority) events
+                      concurrently. The scheduler does not shut it down.
+        """
+        if max_executed is not None and max_executed <= 0:
+            raise ValueError(f"max_executed must be positive, got {max_executed}")
+        self.executor = executor
+        self._heap: List[_Entry] = []
         self._handlers: Dict[str, EventHandler] = {}
-        self._executed: set = set()  # Track executed event_ids for deduplication
+        # Executed event keys, oldest first (OrderedDict: O(1) eviction of the oldest)
+        self._executed: OrderedDict[int, None] = OrderedDict()
+        self.max_executed = max_executed
+        # Live pending entries: key -> heap entry, and symbol -> {key: event}
+        self._pending: Dict[int, _Entry] = {}
+        self._by_symbol: Dict[str, Dict[int, Event]] = {}
+        self._seq = 0
+        # Pending occurrence key -> (its recurrence, occurrence index)
+        self._recurrences: Dict[int, Tuple[RecurringEvent, int]] = {}
 
     def register(self, action: str, handler: EventHandler) -> None:
         """Register a handler function for an action type."""
@@ -101,32 +390,222 @@ class EventScheduler:
 
         Returns the event_id.
         """
-        heapq.heappush(self._heap, event)
+        if event.key not in self._pending:
+            self._add(event, self._seq)
+            self._seq += 1
         return event.event_id
 
+    def _add(self, event: Event, seq: int) -> None:
+        """Index and store a new pending event with the given tie-break seq."""
+        key = event.key
+        entry = (event.trigger_time, event.priority, event.symbol, seq, event)
+        self._pending[key] = entry
+        self._by_symbol.setdefault(event.symbol, {})[key] = event
+        self._push(entry)
+
+    def schedule_recurring(self, recurring: RecurringEvent) -> Optional[str]:
+        """
+        Schedule a recurring event lazily.
+
+        Only the first occurrence is stored; each later one is generated when
+        its predecessor is popped by get_due(). Every occurrence reuses the
+        recurrence's tie-break seq, so execution order is identical to
+        schedule_many(recurring.expand()) at the same point.
+
+        Cancelling a pending occurrence (or its symbol) ends the recurrence;
+        rescheduling one moves that occurrence only.
+
+        Returns:
+            event_id of the first occurrence, or None if the rule is empty
+        """
+        seq = self._seq
+        self._seq += 1
+        return self._add_occurrence(recurring, 0, seq)
+
+    def _add_occurrence(self, recurring: RecurringEvent, n: int, seq: int) -> Optional[str]:
+        """Schedule occurrence n (skipping ones already pending)."""
+        while (event := recurring.event_at(n)) is not None:
+            if event.key not in self._pending:
+                self._add(event, seq)
+                self._recurrences[event.key] = (recurring, n)
+                return event.event_id
+            n += 1
+        return None
+
     def schedule_many(self, events: List[Event]) -> List[str]:
-        """Add multiple events efficiently."""
+        """
+        Add multiple events efficiently.
+
+        New entries are bulk-loaded (heapify) rather than pushed one by one.
+        """
         ids = []
+        entries: List[_Entry] = []
+        pending = self._pending
+        by_symbol = self._by_symbol
         for event in events:
-            ids.append(self.schedule(event))
+            key = event.key
+            if key not in pending:
+                entry = (event.trigger_time, event.priority, event.symbol, self._seq, event)
+                self._seq += 1
+                pending[key] = entry
+                by_symbol.setdefault(event.symbol, {})[key] = event
+                entries.append(entry)
+            ids.append(event.event_id)
+        self._push_many(entries)
         return ids
 
+    def cancel(self, event: Union[Event, str]) -> bool:
+        """
+        Cancel a pending event.
+
+        Args:
+            event: The Event or its event_id
+
+        Returns:
+            True if the event was pending and is now cancelled
+        """
+        key = event.key if isinstance(event, Event) else event_key(event)
+        entry = self._pending.get(key)
+        if entry is None:
+            return False
+        self._release(entry[4])
+        self._recurrences.pop(key, None)
+        self._maybe_compact()
+        return True
+
+    def cancel_symbol(self, symbol: str) -> List[Event]:
+        """
+        Cancel every pending event for a symbol (e.g. a bond called early).
+
+        Returns:
+            The cancelled events, in execution order
+        """
+        symbol_events = self._by_symbol.pop(symbol, {})
+        for key in symbol_events:
+            del self._pending[key]
+            self._recurrences.pop(key, None)
+        self._maybe_compact()
+        return sorted(symbol_events.values(), key=lambda e: (e.trigger_time, e.priority))
+
+    def reschedule(self, event: Event, trigger_time: datetime) -> str:
+        """
+        Move a pending event to a new trigger time.
+
+        Returns:
+            The event_id of the rescheduled event
+
+        Raises:
+            KeyError: If the event is not pending
+        """
+        entry = self._pending.get(event.key)
+        if entry is None:
+            raise KeyError(f"Event not pending: {event.event_id}")
+        recurrence = self._recurrences.get(event.key)
+        self.cancel(event)
+        moved = replace(event, trigger_time=trigger_time)
+        if moved.key not in self._pending:
+            self._add(moved, entry[3])
+            if recurrence is not None:
+                self._recurrences[moved.key] = recurrence
+        return moved.event_id
+
+    def pending_for(self, symbol: str) -> List[Event]:
+        """Pending events for a symbol, in execution order."""
+        return sorted(self._by_symbol.get(symbol, {}).values(),
+                      key=lambda e: (e.trigger_time, e.priority))
+
+    def _is_live(self, entry: _Entry) -> bool:
+        """True if a heap entry has not been cancelled or superseded."""
+        return self._pending.get(entry[4].key) is entry
+
+    def _maybe_compact(self) -> None:
+        """Drop stale entries once they outnumber live ones."""
+        if self._stored_count() > 2 * len(self._pending) + 64:
+            self._rebuild(list(self._pending.values()))
+
+    # Storage primitives: a single binary heap of entries.
+    # CalendarEventScheduler overrides these; everything else is shared.
+
+    def _push(self, entry: _Entry) -> None:
+        heapq.heappush(self._heap, entry)
+
+    def _push_many(self, entries: List[_Entry]) -> None:
+        heap = self._heap
+        if len(entries) > len(heap):
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+
+    def _top(self) -> Optional[_Entry]:
+        """Earliest live entry (stale entries above it are discarded)."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _pop(self) -> _Entry:
+        """Remove and return the entry last returned by _top()."""
+        return heapq.heappop(self._heap)
+
+    def _stored_count(self) -> int:
+        """Stored entries, including stale ones."""
+        return len(self._heap)
+
+    def _rebuild(self, entries: List[_Entry]) -> None:
+        self._heap = entries
+        heapq.heapify(self._heap)
+
+    def _copy_storage_to(self, cloned: 'EventScheduler') -> None:
+        cloned._heap = list(self._heap)
+
+    def _release(self, event: Event) -> None:
+        """Remove a pending event from the indexes (its heap entry goes stale)."""
+        key = event.key
+        del self._pending[key]
+        symbol_events = self._by_symbol[event.symbol]
+        del symbol_events[key]
+        if not symbol_events:
+            del self._by_symbol[event.symbol]
+
     def get_due(self, as_of: datetime) -> List[Event]:
         """
         Get and remove events due for execution.
 
         Returns events with trigger_time <= as_of, in execution order.
-        Already-executed events are skipped.
+        Already-executed and cancelled events are skipped.
         """
         due = []
 
-        while self._heap and self._heap[0].trigger_time <= as_of:
-            event = heapq.heappop(self._heap)
-            if event.event_id not in self._executed:
+        while True:
+            entry = self._top()
+            if entry is None or entry[0] > as_of:
+                break
+            self._pop()
+            event = entry[4]
+            self._release(event)
+            recurrence = self._recurrences.pop(event.key, None)
+            if recurrence is not None:
+                recurring, n = recurrence
+                self._add_occurrence(recurring, n + 1, entry[3])
+            if event.key not in self._executed:
                 due.append(event)
 
         return due
 
+    def _mark_executed(self, event: Event) -> None:
+        """Remember an executed event key, evicting the oldest past max_executed."""
+        executed = self._executed
+        executed[event.key] = None
+        if self.max_executed is not None and len(executed) > self.max_executed:
+            executed.popitem(last=False)
+
+    def was_executed(self, event: Union[Event, str]) -> bool:
+        """True if the event (or event_id) is in the executed set."""
+        key = event.key if isinstance(event, Event) else event_key(event)
+        return key in self._executed
+
     def execute(
         self,
         event: Event,
@@ -151,9 +630,36 @@ class EventScheduler:
         # Execute handler - exceptions propagate (no silent swallowing)
         # This ensures failures are explicit and debuggable
         result = handler(event, view, prices)
-        self._executed.add(event.event_id)
+        self._mark_executed(event)
         return result
 
+    def _execute_batch(
+        self,
+        batch: List[Event],
+        view: LedgerView,
+        prices: Dict[str, Decimal],
+    ) -> List[Optional[PendingTransaction]]:
+        """
+        Run handlers for independent events concurrently on the executor.
+
+        Results are collected in batch order. Events are marked executed in
+        that order up to the first handler that raised, whose exception is
+        then re-raised, so the outcome matches running them sequentially.
+        """
+        futures = [
+            self.executor.submit(handler, event, view, prices)
+            if (handler := self._handlers.get(event.action)) else None
+            for event in batch
+        ]
+        results: List[Optional[PendingTransaction]] = []
+        for event, future in zip(batch, futures):
+            if future is None:
+                results.append(None)
+                continue
+            results.append(future.result())
+            self._mark_executed(event)
+        return results
+
     def step(
         self,
         as_of: datetime,
@@ -166,24 +672,253 @@ class EventScheduler:
         This is the main entry point for lifecycle processing.
         """
         transactions = []
-        for event in self.get_due(as_of):
-            tx = self.execute(event, view, prices)
+        due = self.get_due(as_of)
+
+        if self.executor is None:
+            results = [self.execute(event, view, prices) for event in due]
+        else:
+            results = []
+            for batch in self._independent_batches(due):
+                if len(batch) == 1:
+                    results.append(self.execute(batch[0], view, prices))
+                else:
+                    results.extend(self._execute_batch(batch, view, prices))
+
+        for tx in results:
             if tx is not None and not tx.is_empty():
                 transactions.append(tx)
         return transactions
 
+    @staticmethod
+    def _independent_batches(due: List[Event]) -> List[List[Event]]:
+        """
+        Split due events (in order) into runs that may execute concurrently.
+
+        A run shares (trigger_time, priority) and has no repeated symbol.
+        """
+        batches: List[List[Event]] = []
+        batch: List[Event] = []
+        symbols: set = set()
+        for event in due:
+            if batch and (
+                event.trigger_time != batch[0].trigger_time
+                or event.priority != batch[0].priority
+                or event.symbol in symbols
+            ):
+                batches.append(batch)
+                batch, symbols = [], set()
+            batch.append(event)
+            symbols.add(event.symbol)
+        if batch:
+            batches.append(batch)
+        return batches
+
     def pending_count(self) -> int:
         """Number of pending events."""
-        return len(self._heap)
+        return len(self._pending)
 
     def peek_next(self) -> Optional[Event]:
         """Peek at next scheduled event without removing it."""
-        return self._heap[0] if self._heap else None
+        entry = self._top()
+        return entry[4] if entry is not None else None
 
     def clear_executed(self) -> None:
         """Clear the executed event tracking (for testing/reset)."""
         self._executed.clear()
 
+    def copy(self) -> 'EventScheduler':
+        """
+        Create an independent copy of this scheduler.
+
+        Pending events and executed IDs are copied; handlers are shared
+        (they are plain functions). Used for engine checkpoints.
+        """
+        cloned = type(self)(max_executed=self.max_executed, executor=self.executor)
+        self._copy_storage_to(cloned)
+        cloned._handlers = dict(self._handlers)
+        cloned._executed = OrderedDict(self._executed)
+        cloned._pending = dict(self._pending)
+        cloned._by_symbol = {sym: dict(events) for sym, events in self._by_symbol.items()}
+        cloned._seq = self._seq
+        cloned._recurrences = dict(self._recurrences)
+        return cloned
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the executor (thread pools cannot be pickled)."""
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
+
+    def snapshot(self, ledger_sequence: int) -> SchedulerSnapshot:
+        """
+        Capture pending events, recurrences and executed keys.
+
+        Args:
+            ledger_sequence: Ledger.next_sequence of the ledger this scheduler
+                             drives; restore() checks it to catch mismatched pairs
+
+        Returns:
+            SchedulerSnapshot (pending events in execution order)
+        """
+        entries = sorted(self._pending.values(), key=lambda e: e[:4])
+        position = {entry[4].key: i for i, entry in enumerate(entries)}
+        return SchedulerSnapshot(
+            ledger_sequence=ledger_sequence,
+            seq=self._seq,
+            pending=tuple((entry[3], entry[4]) for entry in entries),
+            recurrences=tuple(
+                (position[key], n, recurring)
+                for key, (recurring, n) in self._recurrences.items()
+            ),
+            executed=tuple(self._executed),
+        )
+
+    def restore(self, snapshot: SchedulerSnapshot, ledger_sequence: Optional[int] = None) -> None:
+        """
+        Replace pending and executed state with a snapshot's.
+
+        Registered handlers and the storage backend are kept.
+
+        Args:
+            snapshot: Snapshot from snapshot() or SchedulerSnapshot.from_bytes()
+            ledger_sequence: If given, must equal the snapshot's ledger_sequence
+
+        Raises:
+            LedgerError: If ledger_sequence does not match the snapshot
+        """
+        if ledger_sequence is not None and ledger_sequence != snapshot.ledger_sequence:
+            raise LedgerError(
+                f"Scheduler snapshot is for ledger sequence {snapshot.ledger_sequence}, "
+                f"ledger is at {ledger_sequence}"
+            )
+        entries: List[_Entry] = []
+        self._pending = {}
+        self._by_symbol = {}
+        for seq, event in snapshot.pending:
+            entry = (event.trigger_time, event.priority, event.symbol, seq, event)
+            self._pending[event.key] = entry
+            self._by_symbol.setdefault(event.symbol, {})[event.key] = event
+            entries.append(entry)
+        self._rebuild(entries)
+        self._recurrences = {
+            snapshot.pending[pos][1].key: (recurring, n)
+            for pos, n, recurring in snapshot.recurrences
+        }
+        executed = snapshot.executed
+        if self.max_executed is not None:
+            executed = executed[-self.max_executed:]
+        self._executed = OrderedDict.fromkeys(executed)
+        self._seq = snapshot.seq
+
+
+class CalendarEventScheduler(EventScheduler):
+    """
+    EventScheduler backed by a calendar queue of per-day buckets.
+
+    Suited to loading full multi-year dividend, coupon and maturity
+    calendars for many instruments:
+    - Insertion appends to the event's day bucket: O(1) amortized
+    - Buckets are unordered until their day is reached, then heapified once
+    - Only the set of distinct days is kept in a heap (ints, cheap to compare)
+
+    Behaviour and event order are identical to EventScheduler.
+    """
+
+    def __init__(
+        self,
+        max_executed: Optional[int] = DEFAULT_MAX_EXECUTED,
+        executor: Optional[Executor] = None,
+    ):
+        super().__init__(max_executed=max_executed, executor=executor)
+        self._days: Dict[int, List[_Entry]] = {}   # day ordinal -> unordered entries
+        self._day_heap: List[int] = []             # ordinals present in _days
+        self._active: List[_Entry] = []            # heap of the earliest day's entries
+        self._active_day: Optional[int] = None
+        self._size = 0
+
+    def _deactivate(self) -> None:
+        """Return the active bucket to _days (an earlier day was inserted)."""
+        if self._active:
+            self._days[self._active_day] = self._active
+            heapq.heappush(self._day_heap, self._active_day)
+        self._active = []
+        self._active_day = None
+
+    def _push(self, entry: _Entry) -> None:
+        self._size += 1
+        day = entry[0].toordinal()
+        if day == self._active_day:
+            heapq.heappush(self._active, entry)
+            return
+        if self._active_day is not None and day < self._active_day:
+            self._deactivate()
+        bucket = self._days.get(day)
+        if bucket is None:
+            self._days[day] = [entry]
+            heapq.heappush(self._day_heap, day)
+        else:
+            bucket.append(entry)
+
+    def _push_many(self, entries: List[_Entry]) -> None:
+        self._size += len(entries)
+        days = self._days
+        new_days: List[int] = []
+        for entry in entries:
+            day = entry[0].toordinal()
+            if day == self._active_day:
+                heapq.heappush(self._active, entry)
+                continue
+            if self._active_day is not None and day < self._active_day:
+                self._deactivate()
+            bucket = days.get(day)
+            if bucket is None:
+                days[day] = [entry]
+                new_days.append(day)
+            else:
+                bucket.append(entry)
+        if new_days:
+            self._day_heap.extend(new_days)
+            heapq.heapify(self._day_heap)
+
+    def _top(self) -> Optional[_Entry]:
+        while True:
+            active = self._active
+            while active and not self._is_live(active[0]):
+                heapq.heappop(active)
+                self._size -= 1
+            if active:
+                return active[0]
+            if not self._day_heap:
+                self._active_day = None
+                return None
+            day = heapq.heappop(self._day_heap)
+            bucket = self._days.pop(day)
+            heapq.heapify(bucket)
+            self._active = bucket
+            self._active_day = day
+
+    def _pop(self) -> _Entry:
+        self._size -= 1
+        return heapq.heappop(self._active)
+
+    def _stored_count(self) -> int:
+        return self._size
+
+    def _rebuild(self, entries: List[_Entry]) -> None:
+        self._days = {}
+        self._day_heap = []
+        self._active = []
+        self._active_day = None
+        self._size = 0
+        self._push_many(entries)
+
+    def _copy_storage_to(self, cloned: 'EventScheduler') -> None:
+        cloned._days = {day: list(bucket) for day, bucket in self._days.items()}
+        cloned._day_heap = list(self._day_heap)
+        cloned._active = list(self._active)
+        cloned._active_day = self._active_day
+        cloned._size = self._size
+
 
 # ============================================================================
 # EVENT FACTORY FUNCTIONS
@@ -229,6 +964,31 @@ def coupon_event(
     )
 
 
+def recurring_coupon_event(
+    bond_symbol: str,
+    first_payment_date: datetime,
+    coupon_amount: Decimal,
+    currency: str,
+    months: int,
+    count: int,
+) -> RecurringEvent:
+    """
+    Create a recurring bond coupon event.
+
+    Occurrences are identical to coupon_event() at each payment date.
+    """
+    return RecurringEvent(
+        rule=RecurrenceRule(start=first_payment_date, months=months, count=count),
+        symbol=bond_symbol,
+        action="coupon",
+        priority=30,  # Payment phase
+        params=(
+            ("coupon_amount", str(coupon_amount)),
+            ("currency", currency),
+        ),
+    )
+
+
 def maturity_event(
     bond_symbol: str,
     maturity_date: datetime,
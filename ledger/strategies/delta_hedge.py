@@ -21,7 +21,7 @@ from __future__ import annotations
 from datetime import datetime
 from decimal import Decimal
 import math
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from ..core import (
     LedgerView, Move, PendingTransaction, Unit, UnitStateChange, UNIT_TYPE_DELTA_HEDGE_STRATEGY,
@@ -29,6 +29,9 @@ from ..core import (
 )
 from ..black_scholes import call_s as bs_call_delta, call as bs_call_price
 
+if TYPE_CHECKING:
+    from ..vol_surface import VolSurface, VolSurfaceCache
+
 
 def create_delta_hedge_unit(
     symbol: str,
@@ -155,11 +158,30 @@ def _compute_delta(spot: Decimal, strike: Decimal, t_in_days: float, volatility:
     return Decimal(str(delta_float))
 
 
+def _hedge_volatility(
+    state: Dict[str, Any],
+    strike: Decimal,
+    t_in_days: float,
+    vol_surface: Optional[VolSurface],
+) -> Decimal:
+    """
+    Volatility used to price and hedge the option.
+
+    Reads the surface at (strike, time to maturity) when one is given,
+    otherwise the flat volatility from the term sheet.
+    """
+    if vol_surface is not None and t_in_days > 0:
+        return Decimal(str(vol_surface.vol(float(strike), t_in_days)))
+    volatility = state['volatility']
+    return Decimal(str(volatility)) if not isinstance(volatility, Decimal) else volatility
+
+
 def compute_rebalance(
     view: LedgerView,
     strategy_symbol: str,
     spot_price: Decimal,
     min_trade_size: Decimal = Decimal("0.0001"),
+    vol_surface: Optional[VolSurface] = None,
 ) -> PendingTransaction:
     """
     Compute the rebalancing trades needed to maintain delta neutrality.
@@ -174,6 +196,8 @@ def compute_rebalance(
         strategy_symbol: Symbol of the delta hedge strategy unit
         spot_price: Current market price of the underlying asset
         min_trade_size: Minimum number of shares required to trigger a trade (default 0.0001)
+        vol_surface: Surface of the underlying; when given, delta uses its vol at
+                     (strike, time to maturity) instead of the unit's flat volatility
 
     Returns:
         PendingTransaction: Contains moves for buying/selling shares and corresponding cash
@@ -217,7 +241,7 @@ def compute_rebalance(
 
     # Ensure state values are Decimal for arithmetic
     strike = Decimal(str(state['strike'])) if not isinstance(state['strike'], Decimal) else state['strike']
-    volatility = Decimal(str(state['volatility'])) if not isinstance(state['volatility'], Decimal) else state['volatility']
+    volatility = _hedge_volatility(state, strike, t_in_days, vol_surface)
     num_options = Decimal(str(state['num_options'])) if not isinstance(state['num_options'], Decimal) else state['num_options']
     option_multiplier = Decimal(str(state['option_multiplier']))
 
@@ -348,6 +372,7 @@ def get_hedge_state(
     view: LedgerView,
     strategy_symbol: str,
     spot_price: Decimal,
+    vol_surface: Optional[VolSurface] = None,
 ) -> Dict[str, Any]:
     """
     Get comprehensive snapshot of the delta hedge strategy state.
@@ -359,6 +384,8 @@ def get_hedge_state(
         view: Read-only snapshot of the current ledger state
         strategy_symbol: Symbol of the delta hedge strategy unit
         spot_price: Current market price of the underlying asset
+        vol_surface: Surface of the underlying; when given, delta and option value
+                     use its vol at (strike, time to maturity)
 
     Returns:
         Dict[str, Any]: Dictionary containing:
@@ -399,11 +426,11 @@ def get_hedge_state(
 
     # Ensure state values are Decimal for arithmetic
     strike = Decimal(str(state['strike'])) if not isinstance(state['strike'], Decimal) else state['strike']
-    volatility = Decimal(str(state['volatility'])) if not isinstance(state['volatility'], Decimal) else state['volatility']
     num_options = Decimal(str(state['num_options'])) if not isinstance(state['num_options'], Decimal) else state['num_options']
     option_multiplier = Decimal(str(state['option_multiplier']))
 
     t_in_days = _time_to_maturity_days(state['maturity'], view.current_time)
+    volatility = _hedge_volatility(state, strike, t_in_days, vol_surface)
     delta = _compute_delta(spot_price, strike, t_in_days, volatility)
     target_shares = delta * num_options * option_multiplier
 
@@ -507,7 +534,10 @@ def compute_hedge_pnl_breakdown(
     }
 
 
-def delta_hedge_contract(min_trade_size: Decimal = Decimal("0.01")):
+def delta_hedge_contract(
+    min_trade_size: Decimal = Decimal("0.01"),
+    vol_surfaces: Optional[VolSurfaceCache] = None,
+):
     """
     Factory function that returns a smart contract for automated delta hedging.
 
@@ -517,6 +547,9 @@ def delta_hedge_contract(min_trade_size: Decimal = Decimal("0.01")):
 
     Args:
         min_trade_size: Minimum share quantity to trigger rebalancing trades (default 0.01)
+        vol_surfaces: Surfaces keyed by underlying; a hedge whose underlying has a
+                      surface rebalances on it, others use their flat volatility.
+                      Looked up on every call, so recalibrations apply immediately.
 
     Returns:
         Callable: A smart contract function with signature:
@@ -564,6 +597,7 @@ def delta_hedge_contract(min_trade_size: Decimal = Decimal("0.01")):
         if maturity and timestamp >= maturity:
             return compute_liquidation(view, symbol, spot_price)
 
-        return compute_rebalance(view, symbol, spot_price, min_trade_size)
+        vol_surface = vol_surfaces.surface(underlying) if vol_surfaces is not None else None
+        return compute_rebalance(view, symbol, spot_price, min_trade_size, vol_surface)
 
     return check_lifecycle
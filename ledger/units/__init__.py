@@ -27,6 +27,7 @@ from .option import (
     get_option_intrinsic_value,
     get_option_moneyness,
     option_contract,
+    option_wake_time,
     transact as option_transact,
 )
 
@@ -37,6 +38,7 @@ from .forward import (
     compute_early_termination,
     get_forward_value,
     forward_contract,
+    forward_wake_time,
     transact as forward_transact,
 )
 
@@ -46,6 +48,7 @@ from .deferred_cash import (
     compute_deferred_cash_settlement,
     transact as deferred_cash_transact,
     deferred_cash_contract,
+    deferred_cash_wake_time,
 )
 
 # Bond units
@@ -96,6 +99,7 @@ __all__ = [
     'get_option_intrinsic_value',
     'get_option_moneyness',
     'option_contract',
+    'option_wake_time',
     'option_transact',
     # Forwards
     'create_forward_unit',
@@ -103,12 +107,14 @@ __all__ = [
     'compute_early_termination',
     'get_forward_value',
     'forward_contract',
+    'forward_wake_time',
     'forward_transact',
     # DeferredCash
     'create_deferred_cash_unit',
     'compute_deferred_cash_settlement',
     'deferred_cash_transact',
     'deferred_cash_contract',
+    'deferred_cash_wake_time',
     # Bonds
     'Coupon',
     'create_bond_unit',
@@ -27,7 +27,7 @@ All functions take LedgerView (read-only) and return immutable results.
 
 from __future__ import annotations
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from decimal import Decimal
 
 import math
@@ -371,3 +371,20 @@ def deferred_cash_contract(
         return empty_pending_transaction(view)
 
     return compute_deferred_cash_settlement(view, symbol, timestamp)
+
+
+def deferred_cash_wake_time(view: LedgerView, symbol: str) -> Optional[datetime]:
+    """
+    Earliest time at which deferred_cash_contract can fire for this unit.
+
+    Args:
+        view: Read-only ledger access
+        symbol: DeferredCash symbol
+
+    Returns:
+        The payment date, or None if already settled or no payment date is set.
+    """
+    state = view.get_unit_state(symbol)
+    if state.get('settled', False):
+        return None
+    return state.get('payment_date')
@@ -8,7 +8,7 @@ All functions are pure: they take LedgerView (read-only) and return immutable re
 from __future__ import annotations
 import math
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
 from ..core import (
@@ -381,3 +381,20 @@ def forward_contract(
         return empty_pending_transaction(view)
 
     return compute_forward_settlement(view, symbol)
+
+
+def forward_wake_time(view: LedgerView, symbol: str) -> Optional[datetime]:
+    """
+    Earliest time at which forward_contract can fire for this forward.
+
+    Args:
+        view: Read-only view of the ledger state
+        symbol: Symbol of the forward contract unit
+
+    Returns:
+        The delivery date, or None if the forward is settled or has no delivery date.
+    """
+    state = view.get_unit_state(symbol)
+    if state.get('settled'):
+        return None
+    return state.get('delivery_date')
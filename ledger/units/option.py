@@ -10,7 +10,7 @@ from __future__ import annotations
 from datetime import datetime
 from decimal import Decimal
 import math
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from ..core import (
     LedgerView, Move, PendingTransaction, Unit, UnitStateChange,
@@ -453,3 +453,23 @@ def option_contract(
     settlement_price = Decimal(str(settlement_price)) if not isinstance(settlement_price, Decimal) else settlement_price
 
     return compute_option_settlement(view, symbol, settlement_price)
+
+
+def option_wake_time(view: LedgerView, symbol: str) -> Optional[datetime]:
+    """
+    Earliest time at which option_contract can fire for this option.
+
+    option_contract does nothing before maturity, whatever the prices, so the
+    LifecycleEngine can fast-forward over idle timestamps until then.
+
+    Args:
+        view: Read-only ledger view
+        symbol: Option symbol
+
+    Returns:
+        The option's maturity, or None if it is settled or has no maturity.
+    """
+    state = view.get_unit_state(symbol)
+    if state.get('settled'):
+        return None
+    return state.get('maturity')
@@ -24,7 +24,7 @@ Core equations from the QIS spec:
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Mapping, Optional, Callable, Any
 import math
 from decimal import Decimal
 
@@ -35,6 +35,7 @@ from ..core import (
     TransactionOrigin, OriginType,
     _freeze_state,
 )
+from ..price_snapshot import PriceSnapshot
 
 
 # ============================================================================
@@ -59,6 +60,13 @@ DAYS_PER_YEAR = Decimal('365')
 Strategy = Callable[[Decimal, Dict[str, Decimal], Dict[str, Any]], Dict[str, Decimal]]
 
 
+def _decimal_prices(prices: Mapping[str, Any]) -> Mapping[str, Decimal]:
+    """Prices as Decimals; a PriceSnapshot is already validated and passes through."""
+    if isinstance(prices, PriceSnapshot):
+        return prices
+    return {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+
+
 # ============================================================================
 # PURE FUNCTIONS - The math, nothing else
 # ============================================================================
@@ -87,7 +95,7 @@ def compute_nav(
     # Convert inputs to Decimal
     cash = Decimal(str(cash)) if not isinstance(cash, Decimal) else cash
     holdings = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in holdings.items()}
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
 
     risky_value = Decimal('0')
     for symbol, qty in holdings.items():
@@ -159,7 +167,7 @@ def compute_rebalance(
     current_cash = Decimal(str(current_cash)) if not isinstance(current_cash, Decimal) else current_cash
     current_holdings = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in current_holdings.items()}
     target_holdings = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in target_holdings.items()}
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
 
     # Compute NAV before
     nav_before = compute_nav(current_holdings, current_cash, prices)
@@ -353,7 +361,7 @@ def compute_qis_rebalance(
     No real moves occur - this is all within the hypothetical portfolio.
     """
     # Convert prices to Decimal
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
 
     state = view.get_unit_state(symbol)
 
@@ -414,7 +422,7 @@ def compute_qis_settlement(
     Negative payoff: investor pays dealer
     """
     # Convert prices to Decimal
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
 
     state = view.get_unit_state(symbol)
 
@@ -511,7 +519,7 @@ def qis_contract(
         prices: Dict[str, Decimal],
     ) -> PendingTransaction:
         # Convert prices to Decimal
-        prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+        prices = _decimal_prices(prices)
 
         state = view.get_unit_state(symbol)
 
@@ -566,7 +574,7 @@ def leveraged_strategy(underlying: str, leverage: Decimal) -> Strategy:
     def strategy_fn(nav: Decimal, prices: Dict[str, Decimal], state: Dict[str, Any]) -> Dict[str, Decimal]:
         # Convert inputs to Decimal
         nav = Decimal(str(nav)) if not isinstance(nav, Decimal) else nav
-        prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+        prices = _decimal_prices(prices)
 
         if underlying not in prices:
             raise ValueError(f"Missing price for underlying '{underlying}' in leveraged strategy")
@@ -604,7 +612,7 @@ def fixed_weight_strategy(weights: Dict[str, Decimal]) -> Strategy:
     def strategy_fn(nav: Decimal, prices: Dict[str, Decimal], state: Dict[str, Any]) -> Dict[str, Decimal]:
         # Convert inputs to Decimal
         nav = Decimal(str(nav)) if not isinstance(nav, Decimal) else nav
-        prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+        prices = _decimal_prices(prices)
 
         holdings = {}
         for symbol, weight in weights.items():
@@ -627,7 +635,7 @@ def fixed_weight_strategy(weights: Dict[str, Decimal]) -> Strategy:
 def get_qis_nav(view: LedgerView, symbol: str, prices: Dict[str, Decimal]) -> Decimal:
     """Get current NAV of a QIS given prices."""
     # Convert prices to Decimal
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
     state = view.get_unit_state(symbol)
     return compute_nav(state['holdings'], state['cash'], prices)
 
@@ -635,7 +643,7 @@ def get_qis_nav(view: LedgerView, symbol: str, prices: Dict[str, Decimal]) -> De
 def get_qis_return(view: LedgerView, symbol: str, prices: Dict[str, Decimal]) -> Decimal:
     """Get current total return of a QIS."""
     # Convert prices to Decimal
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
     state = view.get_unit_state(symbol)
     current_nav = compute_nav(state['holdings'], state['cash'], prices)
     initial_nav = state['initial_nav']
@@ -645,7 +653,7 @@ def get_qis_return(view: LedgerView, symbol: str, prices: Dict[str, Decimal]) ->
 def get_qis_leverage(view: LedgerView, symbol: str, prices: Dict[str, Decimal]) -> Decimal:
     """Get current leverage ratio of a QIS."""
     # Convert prices to Decimal
-    prices = {k: (Decimal(str(v)) if not isinstance(v, Decimal) else v) for k, v in prices.items()}
+    prices = _decimal_prices(prices)
     state = view.get_unit_state(symbol)
     holdings = state['holdings']
     cash = state['cash']
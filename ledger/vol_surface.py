@@ -0,0 +1,286 @@
+"""
+vol_surface.py - Cached implied volatility surfaces
+
+A VolSurface holds implied volatilities of one underlying on a grid of knot
+points in strike and expiry (in trading days, like black_scholes) and
+answers vectorized vol(k, t_in_days) lookups for whole books.
+
+Interpolation:
+- Strike: monotone piecewise cubic (PCHIP) of vol through each expiry's
+  knots, flat beyond the first and last strike. Unlike a natural cubic
+  spline it never overshoots: between two knots the vol stays within their
+  values, so a surface of positive knot vols has positive vols everywhere
+- Expiry: linear in total variance (vol^2 * t) between the bracketing
+  expiries, flat vol before the first and after the last expiry
+
+The cubic coefficients of every expiry are computed once, vectorized over
+expiries, when the surface is built; a lookup is then a searchsorted and a
+cubic per element.
+
+VolSurfaceCache keeps the current surface per underlying and rebuilds it only
+when a calibration's knots or vols differ from the ones it was built from,
+so repricing a book never rebuilds interpolation per option.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+Numeric = Union[float, np.ndarray]
+
+
+def _knots(values: Sequence[float], name: str) -> np.ndarray:
+    """Validated, strictly increasing, positive knot array (read-only)."""
+    knots = np.array(values, dtype=np.float64)
+    if knots.ndim != 1 or knots.size == 0:
+        raise ValueError(f"{name} must be a non-empty sequence")
+    if not np.all(np.isfinite(knots)) or np.any(knots <= 0):
+        raise ValueError(f"{name} must be positive and finite")
+    if np.any(np.diff(knots) <= 0):
+        raise ValueError(f"{name} must be strictly increasing")
+    knots.flags.writeable = False
+    return knots
+
+
+def _pchip_slopes(h: np.ndarray, slopes: np.ndarray) -> np.ndarray:
+    """
+    Fritsch-Carlson knot derivatives (as scipy's PchipInterpolator).
+
+    Zero at local extrema and where adjacent secant slopes change sign,
+    weighted harmonic mean of the secants elsewhere, so each segment stays
+    between its two knot values.
+    """
+    rows, segments = slopes.shape
+    d = np.empty((rows, segments + 1))
+    if segments == 1:
+        d[:] = slopes
+        return d
+
+    left, right = slopes[:, :-1], slopes[:, 1:]
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    same_sign = left * right > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        harmonic = (w1 + w2) / (w1 / left + w2 / right)
+    d[:, 1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    def end_slope(h0, h1, m0, m1):
+        # One-sided three-point estimate, clipped to preserve shape
+        slope = ((2.0 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        slope = np.where(np.sign(slope) != np.sign(m0), 0.0, slope)
+        clip = (np.sign(m0) != np.sign(m1)) & (np.abs(slope) > np.abs(3.0 * m0))
+        return np.where(clip, 3.0 * m0, slope)
+
+    d[:, 0] = end_slope(h[0], h[1], slopes[:, 0], slopes[:, 1])
+    d[:, -1] = end_slope(h[-1], h[-2], slopes[:, -1], slopes[:, -2])
+    return d
+
+
+def _pchip_coefficients(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Monotone (PCHIP) cubic coefficients of each row of y over knots x.
+
+    Returns an array of shape (rows, max(len(x) - 1, 1), 4) holding
+    (a, b, c, d) per segment: y = a + b*dx + c*dx^2 + d*dx^3 with dx the
+    distance from the segment's left knot.
+    """
+    rows, n = y.shape
+    if n == 1:
+        coefficients = np.zeros((rows, 1, 4))
+        coefficients[:, 0, 0] = y[:, 0]
+        return coefficients
+
+    h = np.diff(x)
+    slopes = np.diff(y, axis=1) / h
+    d = _pchip_slopes(h, slopes)
+
+    coefficients = np.empty((rows, n - 1, 4))
+    coefficients[:, :, 0] = y[:, :-1]
+    coefficients[:, :, 1] = d[:, :-1]
+    coefficients[:, :, 2] = (3.0 * slopes - 2.0 * d[:, :-1] - d[:, 1:]) / h
+    coefficients[:, :, 3] = (d[:, :-1] + d[:, 1:] - 2.0 * slopes) / h ** 2
+    return coefficients
+
+
+class VolSurface:
+    """
+    Implied volatility surface of one underlying.
+
+    Attributes:
+        underlying: Symbol of the underlying
+        strikes: Strike knots, strictly increasing (read-only float64 array)
+        expiries: Expiry knots in trading days, strictly increasing
+        vols: Knot vols, shape (len(expiries), len(strikes))
+    """
+
+    __slots__ = ('underlying', 'strikes', 'expiries', 'vols', '_coefficients')
+
+    def __init__(
+        self,
+        underlying: str,
+        strikes: Sequence[float],
+        expiries: Sequence[float],
+        vols: Sequence[Sequence[float]],
+    ):
+        """
+        Build a surface and precompute its interpolation coefficients.
+
+        Args:
+            underlying: Symbol of the underlying
+            strikes: Strike knots
+            expiries: Expiry knots in trading days
+            vols: vols[i][j] is the vol at expiries[i], strikes[j]
+
+        Raises:
+            ValueError: If knots are empty, not strictly increasing or not
+                        positive, or vols have the wrong shape or are not
+                        positive and finite
+        """
+        self.underlying = underlying
+        self.strikes = _knots(strikes, "strikes")
+        self.expiries = _knots(expiries, "expiries")
+        grid = np.array(vols, dtype=np.float64)
+        if grid.shape != (self.expiries.size, self.strikes.size):
+            raise ValueError(
+                f"vols must have shape {(self.expiries.size, self.strikes.size)}, got {grid.shape}"
+            )
+        if not np.all(np.isfinite(grid)) or np.any(grid <= 0):
+            raise ValueError("vols must be positive and finite")
+        grid.flags.writeable = False
+        self.vols = grid
+        self._coefficients = _pchip_coefficients(self.strikes, grid)
+
+    def same_inputs(self, strikes: Sequence[float], expiries: Sequence[float], vols: Sequence[Sequence[float]]) -> bool:
+        """True if the surface was built from exactly these knots and vols."""
+        return (np.array_equal(self.strikes, np.asarray(strikes, dtype=np.float64))
+                and np.array_equal(self.expiries, np.asarray(expiries, dtype=np.float64))
+                and np.array_equal(self.vols, np.asarray(vols, dtype=np.float64)))
+
+    def _smile(self, row: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Interpolated vol of expiry rows at strikes k (flat outside the knots)."""
+        strikes = self.strikes
+        k = np.clip(k, strikes[0], strikes[-1])
+        segment = np.clip(np.searchsorted(strikes, k, side='right') - 1, 0, self._coefficients.shape[1] - 1)
+        dx = k - strikes[segment]
+        a, b, c, d = np.moveaxis(self._coefficients[row, segment], -1, 0)
+        return a + dx * (b + dx * (c + dx * d))
+
+    def vol(self, k: Numeric, t_in_days: Numeric) -> Numeric:
+        """
+        Interpolated vol at strikes k and expiries t_in_days.
+
+        Args:
+            k: Strike(s) - scalar or array
+            t_in_days: Time(s) to expiry in trading days - scalar or array
+
+        Returns:
+            Vol with the broadcast shape of k and t_in_days (float for
+            scalar inputs)
+
+        Raises:
+            ValueError: If a strike or expiry is not positive and finite
+        """
+        k, t = np.broadcast_arrays(np.asarray(k, dtype=np.float64), np.asarray(t_in_days, dtype=np.float64))
+        if not np.all(np.isfinite(k)) or np.any(k <= 0):
+            raise ValueError("strike must be positive and finite")
+        if not np.all(np.isfinite(t)) or np.any(t <= 0):
+            raise ValueError("t_in_days must be positive and finite")
+
+        expiries = self.expiries
+        position = np.searchsorted(expiries, t, side='right') - 1
+        lower = np.clip(position, 0, expiries.size - 1)
+        upper = np.clip(position + 1, 0, expiries.size - 1)
+        vol_lower = self._smile(lower, k)
+        vol_upper = self._smile(upper, k)
+
+        # Linear in total variance between the bracketing expiries
+        t_lower, t_upper = expiries[lower], expiries[upper]
+        span = t_upper - t_lower
+        weight = np.divide(t - t_lower, span, out=np.zeros(t.shape), where=span > 0)
+        variance = (1.0 - weight) * vol_lower ** 2 * t_lower + weight * vol_upper ** 2 * t_upper
+        result = np.where(span > 0, np.sqrt(variance / t), vol_lower)
+        if result.ndim == 0:
+            return float(result)
+        return result
+
+    def __repr__(self):
+        return (f"VolSurface({self.underlying!r}, {self.strikes.size} strikes x "
+                f"{self.expiries.size} expiries)")
+
+
+class VolSurfaceCache:
+    """
+    Current volatility surface per underlying.
+
+    calibrate() rebuilds an underlying's surface only when its knots or vols
+    change; version(underlying) counts the rebuilds, so callers holding
+    values derived from a surface can tell when they are stale.
+    """
+
+    def __init__(self):
+        self._surfaces: Dict[str, VolSurface] = {}
+        self._versions: Dict[str, int] = {}
+
+    def calibrate(
+        self,
+        underlying: str,
+        strikes: Sequence[float],
+        expiries: Sequence[float],
+        vols: Sequence[Sequence[float]],
+    ) -> VolSurface:
+        """
+        Set an underlying's surface, reusing the cached one if inputs are unchanged.
+
+        Returns:
+            The underlying's current VolSurface
+
+        Raises:
+            ValueError: If the inputs do not form a valid surface
+        """
+        surface = self._surfaces.get(underlying)
+        if surface is not None and surface.same_inputs(strikes, expiries, vols):
+            return surface
+        surface = VolSurface(underlying, strikes, expiries, vols)
+        self._surfaces[underlying] = surface
+        self._versions[underlying] = self._versions.get(underlying, 0) + 1
+        return surface
+
+    def surface(self, underlying: str) -> Optional[VolSurface]:
+        """Current surface of an underlying, or None if never calibrated."""
+        return self._surfaces.get(underlying)
+
+    def vol(self, underlying: str, k: Numeric, t_in_days: Numeric) -> Numeric:
+        """
+        Vectorized lookup on an underlying's surface.
+
+        Raises:
+            ValueError: If the underlying has no surface
+        """
+        surface = self._surfaces.get(underlying)
+        if surface is None:
+            raise ValueError(f"No volatility surface for {underlying}")
+        return surface.vol(k, t_in_days)
+
+    def version(self, underlying: str) -> int:
+        """Number of times an underlying's surface has been (re)built."""
+        return self._versions.get(underlying, 0)
+
+    def remove(self, underlying: str) -> None:
+        """Drop an underlying's surface (its version keeps counting)."""
+        self._surfaces.pop(underlying, None)
+
+    @property
+    def underlyings(self) -> List[str]:
+        """Underlyings with a surface, sorted."""
+        return sorted(self._surfaces)
+
+    def __contains__(self, underlying: str) -> bool:
+        return underlying in self._surfaces
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __repr__(self):
+        return f"VolSurfaceCache({len(self._surfaces)} underlyings)"
@@ -0,0 +1,127 @@
+"""
+test_bitemporal_pricing.py - Unit tests for bitemporal_pricing.py
+
+Tests:
+- Writes: append-only restatements, t_obs <= t_known validation
+- Queries: best estimate, what-we-knew-at-T, current projection
+- Spec worked example (EUR/USD restated after the fact)
+"""
+
+import random
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from ledger import (
+    PricingSource,
+    BitemporalPricingSource,
+    KnownTimePricingView,
+)
+
+
+UTC = timezone.utc
+OBS = datetime(2026, 4, 27, 15, 30, tzinfo=UTC)
+RESTATED = datetime(2026, 4, 30, 9, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def eurusd():
+    pricer = BitemporalPricingSource()
+    original = pricer.record("EURUSD", Decimal("1.0852"), t_obs=OBS, t_known=OBS, source="reuters")
+    pricer.restate(original, Decimal("1.0853"), t_known=RESTATED)
+    return pricer
+
+
+class TestSpecExample:
+    """The worked example from the market data specification."""
+
+    def test_as_known_before_restatement(self, eurusd):
+        row = eurusd.known_at("EURUSD", OBS, datetime(2026, 4, 29, tzinfo=UTC))
+        assert row.value == Decimal("1.0852")
+        assert row.restates_ref is None
+
+    def test_best_estimate_after_restatement(self, eurusd):
+        row = eurusd.best_estimate("EURUSD", OBS, known_time=datetime(2026, 4, 30, 10, tzinfo=UTC))
+        assert row.value == Decimal("1.0853")
+        assert row.restates_ref == 0
+        assert row.source == "reuters"
+
+    def test_nothing_overwritten(self, eurusd):
+        assert [r.value for r in eurusd.versions("EURUSD", OBS)] == [Decimal("1.0852"), Decimal("1.0853")]
+        assert len(eurusd.rows) == 2
+
+
+class TestWrites:
+    """Tests for record() and restate()."""
+
+    def test_t_obs_after_t_known_rejected(self):
+        pricer = BitemporalPricingSource()
+        with pytest.raises(ValueError):
+            pricer.record("X", Decimal("1"), t_obs=OBS + timedelta(seconds=5), t_known=OBS)
+
+    def test_skew_within_tolerance_accepted(self):
+        pricer = BitemporalPricingSource()
+        pricer.record("X", Decimal("1"), t_obs=OBS + timedelta(milliseconds=500), t_known=OBS)
+        assert pricer.get_price("X", OBS + timedelta(seconds=1)) == Decimal("1")
+
+    def test_restates_ref_must_match_key(self):
+        pricer = BitemporalPricingSource()
+        row = pricer.record("X", Decimal("1"), t_obs=OBS, t_known=OBS)
+        with pytest.raises(ValueError):
+            pricer.record("X", Decimal("2"), t_obs=OBS + timedelta(hours=1),
+                          t_known=RESTATED, restates_ref=row)
+
+    def test_late_arriving_older_knowledge_does_not_win(self):
+        pricer = BitemporalPricingSource()
+        pricer.record("X", Decimal("2"), t_obs=OBS, t_known=RESTATED)
+        pricer.record("X", Decimal("1"), t_obs=OBS, t_known=OBS)
+        assert pricer.get_price("X", OBS) == Decimal("2")
+        assert pricer.best_estimate("X", OBS, known_time=OBS).value == Decimal("1")
+
+
+class TestQueries:
+    """Tests for the current projection and the as-known view."""
+
+    def test_as_known_view_is_pricing_source(self, eurusd):
+        view = eurusd.as_known(datetime(2026, 4, 29, tzinfo=UTC))
+        assert isinstance(view, KnownTimePricingView)
+        assert isinstance(view, PricingSource)
+        assert isinstance(eurusd, PricingSource)
+        assert view.get_prices({"EURUSD", "USD", "GBPUSD"}, RESTATED) == {
+            "EURUSD": Decimal("1.0852"), "USD": Decimal("1.0"),
+        }
+        assert eurusd.get_prices({"EURUSD"}, RESTATED) == {"EURUSD": Decimal("1.0853")}
+
+    def test_before_first_observation(self, eurusd):
+        assert eurusd.get_price("EURUSD", OBS - timedelta(seconds=1)) is None
+        assert eurusd.known_at("EURUSD", OBS, OBS - timedelta(seconds=5)) is None
+        assert eurusd.best_estimate("EURUSD", OBS + timedelta(hours=1)) is None
+
+    def test_late_arrival_skipped_until_known(self):
+        pricer = BitemporalPricingSource()
+        day = timedelta(days=1)
+        pricer.record("X", Decimal("1"), t_obs=OBS, t_known=OBS)
+        # Observation for OBS + 1 day only arrives two days later
+        pricer.record("X", Decimal("2"), t_obs=OBS + day, t_known=OBS + 3 * day)
+        assert pricer.as_known(OBS + 2 * day).get_price("X", OBS + day) == Decimal("1")
+        assert pricer.as_known(OBS + 3 * day).get_price("X", OBS + day) == Decimal("2")
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        pricer = BitemporalPricingSource()
+        rows = []
+        for _ in range(300):
+            t_obs = OBS + timedelta(minutes=rng.randrange(50))
+            t_known = t_obs + timedelta(minutes=rng.randrange(100))
+            value = Decimal(rng.randrange(1000)) / 100
+            pricer.record("X", value, t_obs=t_obs, t_known=t_known)
+            rows.append((t_obs, t_known, len(rows), value))
+
+        def brute(ts, known_time):
+            visible = [r for r in rows if r[0] <= ts and r[1] <= known_time]
+            return max(visible)[3] if visible else None
+
+        for _ in range(200):
+            ts = OBS + timedelta(minutes=rng.randrange(-5, 60))
+            known_time = OBS + timedelta(minutes=rng.randrange(-5, 160))
+            assert pricer.as_known(known_time).get_price("X", ts) == brute(ts, known_time)
+            assert pricer.get_price("X", ts) == brute(ts, OBS + timedelta(days=1))
@@ -410,3 +410,152 @@ class TestVectorizedOperations:
         assert isinstance(result, np.ndarray)
         assert result[0] < result[1] < result[2]
         assert result[1] == pytest.approx(0.5, abs=1e-10)
+
+
+class TestFusedGreeks:
+    """Tests for bs_greeks(), the single-pass price and Greeks kernel."""
+
+    def test_matches_individual_functions(self):
+        import ledger.black_scholes as bs
+        rng = np.random.default_rng(11)
+        s = rng.uniform(50, 150, 40)
+        k = rng.uniform(50, 150, 40)
+        t = rng.uniform(1, 500, 40)
+        v = rng.uniform(0.05, 1.0, 40)
+        result = bs.bs_greeks(s, k, t, v)
+        assert result.shape == (40,)
+        for name in bs.BS_GREEKS_FIELDS:
+            scalar_fn = getattr(bs, f"_{name}_float")
+            expected = [scalar_fn(*args) for args in zip(s, k, t, v)]
+            np.testing.assert_allclose(result[name], expected, rtol=1e-12, atol=1e-14, err_msg=name)
+
+    def test_scalar_inputs_give_0d_result(self):
+        from ledger.black_scholes import bs_greeks
+        result = bs_greeks(100, 100, 252, 0.2)
+        assert result.shape == ()
+        assert float(result['call']) == pytest.approx(float(call(Decimal("100"), Decimal("100"), Decimal("252"), Decimal("0.2"))), abs=1e-8)
+
+    def test_broadcasts_and_put_call_parity(self):
+        from ledger.black_scholes import bs_greeks
+        k = np.array([[80.0], [100.0], [120.0]])
+        result = bs_greeks(100.0, k, np.array([21.0, 63.0, 252.0]), 0.25)
+        assert result.shape == (3, 3)
+        np.testing.assert_allclose(result['call'] - result['put'], 100.0 - k * np.ones((1, 3)), atol=1e-10)
+        np.testing.assert_allclose(result['call_s'] - result['put_s'], 1.0, atol=1e-12)
+
+    def test_validates_once(self):
+        from ledger.black_scholes import bs_greeks
+        with pytest.raises(ValueError):
+            bs_greeks(np.array([100.0, -1.0]), 100, 252, 0.2)
+        with pytest.raises(ValueError):
+            bs_greeks(100, 100, 0, 0.2)
+
+
+class TestBatchDecimal:
+    """Tests for the batch Decimal entry points."""
+
+    @pytest.fixture
+    def book(self):
+        rng = np.random.default_rng(5)
+        n = 300
+        return (
+            [Decimal(str(round(x, 2))) for x in rng.uniform(50, 150, n)],
+            [Decimal(str(round(x, 2))) for x in rng.uniform(50, 150, n)],
+            [Decimal(int(x)) for x in rng.integers(1, 500, n)],
+            [Decimal(str(round(x, 3))) for x in rng.uniform(0.05, 1.0, n)],
+        )
+
+    def test_matches_scalar_functions_exactly(self, book):
+        import ledger.black_scholes as bs
+        for name in bs.BS_GREEKS_FIELDS:
+            expected = [getattr(bs, name)(*args) for args in zip(*book)]
+            assert bs.bs_batch(name, *book) == expected, name
+
+    def test_impvol_matches_scalar(self, book):
+        from ledger.black_scholes import bs_batch, call_impvol_batch, put_impvol_batch
+        s, k, t, v = book
+        calls = [max(p, Decimal("0.01")) for p in bs_batch('call', s, k, t, v)]
+        puts = [max(p, Decimal("0.01")) for p in bs_batch('put', s, k, t, v)]
+        assert call_impvol_batch(s, k, t, calls) == [call_impvol(*a) for a in zip(s, k, t, calls)]
+        assert put_impvol_batch(s, k, t, puts) == [put_impvol(*a) for a in zip(s, k, t, puts)]
+
+    def test_scalar_arguments_broadcast(self):
+        from ledger.black_scholes import bs_batch
+        strikes = [Decimal("90"), Decimal("100"), Decimal("110")]
+        result = bs_batch('put', Decimal("100"), strikes, Decimal("63"), Decimal("0.2"))
+        assert result == [put(Decimal("100"), k, Decimal("63"), Decimal("0.2")) for k in strikes]
+
+    def test_errors(self):
+        from ledger.black_scholes import bs_batch
+        with pytest.raises(ValueError):
+            bs_batch('rho', [Decimal("100")], [Decimal("100")], [Decimal("1")], [Decimal("0.2")])
+        with pytest.raises(ValueError):
+            bs_batch('call', [Decimal("100")] * 2, [Decimal("100")] * 3, Decimal("1"), Decimal("0.2"))
+        with pytest.raises(ValueError):
+            bs_batch('call', [Decimal("-1")], [Decimal("100")], Decimal("1"), Decimal("0.2"))
+        assert bs_batch('call', [], [], [], []) == []
+
+
+class TestImpliedVolSolver:
+    """Tests for the vectorized implied_vol() solver."""
+
+    @pytest.fixture
+    def surface(self):
+        rng = np.random.default_rng(11)
+        n = 5000
+        s = rng.uniform(50, 150, n)
+        k = s * rng.uniform(0.7, 1.4, n)
+        t = rng.uniform(20, 750, n)
+        v = rng.uniform(0.1, 1.5, n)
+        return s, k, t, v
+
+    @pytest.mark.parametrize("option", ['call', 'put'])
+    def test_recovers_vols_of_whole_surface(self, surface, option):
+        from ledger.black_scholes import implied_vol, _call_float, _put_float
+        s, k, t, v = surface
+        prices = (_call_float if option == 'call' else _put_float)(s, k, t, v)
+        result = implied_vol(s, k, t, prices, option)
+        assert result.vol.shape == s.shape
+        # Deep in-the-money prices carry too little time value to pin down v
+        intrinsic = np.maximum(s - k, 0) if option == 'call' else np.maximum(k - s, 0)
+        priced = prices - intrinsic > 1e-4 * s
+        assert priced.mean() > 0.95
+        assert result.converged[priced].all()
+        np.testing.assert_allclose(result.vol[priced], v[priced], rtol=0, atol=1e-10)
+        assert np.median(result.iterations) <= 5
+
+    def test_scalar_and_broadcast_inputs(self):
+        from ledger.black_scholes import implied_vol, _put_float
+        k = np.array([[80.0, 100.0], [120.0, 140.0]])
+        result = implied_vol(100.0, k, 126, _put_float(100.0, k, 126, 0.3), option='put')
+        assert result.vol.shape == (2, 2)
+        np.testing.assert_allclose(result.vol, 0.3, atol=1e-12)
+        scalar = implied_vol(100.0, 100.0, 126, _put_float(100.0, 100.0, 126, 0.3), option='put')
+        assert scalar.vol.shape == () and bool(scalar.converged)
+
+    def test_reports_prices_without_solution(self):
+        from ledger.black_scholes import implied_vol
+        # Below intrinsic, at intrinsic, above the spot, and a valid quote
+        result = implied_vol(100.0, 90.0, 252, np.array([5.0, 10.0, 101.0, 15.0]))
+        assert result.converged.tolist() == [False, False, False, True]
+        assert np.isnan(result.vol[:3]).all()
+        assert result.iterations[:3].tolist() == [0, 0, 0]
+
+    def test_invalid_inputs(self):
+        from ledger.black_scholes import implied_vol
+        with pytest.raises(ValueError):
+            implied_vol(100.0, 100.0, 252, 5.0, option='straddle')
+        with pytest.raises(ValueError):
+            implied_vol(100.0, 100.0, 0.0, 5.0)
+        with pytest.raises(ValueError):
+            implied_vol(100.0, 100.0, 252, np.nan)
+
+    def test_legacy_functions_keep_search_range(self):
+        from ledger.black_scholes import _call_impvol_float, IMPVOL_MIN, IMPVOL_MAX
+        assert _call_impvol_float(100, 100, 252, 0.0) == IMPVOL_MIN
+        assert _call_impvol_float(100, 100, 252, 99.99) == IMPVOL_MAX
+        s = np.array([90.0, 100.0, 110.0])
+        t = np.array([21.0, 252.0, 500.0])
+        from ledger.black_scholes import _call_float
+        vols = _call_impvol_float(s, 100.0, t, _call_float(s, 100.0, t, 0.35))
+        np.testing.assert_allclose(vols, 0.35, atol=1e-10)
@@ -10,8 +10,8 @@ import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
 from ledger import (
-    Ledger, Move, PendingTransaction,
-    TransactionOrigin, OriginType,
+    Ledger, Move, PendingTransaction, build_transaction, empty_pending_transaction,
+    TransactionOrigin, OriginType, LedgerError,
     LifecycleEngine, SmartContract,
     option_contract, forward_contract, delta_hedge_contract,
     create_option_unit,
@@ -19,6 +19,7 @@ from ledger import (
     create_delta_hedge_unit,
     create_stock_unit,
     cash,
+    PortfolioValuation, StaticPricingSource,
 )
 
 
@@ -198,6 +199,365 @@ class TestLifecycleEngineRun:
         assert ledger.get_balance("alice", "USD") == Decimal("10000") - 300
 
 
+class TestLifecycleEngineStreaming:
+    """Tests for LifecycleEngine.run_stream(), arun_stream() and checkpoints."""
+
+    TIMESTAMPS = [datetime(2025, 1, d) for d in range(1, 7)]
+
+    def _make_engine(self):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("alice", "USD", Decimal("10000"))
+        engine = LifecycleEngine(ledger)
+        engine.register('CASH', MockContract(
+            should_fire=True,
+            moves=[Move(Decimal("100.0"), "USD", "alice", "bob", "mock_tx")]
+        ))
+        return engine
+
+    def _feed(self):
+        return ((t, {}) for t in self.TIMESTAMPS)
+
+    def test_run_stream_yields_per_step(self):
+        engine = self._make_engine()
+        results = list(engine.run_stream(self._feed()))
+
+        assert [r.timestamp for r in results] == self.TIMESTAMPS
+        assert [r.step_index for r in results] == list(range(1, 7))
+        assert all(len(r.transactions) == 1 for r in results)
+        assert engine.ledger.get_balance("bob", "USD") == Decimal("600")
+
+    def test_arun_stream_matches_run_stream(self):
+        import asyncio
+
+        async def feed():
+            for t in self.TIMESTAMPS:
+                yield t, {}
+
+        async def collect(engine):
+            return [r async for r in engine.arun_stream(feed())]
+
+        engine = self._make_engine()
+        results = asyncio.run(collect(engine))
+        assert len(results) == 6
+        assert engine.ledger.get_balance("bob", "USD") == Decimal("600")
+
+    def test_checkpoint_every_n_steps(self):
+        engine = self._make_engine()
+        checkpoints = []
+        list(engine.run_stream(self._feed(), checkpoint_every=2,
+                               on_checkpoint=checkpoints.append))
+
+        assert [cp.step_index for cp in checkpoints] == [2, 4, 6]
+        assert checkpoints[0].timestamp == datetime(2025, 1, 2)
+        # Checkpoints are independent of the running ledger
+        assert checkpoints[0].ledger.get_balance("bob", "USD") == Decimal("200")
+
+    def test_resume_from_pickled_checkpoint(self):
+        import pickle
+
+        reference = self._make_engine()
+        list(reference.run_stream(self._feed()))
+
+        interrupted = self._make_engine()
+        saved = []
+        for result in interrupted.run_stream(
+            self._feed(), checkpoint_every=2,
+            on_checkpoint=lambda cp: saved.append(pickle.dumps(cp)),
+        ):
+            if result.step_index == 3:
+                break  # Simulated crash after step 3; last checkpoint is step 2
+
+        resumed = self._make_engine()
+        resumed.restore(pickle.loads(saved[-1]))
+        results = list(resumed.run_stream(self._feed()))
+
+        assert [r.timestamp for r in results] == self.TIMESTAMPS[2:]
+        assert results[0].step_index == 3
+        assert resumed.ledger.get_balance("bob", "USD") == \
+            reference.ledger.get_balance("bob", "USD")
+        assert len(resumed.ledger.transaction_log) == len(reference.ledger.transaction_log)
+
+    def test_restore_keeps_ledger_object(self):
+        engine = self._make_engine()
+        ledger = engine.ledger
+        source = StaticPricingSource({"USD": Decimal("1")})
+        valuation = PortfolioValuation(ledger, source)
+        checkpoints = []
+        list(engine.run_stream(self._feed(), checkpoint_every=2, on_checkpoint=checkpoints.append))
+
+        engine.restore(checkpoints[0])
+        assert engine.ledger is ledger
+        assert ledger.get_balance("bob", "USD") == Decimal("200")
+        assert valuation.nav("bob") == Decimal("200")
+        assert checkpoints[0].ledger is not ledger  # Checkpoint stays reusable
+
+    def test_checkpoint_every_requires_callback(self):
+        engine = self._make_engine()
+        with pytest.raises(ValueError):
+            list(engine.run_stream(self._feed(), checkpoint_every=2))
+        with pytest.raises(ValueError):
+            list(engine.run_stream(self._feed(), checkpoint_every=0,
+                                   on_checkpoint=lambda cp: None))
+
+
+class TestLifecycleEngineSchedulerSnapshot:
+    """Tests for scheduler snapshots tied to the ledger sequence."""
+
+    def test_warm_restart(self):
+        import pickle
+        from ledger import Event, SchedulerSnapshot
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("alice", "USD", Decimal("1000"))
+        engine = LifecycleEngine(ledger)
+        engine.scheduler.register("pay", lambda event, view, prices: build_transaction(view, [
+            Move(Decimal("10"), "USD", "alice", "bob", event.event_id)
+        ]))
+        engine.schedule_many([Event(datetime(2025, 1, d), symbol="USD", action="pay")
+                              for d in range(1, 6)])
+        engine.run([datetime(2025, 1, d) for d in (1, 2)], lambda t: {})
+
+        saved_ledger = pickle.dumps(engine.ledger)
+        saved_scheduler = engine.snapshot_scheduler().to_bytes()
+        assert engine.snapshot_scheduler().ledger_sequence == 2
+
+        restarted = LifecycleEngine(pickle.loads(saved_ledger))
+        restarted.scheduler.register("pay", engine.scheduler._handlers["pay"])
+        restarted.restore_scheduler(SchedulerSnapshot.from_bytes(saved_scheduler))
+        assert restarted.pending_event_count() == 3
+        restarted.run([datetime(2025, 1, d) for d in range(3, 6)], lambda t: {})
+        assert restarted.ledger.get_balance("bob", "USD") == Decimal("50")
+
+    def test_mismatched_ledger_rejected(self):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        engine = LifecycleEngine(ledger)
+        snapshot = engine.snapshot_scheduler()
+        ledger._next_sequence += 1
+        with pytest.raises(LedgerError):
+            engine.restore_scheduler(snapshot)
+
+
+class TestLifecycleEngineFastForward:
+    """Tests for fast-forwarding over idle timestamps."""
+
+    MINUTES = [datetime(2025, 6, 1, 9, 0) + timedelta(minutes=i) for i in range(120)]
+    MATURITY = datetime(2025, 6, 1, 10, 0)
+
+    def _make_engine(self, wake_time=True):
+        from ledger import option_wake_time
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.register_unit(create_option_unit(
+            symbol="AAPL_C150", name="AAPL Call 150", underlying="AAPL",
+            strike=Decimal("150.0"), maturity=self.MATURITY, option_type="call",
+            quantity=Decimal("100"), currency="USD",
+            long_wallet="alice", short_wallet="bob",
+        ))
+        ledger.set_balance("alice", "AAPL_C150", Decimal("5"))
+        ledger.set_balance("bob", "AAPL_C150", Decimal("-5"))
+        ledger.set_balance("alice", "USD", Decimal("100000"))
+        ledger.set_balance("bob", "AAPL", Decimal("1000"))
+        engine = LifecycleEngine(ledger)
+        engine.register("BILATERAL_OPTION", option_contract,
+                        wake_time=option_wake_time if wake_time else None)
+        return engine
+
+    def test_fast_forward_matches_full_run(self):
+        full = self._make_engine()
+        full.run(self.MINUTES, lambda t: {'AAPL': Decimal("170")})
+
+        fast = self._make_engine()
+        fast.run(self.MINUTES, lambda t: {'AAPL': Decimal("170")}, fast_forward=True)
+
+        assert fast.ledger.get_balance("alice", "AAPL") == full.ledger.get_balance("alice", "AAPL")
+        assert fast.ledger.get_balance("bob", "USD") == full.ledger.get_balance("bob", "USD")
+        assert fast.ledger.current_time == self.MINUTES[-1]
+        # Only the maturity step runs; the option is then retired
+        assert fast.step_count == 1
+        assert fast.skipped_steps == len(self.MINUTES) - 1
+
+    def test_prices_not_fetched_for_idle_steps(self):
+        engine = self._make_engine()
+        fetched = []
+
+        def price_fn(t):
+            fetched.append(t)
+            return {'AAPL': Decimal("170")}
+
+        engine.run(self.MINUTES, price_fn, fast_forward=True)
+        assert fetched == [self.MATURITY]
+
+    def test_scheduled_event_wakes_engine(self):
+        from ledger import Event
+        engine = self._make_engine()
+        engine.schedule(Event(datetime(2025, 6, 1, 9, 30), symbol="X", action="noop"))
+        assert engine.next_wake_time() == datetime(2025, 6, 1, 9, 30)
+
+        engine.run(self.MINUTES, lambda t: {'AAPL': Decimal("170")}, fast_forward=True)
+        assert engine.step_count == 2
+
+    def test_undeclared_contract_is_polled_every_step(self):
+        engine = self._make_engine(wake_time=False)
+        engine.run(self.MINUTES, lambda t: {'AAPL': Decimal("170")}, fast_forward=True)
+        # Polled until settlement at maturity, then retired and skipped
+        assert engine.step_count == 61
+        assert engine.skipped_steps == 59
+
+    def test_price_sensitive_contract_steps_on_price_change(self):
+        engine = self._make_engine()
+        mock = MockContract()
+        engine.register("STOCK", mock, wake_time=lambda view, symbol: None,
+                        price_sensitive=True)
+        feed = [(t, {'AAPL': Decimal("170") + (i // 30)}) for i, t in enumerate(self.MINUTES)]
+
+        results = list(engine.run_stream(iter(feed), fast_forward=True))
+        # Price changes at 0, 30, 60, 90 plus the maturity step (which is also minute 60)
+        assert [r.timestamp for r in results] == [self.MINUTES[i] for i in (0, 30, 60, 90)]
+        assert engine.skipped_steps == len(self.MINUTES) - 4
+        assert engine.ledger.current_time == self.MINUTES[-1]
+
+
+class TestLifecycleEngineCoalescing:
+    """Tests for coalescing settlements into grouped transactions."""
+
+    MATURITY = datetime(2025, 6, 1)
+    STRIKES = ("140", "150", "160")
+
+    def _make_engine(self, coalesce):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        for strike in self.STRIKES:
+            symbol = f"AAPL_C{strike}"
+            ledger.register_unit(create_option_unit(
+                symbol=symbol, name=f"AAPL Call {strike}", underlying="AAPL",
+                strike=Decimal(strike), maturity=self.MATURITY, option_type="call",
+                quantity=Decimal("100"), currency="USD",
+                long_wallet="alice", short_wallet="bob",
+            ))
+            ledger.set_balance("alice", symbol, Decimal("2"))
+            ledger.set_balance("bob", symbol, Decimal("-2"))
+        ledger.set_balance("alice", "USD", Decimal("1000000"))
+        ledger.set_balance("bob", "AAPL", Decimal("1000"))
+        engine = LifecycleEngine(ledger)
+        engine.register("BILATERAL_OPTION", option_contract, coalesce=coalesce)
+        return engine
+
+    def test_settlements_grouped_into_one_transaction(self):
+        engine = self._make_engine(coalesce=True)
+        txs = engine.step(self.MATURITY, {'AAPL': Decimal("170")})
+
+        assert len(txs) == 1
+        tx = txs[0]
+        assert tx.origin.origin_type == OriginType.LIFECYCLE
+        assert tx.origin.event_type == "BILATERAL_OPTION"
+        # Per-instrument audit detail is preserved
+        assert {sc.unit for sc in tx.state_changes} == {f"AAPL_C{k}" for k in self.STRIKES}
+        for strike in self.STRIKES:
+            assert engine.ledger.get_unit_state(f"AAPL_C{strike}")['settled'] is True
+
+    def test_balances_match_individual_settlement(self):
+        individual = self._make_engine(coalesce=False)
+        individual_txs = individual.step(self.MATURITY, {'AAPL': Decimal("170")})
+        grouped = self._make_engine(coalesce=True)
+        grouped.step(self.MATURITY, {'AAPL': Decimal("170")})
+
+        assert len(individual_txs) == len(self.STRIKES)
+        for wallet in ("alice", "bob"):
+            for unit in ("USD", "AAPL"):
+                assert grouped.ledger.get_balance(wallet, unit) == \
+                    individual.ledger.get_balance(wallet, unit)
+        assert set().union(*(tx.contract_ids for tx in individual_txs)) == \
+            grouped.ledger.transaction_log[-1].contract_ids
+
+    def test_batch_size_limits_group(self):
+        engine = self._make_engine(coalesce=True)
+        engine.coalesce_batch_size = 2
+        txs = engine.step(self.MATURITY, {'AAPL': Decimal("170")})
+        assert [len(tx.state_changes) for tx in txs] == [2, 1]
+
+    def test_rejected_group_falls_back_to_individual(self):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("bob", "AAPL", Decimal("100"))
+        for symbol in ("P1", "P2"):
+            ledger.register_unit(_stock(symbol, symbol, "treasury"))
+
+        def paying_contract(view, symbol, timestamp, prices):
+            if symbol == "AAPL":
+                return empty_pending_transaction(view)
+            return build_transaction(view, [
+                Move(Decimal("60"), "AAPL", "bob", "alice", symbol)
+            ])
+
+        engine = LifecycleEngine(ledger)
+        engine.register("STOCK", paying_contract, coalesce=True)
+        # Stock min balance is 0: bob can fund one 60-share payment but not two.
+        # P1 applies on retry, P2 is rejected exactly as without coalescing.
+        with pytest.raises(LedgerError, match="P2"):
+            engine.step(datetime(2025, 1, 1), {})
+        assert ledger.get_balance("bob", "AAPL") == Decimal("40")
+
+    @pytest.mark.parametrize("coalesce", [False, True])
+    def test_settlement_funded_by_later_one_is_rejected(self, coalesce):
+        # P1 pays bob's 60 AAPL to alice before P2 gives them to bob: the
+        # group nets to zero, but P1 fails when executed on its own
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("alice", "AAPL", Decimal("60"))
+        for symbol in ("P1", "P2"):
+            ledger.register_unit(_stock(symbol, symbol, "treasury"))
+
+        def contract(view, symbol, timestamp, prices):
+            if symbol == "P1":
+                return build_transaction(view, [Move(Decimal("60"), "AAPL", "bob", "alice", symbol)])
+            if symbol == "P2":
+                return build_transaction(view, [Move(Decimal("60"), "AAPL", "alice", "bob", symbol)])
+            return empty_pending_transaction(view)
+
+        engine = LifecycleEngine(ledger)
+        engine.register("STOCK", contract, coalesce=coalesce)
+        with pytest.raises(LedgerError, match="P1"):
+            engine.step(datetime(2025, 1, 1), {})
+        assert ledger.get_balance("alice", "AAPL") == Decimal("60")
+        assert ledger.get_balance("bob", "AAPL") == Decimal("0")
+
+    def test_coalesced_settlements_run_after_individual_ones(self):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("bob", "AAPL", Decimal("10"))
+        ledger.set_balance("bob", "USD", Decimal("10"))
+
+        def pay_once(view, symbol, timestamp, prices):
+            if view.get_balance("alice", symbol):
+                return empty_pending_transaction(view)
+            return build_transaction(view, [Move(Decimal("1"), symbol, "bob", "alice", symbol)])
+
+        engine = LifecycleEngine(ledger)
+        engine.register("STOCK", pay_once, coalesce=True)
+        engine.register(ledger.units["USD"].unit_type, pay_once)
+        # AAPL is polled first, but its coalesced settlement runs after USD's
+        txs = engine.step(datetime(2025, 1, 1), {})
+        assert [tx.contract_ids for tx in txs] == [frozenset({"USD"}), frozenset({"AAPL"})]
+
+
 class TestLifecycleEngineWithOptions:
     """Integration tests with OptionContract."""
 
@@ -491,3 +851,116 @@ class TestLifecycleEngineMultipleContracts:
         # Both should be settled
         assert ledger.get_unit_state("AAPL_C150").get('settled') is True
         assert ledger.get_unit_state("OIL_FWD").get('settled') is True
+
+
+class TestLifecycleEngineRetirement:
+    """Tests for retiring terminal units from contract polling."""
+
+    def _setup_option_ledger(self):
+        ledger = Ledger("test", datetime(2025, 5, 30), verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_unit(_stock("AAPL", "Apple Inc.", "treasury"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.register_wallet("treasury")
+        ledger.register_unit(create_option_unit(
+            symbol="AAPL_C150",
+            name="AAPL Call 150",
+            underlying="AAPL",
+            strike=Decimal("150.0"),
+            maturity=datetime(2025, 6, 1),
+            option_type="call",
+            quantity=Decimal("100"),
+            currency="USD",
+            long_wallet="alice",
+            short_wallet="bob"
+        ))
+        ledger.set_balance("alice", "AAPL_C150", Decimal("5"))
+        ledger.set_balance("bob", "AAPL_C150", Decimal("-5"))
+        ledger.set_balance("alice", "USD", Decimal("100000"))
+        ledger.set_balance("bob", "AAPL", Decimal("1000"))
+        return ledger
+
+    def test_settled_option_is_retired(self):
+        ledger = self._setup_option_ledger()
+        engine = LifecycleEngine(ledger)
+        engine.register("BILATERAL_OPTION", option_contract)
+
+        assert "AAPL_C150" in ledger.list_active_units()
+        engine.step(datetime(2025, 6, 1), {'AAPL': Decimal("170.0")})
+
+        assert ledger.is_retired("AAPL_C150")
+        assert "AAPL_C150" not in ledger.list_active_units()
+        assert ledger.list_retired_units() == ["AAPL_C150"]
+        # Retired units stay registered and queryable
+        assert ledger.get_unit_state("AAPL_C150")["settled"] is True
+        assert ledger.get_balance("alice", "AAPL_C150") == Decimal("0")
+
+    def test_retired_units_are_not_polled(self):
+        ledger = self._setup_option_ledger()
+        engine = LifecycleEngine(ledger)
+        engine.register("BILATERAL_OPTION", option_contract)
+        engine.step(datetime(2025, 6, 1), {'AAPL': Decimal("170.0")})
+
+        mock_contract = MockContract()
+        engine.register("BILATERAL_OPTION", mock_contract)
+        engine.step(datetime(2025, 6, 2), {'AAPL': Decimal("170.0")})
+        assert mock_contract.call_count == 0
+
+    def test_terminal_unit_with_open_positions_stays_active(self):
+        ledger = self._setup_option_ledger()
+        state = ledger.get_unit_state("AAPL_C150")
+        ledger.update_unit_state("AAPL_C150", {**state, "settled": True})
+
+        assert not ledger.is_retired("AAPL_C150")
+
+        ledger.set_balance("alice", "AAPL_C150", Decimal("0"))
+        ledger.set_balance("bob", "AAPL_C150", Decimal("0"))
+        assert ledger.is_retired("AAPL_C150")
+
+    def test_active_units_track_registration_and_retirement(self):
+        ledger = self._setup_option_ledger()
+        active = ledger.list_active_units()
+        assert "AAPL_C150" in active
+        active.remove("AAPL_C150")  # Callers get a copy of the cached list
+        assert "AAPL_C150" in ledger.list_active_units()
+
+        ledger.register_unit(cash("EUR", "Euro"))
+        assert "EUR" in ledger.list_active_units()
+
+        state = ledger.get_unit_state("AAPL_C150")
+        ledger.update_unit_state("AAPL_C150", {**state, "settled": True})
+        ledger.set_balance("alice", "AAPL_C150", Decimal("0"))
+        ledger.set_balance("bob", "AAPL_C150", Decimal("0"))
+        assert "AAPL_C150" not in ledger.list_active_units()
+
+        ledger.set_balance("alice", "AAPL_C150", Decimal("1"))
+        assert "AAPL_C150" in ledger.list_active_units()
+        assert ledger.list_active_units() == sorted(ledger.list_units())
+
+    def test_retirement_survives_replay_and_clone_at(self):
+        ledger = Ledger("test", datetime(2025, 1, 1), verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        option_unit = create_option_unit(
+            symbol="OPT", name="Option", underlying="AAPL",
+            strike=Decimal("150"), maturity=datetime(2025, 6, 1),
+            option_type="call", quantity=Decimal("100"), currency="USD",
+            long_wallet="alice", short_wallet="bob",
+        )
+        # Create the option inside the log so replay() restores its state
+        ledger.execute(build_transaction(ledger, [
+            Move(Decimal("1"), "OPT", "bob", "alice", "open"),
+        ], units_to_create=(option_unit,)))
+        assert not ledger.is_retired("OPT")
+
+        ledger.advance_time(datetime(2025, 6, 1))
+        engine = LifecycleEngine(ledger)
+        engine.register("BILATERAL_OPTION", option_contract)
+        engine.step(datetime(2025, 6, 1), {'AAPL': Decimal("100")})
+        assert ledger.is_retired("OPT")
+
+        assert ledger.replay().list_retired_units() == ["OPT"]
+        assert ledger.clone().list_retired_units() == ["OPT"]
+        assert ledger.clone_at(datetime(2025, 1, 1)).list_retired_units() == []
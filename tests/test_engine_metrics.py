@@ -0,0 +1,142 @@
+"""
+test_engine_metrics.py - Unit tests for LifecycleEngine instrumentation
+
+Tests:
+- LatencyHistogram: recording, bucketing, percentiles
+- EngineMetrics: counters, snapshots, export hook
+- LifecycleEngine integration: per-phase and per-unit-type recording
+"""
+
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from ledger import (
+    Ledger, Move, LifecycleEngine, EngineMetrics, LatencyHistogram,
+    build_transaction, empty_pending_transaction, cash,
+)
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_empty_histogram(self):
+        h = LatencyHistogram()
+        assert h.count == 0
+        assert h.percentile(50) == 0
+        assert h.snapshot()['mean_ns'] == 0
+
+    def test_record_tracks_summary(self):
+        h = LatencyHistogram()
+        for ns in (100, 200, 300):
+            h.record(ns)
+        assert h.count == 3
+        assert h.total_ns == 600
+        assert h.min_ns == 100
+        assert h.max_ns == 300
+
+    def test_percentile_within_factor_of_two(self):
+        h = LatencyHistogram()
+        for ns in range(1, 1001):
+            h.record(ns)
+        p50 = h.percentile(50)
+        assert 500 <= p50 < 1000
+        assert h.percentile(100) == 1000
+
+    def test_percentile_out_of_range_raises(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram().percentile(101)
+
+
+class TestEngineMetrics:
+    """Tests for EngineMetrics."""
+
+    def test_counters_and_histograms(self):
+        m = EngineMetrics()
+        m.incr('polls')
+        m.incr('polls', 2)
+        m.record('poll:STOCK', 50)
+        assert m.count('polls') == 3
+        assert m.count('missing') == 0
+        assert m.histogram('poll:STOCK').count == 1
+        assert m.poll_types() == ['STOCK']
+
+    def test_snapshot_is_json_serializable(self):
+        m = EngineMetrics()
+        m.record('step', 1000)
+        m.incr('steps')
+        snap = m.snapshot()
+        assert json.loads(json.dumps(snap)) == snap
+
+    def test_export_hook_every_n_steps(self):
+        exported = []
+        m = EngineMetrics(export_hook=exported.append, export_every=2)
+        for _ in range(5):
+            m.step_completed()
+        assert [s['counters']['steps'] for s in exported] == [2, 4]
+
+    def test_reset(self):
+        m = EngineMetrics()
+        m.record('step', 1)
+        m.incr('steps')
+        m.reset()
+        assert m.snapshot() == {'counters': {}, 'histograms': {}}
+
+    def test_invalid_export_every(self):
+        with pytest.raises(ValueError):
+            EngineMetrics(export_every=0)
+
+
+class TestEngineInstrumentation:
+    """Tests for metrics recorded by LifecycleEngine.step()."""
+
+    def _make_engine(self, metrics):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_unit(cash("EUR", "Euro"))
+        ledger.register_wallet("alice")
+        ledger.register_wallet("bob")
+        ledger.set_balance("alice", "USD", Decimal("1000"))
+
+        fired = set()
+
+        def paying_contract(view, symbol, timestamp, prices):
+            # Pays once on 2025-01-02; repeats the same intent afterwards
+            if symbol != "USD" or timestamp < datetime(2025, 1, 2):
+                return empty_pending_transaction(view)
+            if timestamp in fired:
+                return empty_pending_transaction(view)
+            fired.add(timestamp)
+            return build_transaction(view, [
+                Move(Decimal("10"), "USD", "alice", "bob", "pay")
+            ])
+
+        engine = LifecycleEngine(ledger, metrics=metrics)
+        engine.register("CASH", paying_contract)
+        return engine
+
+    def test_phases_recorded(self):
+        metrics = EngineMetrics()
+        engine = self._make_engine(metrics)
+        engine.run([datetime(2025, 1, d) for d in (1, 2, 3)], lambda t: {})
+
+        assert metrics.count('steps') == 3
+        for phase in ('step', 'advance_time', 'scheduled_events', 'pass', 'execute'):
+            assert metrics.histogram(phase).count > 0, phase
+        assert metrics.poll_types() == ['CASH']
+
+    def test_counters_recorded(self):
+        metrics = EngineMetrics()
+        engine = self._make_engine(metrics)
+        engine.run([datetime(2025, 1, d) for d in (1, 2, 3)], lambda t: {})
+
+        # Day 2 applies; day 3 rebuilds the identical intent -> ALREADY_APPLIED
+        assert metrics.count('applied') == 1
+        assert metrics.count('already_applied') == 1
+        assert metrics.count('rejections') == 0
+        assert metrics.count('empty_polls') == metrics.count('polls') - 2
+
+    def test_no_metrics_by_default(self):
+        engine = self._make_engine(None)
+        engine.step(datetime(2025, 1, 2), {})
+        assert engine.metrics is None
@@ -0,0 +1,194 @@
+"""
+test_fx_pricing.py - Unit tests for fx_pricing.py
+
+Tests:
+- FXRateGraph: direct, inverse and cross rates, path selection
+- Cache invalidation when a pair ticks or a new pair appears
+- Point-in-time rates from timestamped observations
+- MultiCurrencyPricingSource: conversion, multi-currency book valuation
+"""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from ledger import (
+    PricingSource,
+    StaticPricingSource,
+    FXRateGraph,
+    MultiCurrencyPricingSource,
+)
+
+
+T0 = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def fx():
+    return FXRateGraph({
+        ("EUR", "USD"): Decimal("1.08"),
+        ("USD", "JPY"): Decimal("150"),
+        ("GBP", "EUR"): Decimal("1.20"),
+    })
+
+
+class TestFXRateGraph:
+    """Tests for FXRateGraph rates."""
+
+    def test_direct_and_inverse(self, fx):
+        assert fx.rate("EUR", "USD") == Decimal("1.08")
+        assert fx.rate("USD", "EUR") == Decimal("1") / Decimal("1.08")
+        assert fx.rate("USD", "USD") == Decimal("1")
+
+    def test_cross_rate_multi_hop(self, fx):
+        assert fx.rate("GBP", "JPY") == Decimal("1.20") * Decimal("1.08") * Decimal("150")
+
+    def test_unreachable(self, fx):
+        fx.set_rate("CHF", "SEK", Decimal("11"))
+        assert fx.rate("CHF", "USD") is None
+        assert fx.rate("XXX", "USD") is None
+        with pytest.raises(ValueError):
+            fx.convert(Decimal("1"), "CHF", "USD")
+
+    @pytest.mark.parametrize("pair, rate", [(("USD", "USD"), Decimal("1")), (("EUR", "CHF"), Decimal("0"))])
+    def test_invalid_rates(self, fx, pair, rate):
+        with pytest.raises(ValueError):
+            fx.set_rate(*pair, rate)
+
+
+class TestIncrementalInvalidation:
+    """Tests for cross-rate caching."""
+
+    def test_tick_updates_dependent_cross_rates(self, fx):
+        assert fx.rate("GBP", "JPY") == Decimal("194.4000")
+        fx.set_rate("EUR", "USD", Decimal("1.10"))
+        assert fx.rate("GBP", "JPY") == Decimal("1.20") * Decimal("1.10") * Decimal("150")
+        assert fx.rate("EUR", "JPY") == Decimal("165.00")
+
+    def test_tick_keeps_unaffected_factors(self, fx):
+        fx.rate("GBP", "USD")
+        tree = fx._trees["USD"]
+        fx.set_rate("USD", "JPY", Decimal("151"))   # Not on the GBP->USD path
+        assert "GBP" in tree.factors and "EUR" in tree.factors
+        fx.set_rate("GBP", "EUR", Decimal("1.25"))  # Only GBP depends on it
+        assert "GBP" not in tree.factors and "EUR" in tree.factors
+        assert fx.rate("GBP", "USD") == Decimal("1.25") * Decimal("1.08")
+
+    def test_new_pair_can_shorten_path(self, fx):
+        assert fx.rate("GBP", "USD") == Decimal("1.20") * Decimal("1.08")
+        fx.set_rate("GBP", "USD", Decimal("1.27"))
+        assert fx.rate("GBP", "USD") == Decimal("1.27")
+
+    def test_matches_uncached_graph(self, fx):
+        fx.rate("GBP", "JPY")
+        fx.rate("JPY", "GBP")
+        ticks = [("EUR", "USD", "1.09"), ("USD", "JPY", "149"), ("GBP", "EUR", "1.19"),
+                 ("EUR", "USD", "1.07")]
+        fresh_rates = {("EUR", "USD"): Decimal("1.08"), ("USD", "JPY"): Decimal("150"),
+                       ("GBP", "EUR"): Decimal("1.20")}
+        for base, quote, rate in ticks:
+            fx.set_rate(base, quote, Decimal(rate))
+            fresh_rates[(base, quote)] = Decimal(rate)
+            fresh = FXRateGraph(fresh_rates)
+            for a in ("EUR", "USD", "JPY", "GBP"):
+                for b in ("EUR", "USD", "JPY", "GBP"):
+                    assert fx.rate(a, b) == fresh.rate(a, b)
+
+
+class TestPointInTime:
+    """Tests for timestamped FX observations."""
+
+    T1, T2, T3 = datetime(2025, 1, 2), datetime(2025, 1, 3), datetime(2025, 1, 4)
+
+    @pytest.fixture
+    def timed(self):
+        fx = FXRateGraph({("USD", "JPY"): Decimal("150")})  # Static pair
+        fx.set_rate("EUR", "USD", Decimal("1.08"), self.T1)
+        fx.set_rate("EUR", "USD", Decimal("1.10"), self.T3)
+        return fx
+
+    def test_rate_as_of_time(self, timed):
+        assert timed.rate("EUR", "USD") == Decimal("1.10")
+        assert timed.rate("EUR", "USD", self.T3) == Decimal("1.10")
+        assert timed.rate("EUR", "USD", self.T2) == Decimal("1.08")
+        assert timed.rate("USD", "EUR", self.T2) == Decimal("1") / Decimal("1.08")
+        assert timed.rate("EUR", "JPY", self.T2) == Decimal("1.08") * Decimal("150")
+        assert timed.rate("USD", "JPY", T0) == Decimal("150")
+
+    def test_unobserved_pair_is_absent(self, timed):
+        assert timed.rate("EUR", "USD", T0) is None
+        with pytest.raises(ValueError):
+            timed.convert(Decimal("1"), "EUR", "JPY", T0)
+
+    def test_late_observation_corrects_history_only(self, timed):
+        timed.set_rate("USD", "EUR", Decimal("0.9"), self.T2)
+        assert timed.rate("EUR", "USD", self.T2) == Decimal("1") / Decimal("0.9")
+        assert timed.rate("EUR", "USD") == Decimal("1.10")
+        timed.set_rate("EUR", "USD", Decimal("1.11"), self.T3)  # Same time: replaces
+        assert timed.rate("EUR", "USD") == Decimal("1.11")
+
+    def test_static_rate_replaces_history(self, timed):
+        timed.set_rate("EUR", "USD", Decimal("1.05"))
+        assert timed.rate("EUR", "USD", T0) == Decimal("1.05")
+
+    def test_pricer_converts_at_query_time(self, timed):
+        local = StaticPricingSource({"SAP": Decimal("180")})
+        pricer = MultiCurrencyPricingSource(local, {"SAP": "EUR"}, timed)
+        assert pricer.get_price("SAP", self.T2) == Decimal("180") * Decimal("1.08")
+        assert pricer.get_price("SAP", self.T3) == Decimal("180") * Decimal("1.10")
+        assert pricer.get_price("SAP", T0) is None
+        assert pricer.get_prices({"SAP"}, self.T2) == {"SAP": Decimal("180") * Decimal("1.08")}
+        assert pricer.value({"SAP": Decimal("2")}, self.T2, ["USD"]) == {"USD": Decimal("360") * Decimal("1.08")}
+
+
+class TestMultiCurrencyPricingSource:
+    """Tests for MultiCurrencyPricingSource."""
+
+    @pytest.fixture
+    def pricer(self, fx):
+        local = StaticPricingSource({
+            "AAPL": Decimal("200"),
+            "SAP": Decimal("180"),
+            "TOYOTA": Decimal("2800"),
+        })
+        return MultiCurrencyPricingSource(local, {"SAP": "EUR", "TOYOTA": "JPY"}, fx)
+
+    def test_is_pricing_source(self, pricer):
+        assert isinstance(pricer, PricingSource)
+
+    def test_get_price_converts_to_base(self, pricer):
+        assert pricer.get_price("AAPL", T0) == Decimal("200")
+        assert pricer.get_price("SAP", T0) == Decimal("180") * Decimal("1.08")
+        assert pricer.get_price("EUR", T0) == Decimal("1.08")
+        assert pricer.get_price("USD", T0) == Decimal("1.0")
+        assert pricer.get_price("MISSING", T0) is None
+
+    def test_get_prices_in(self, pricer):
+        prices = pricer.get_prices_in({"AAPL", "SAP", "TOYOTA", "EUR"}, T0, "EUR")
+        assert prices["SAP"] == Decimal("180")
+        assert prices["EUR"] == Decimal("1.0")
+        assert prices["AAPL"] == Decimal("200") / Decimal("1.08")
+        assert prices["TOYOTA"] == pricer.get_price_in("TOYOTA", T0, "EUR")
+
+    def test_value_in_several_currencies(self, pricer):
+        positions = {"AAPL": Decimal("10"), "SAP": Decimal("5"), "TOYOTA": Decimal("100"),
+                     "EUR": Decimal("1000")}
+        totals = pricer.value(positions, T0, ["USD", "EUR", "JPY"])
+        for ccy, total in totals.items():
+            expected = sum(qty * pricer.get_price_in(unit, T0, ccy) for unit, qty in positions.items())
+            assert abs(total - expected) < Decimal("1e-18")
+
+    def test_currency_with_local_price_uses_local_base(self, fx):
+        local = StaticPricingSource({"EUR": Decimal("1.07"), "AAPL": Decimal("100")})
+        pricer = MultiCurrencyPricingSource(local, {}, fx)
+        assert pricer.quote_currency("EUR", T0) == "USD"
+        assert pricer.quote_currency("GBP", T0) == "GBP"
+        assert pricer.get_price("EUR", T0) == Decimal("1.07")
+        assert pricer.get_price_in("EUR", T0, "JPY") == Decimal("1.07") * Decimal("150")
+        assert pricer.get_prices_in({"EUR", "GBP"}, T0, "USD") == {
+            "EUR": Decimal("1.07"), "GBP": Decimal("1.20") * Decimal("1.08"),
+        }
+        assert pricer.value({"EUR": Decimal("10")}, T0, ["USD"]) == {"USD": Decimal("10.70")}
+
+    def test_value_missing_price_raises(self, pricer):
+        with pytest.raises(ValueError):
+            pricer.value({"MISSING": Decimal("1")}, T0, ["USD"])
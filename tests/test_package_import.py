@@ -0,0 +1,73 @@
+"""
+test_package_import.py - Import-time tests for the ledger package
+
+Tests:
+- `import ledger` loads the core only (no NumPy/SciPy, no unit modules)
+- Lazy names resolve to the same objects as their defining modules
+- Import-time benchmark against the eager import of every module
+"""
+
+import subprocess
+import sys
+import pytest
+
+import ledger
+
+
+HEAVY_MODULES = ('numpy', 'scipy', 'ledger.black_scholes', 'ledger.units', 'ledger.lifecycle_engine')
+
+
+def _run(code):
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def _best_import_time(code, runs=5):
+    """Best-of-n wall time (seconds) of code in fresh interpreters."""
+    timer = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+    return min(float(_run(timer)) for _ in range(runs))
+
+
+class TestLazyImport:
+    """Tests for lazy resolution of public names."""
+
+    def test_core_import_loads_no_heavy_modules(self):
+        loaded = _run(
+            "import sys; from ledger import Ledger, Move, cash, build_transaction, SYSTEM_WALLET; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert loaded == ""
+
+    def test_lazy_name_loads_its_module(self):
+        loaded = _run("import sys; from ledger import call; print('ledger.black_scholes' in sys.modules)")
+        assert loaded == "True"
+
+    def test_every_public_name_resolves(self):
+        from ledger.units import option
+        from ledger import black_scholes
+        for name in ledger.__all__:
+            assert getattr(ledger, name) is not None
+        assert ledger.option_transact is option.transact
+        assert ledger.implied_vol is black_scholes.implied_vol
+        assert set(ledger.__all__) <= set(dir(ledger))
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from ledger import *", namespace)
+        assert "compute_qis_nav" in namespace and "Ledger" in namespace
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError):
+            ledger.no_such_name
+        with pytest.raises(ImportError):
+            exec("from ledger import no_such_name", {})
+
+
+class TestImportBenchmark:
+    """Guards `import ledger` startup time."""
+
+    def test_core_import_much_faster_than_full_import(self):
+        core = _best_import_time("from ledger import Ledger, Move, cash")
+        full = _best_import_time("import ledger; from ledger import *")
+        assert core < 0.5 * full, f"core import {core:.3f}s vs full import {full:.3f}s"
@@ -0,0 +1,309 @@
+"""
+test_pnl_attribution.py - Unit tests for pnl_attribution.py
+
+Tests:
+- LifecycleEngine step listeners
+- Classification: price, trading, lifecycle, fees, transfers
+- Components reconcile to the change in NAV over random trades and ticks
+- PnLStore queries per wallet and date range
+"""
+
+import random
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from ledger import (
+    Ledger, Move, SYSTEM_WALLET, LifecycleEngine, PriceSnapshot,
+    PNL_COMPONENTS, PnLStore, PnLAttribution,
+    Dividend, build_transaction, cash, create_stock_unit,
+    stock_contract, deferred_cash_contract,
+)
+
+
+T0 = datetime(2025, 1, 2)
+STOCKS = ["AAPL", "MSFT"]
+
+
+def _book():
+    ledger = Ledger("test", initial_time=T0, verbose=False, test_mode=True)
+    ledger.register_unit(cash("USD", "US Dollar"))
+    for symbol in STOCKS:
+        ledger.register_unit(create_stock_unit(symbol, symbol, "issuer", "USD"))
+    for wallet in ("alice", "bob", "broker"):
+        ledger.register_wallet(wallet)
+    ledger.set_balance("alice", "USD", Decimal("10000"))
+    ledger.set_balance("bob", "USD", Decimal("10000"))
+    ledger.set_balance("bob", "AAPL", Decimal("50"))
+    return ledger
+
+
+def _prices(aapl, msft="400"):
+    return {"USD": Decimal("1"), "AAPL": Decimal(aapl), "MSFT": Decimal(msft)}
+
+
+def _buy(ledger, buyer, seller, unit, quantity, price, fee=None):
+    quantity, price = Decimal(quantity), Decimal(price)
+    moves = [
+        Move(quantity, unit, seller, buyer, f"trade_{unit}"),
+        Move(quantity * price, "USD", buyer, seller, f"trade_{unit}"),
+    ]
+    if fee is not None:
+        moves.append(Move(Decimal(fee), "USD", buyer, "broker", f"trade_{unit}_fee"))
+    ledger.execute(build_transaction(ledger, moves))
+
+
+def _nav(ledger, wallet, prices):
+    return sum((quantity * prices[unit] for unit, quantity in ledger.get_wallet_balances(wallet).items()
+                if unit in prices), Decimal("0"))
+
+
+class TestStepListeners:
+    """Tests for LifecycleEngine.add_step_listener."""
+
+    def test_listener_receives_snapshot_and_transactions(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        calls = []
+        engine.add_step_listener(lambda *args: calls.append(args))
+        executed = engine.step(T0 + timedelta(days=1), _prices("200"))
+        assert len(calls) == 1
+        timestamp, prices, transactions = calls[0]
+        assert timestamp == T0 + timedelta(days=1)
+        assert isinstance(prices, PriceSnapshot)
+        assert prices["AAPL"] == Decimal("200")
+        assert transactions is executed
+
+    @pytest.mark.parametrize("fast_forward", [False, True])
+    def test_fast_forward_does_not_skip_price_changes(self, fast_forward):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        days = [T0 + timedelta(days=d) for d in range(1, 6)]
+        engine.run(days, lambda ts: _prices(str(100 + 10 * (ts - days[0]).days)), fast_forward=fast_forward)
+
+        assert attribution.cumulative("bob")["price"] == Decimal("2000")
+        assert len(attribution.store.query("bob")["price"]) == 4
+        assert engine.skipped_steps == 0
+
+    def test_unchained_snapshots_are_diffed_in_full(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), PriceSnapshot(_prices("200")))
+        engine.step(T0 + timedelta(days=2), PriceSnapshot(_prices("210")))
+        assert attribution.cumulative("bob")["price"] == Decimal("500")
+
+    def test_snapshot_from_another_chain_is_diffed_in_full(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        feed = PriceSnapshot(_prices("120"))
+        engine.step(T0 + timedelta(days=1), _prices("100"))  # Engine chain, version 0
+        # Feed chain, version 1: AAPL is not in changed, yet moved since the last step
+        engine.step(T0 + timedelta(days=2), feed.updated({"MSFT": Decimal("401")}))
+        assert attribution.cumulative("bob")["price"] == Decimal("1000")
+
+    def test_fast_forward_skips_unchanged_prices(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        calls = []
+        engine.add_step_listener(lambda *args: calls.append(args))
+        days = [T0 + timedelta(days=d) for d in range(1, 6)]
+        engine.run(days, lambda ts: _prices("200"), fast_forward=True)
+        assert len(calls) == 1
+        assert engine.skipped_steps == 4
+
+
+class TestRestore:
+    """Attribution follows LifecycleEngine.restore()."""
+
+    def test_attributes_after_restore(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("100"))
+        checkpoint = engine.checkpoint()
+        _buy(ledger, "alice", "bob", "AAPL", 5, 100)
+        engine.step(T0 + timedelta(days=2), _prices("105"))
+        engine.step(T0 + timedelta(days=3), _prices("110"))
+
+        engine.restore(checkpoint)
+        assert attribution.ledger is engine.ledger
+        assert len(attribution.store) == 0  # Rows after the checkpoint are undone
+        assert attribution.cumulative("alice") == dict.fromkeys(PNL_COMPONENTS, Decimal("0"))
+
+        _buy(engine.ledger, "alice", "bob", "AAPL", 10, 100)
+        engine.step(T0 + timedelta(days=2), _prices("110"))
+        alice = attribution.cumulative("alice")
+        assert alice["trading"] == Decimal("100")   # 10 * 110 - 1000
+        assert alice["price"] == Decimal("0")       # Held nothing at the start of the step
+        assert attribution.cumulative("bob")["price"] == Decimal("0")  # Marked from the last price, 110
+        assert attribution.store.wallets == ["alice", "bob"]
+
+
+class TestClassification:
+    """Tests for the split into components."""
+
+    def test_first_prices_set_baseline(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("200"))
+        assert len(attribution.store) == 0
+
+    def test_initial_prices(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger, initial_prices=_prices("190")).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("200"))
+        assert attribution.cumulative("bob")["price"] == Decimal("500")
+
+    def test_price_and_trading(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("200"))
+
+        # Alice buys 10 AAPL at 205, the step marks them at 210
+        _buy(ledger, "alice", "bob", "AAPL", 10, 205)
+        engine.step(T0 + timedelta(days=2), _prices("210"))
+
+        alice = attribution.cumulative("alice")
+        bob = attribution.cumulative("bob")
+        assert alice["trading"] == Decimal("50")     # 10 * 210 - 2050
+        assert alice["price"] == Decimal("0")        # Held nothing at the start of the step
+        assert bob["trading"] == Decimal("-50")
+        assert bob["price"] == Decimal("500")        # 50 AAPL held at the start, +10
+        assert alice["lifecycle"] == alice["fees"] == alice["transfers"] == Decimal("0")
+
+    def test_fees(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("200"))
+        _buy(ledger, "alice", "bob", "AAPL", 10, 200, fee="7.5")
+        engine.step(T0 + timedelta(days=2), _prices("200"))
+
+        assert attribution.cumulative("alice")["fees"] == Decimal("-7.5")
+        assert attribution.cumulative("alice")["trading"] == Decimal("0")
+        assert attribution.cumulative("broker")["fees"] == Decimal("7.5")
+
+    def test_transfers(self):
+        ledger = _book()
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+        engine.step(T0 + timedelta(days=1), _prices("200"))
+        ledger.execute(build_transaction(ledger, [
+            Move(Decimal("1000"), "USD", SYSTEM_WALLET, "alice", "deposit_alice"),
+            Move(Decimal("5"), "AAPL", "bob", "alice", "gift"),
+        ]))
+        engine.step(T0 + timedelta(days=2), _prices("200"))
+
+        assert attribution.cumulative("alice")["transfers"] == Decimal("2000")
+        assert attribution.cumulative("bob")["transfers"] == Decimal("-1000")
+        assert attribution.cumulative("alice")["trading"] == Decimal("0")
+        assert SYSTEM_WALLET not in attribution.store.wallets
+
+    def test_lifecycle_dividend(self):
+        ledger = Ledger("test", datetime(2024, 1, 1), verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_wallet("treasury")
+        ledger.register_wallet("alice")
+        ledger.set_balance("treasury", "USD", Decimal("1000000"))
+        ledger.register_unit(create_stock_unit(
+            "AAPL", "Apple Inc.", "treasury", "USD",
+            dividend_schedule=[Dividend(datetime(2024, 3, 29), datetime(2024, 3, 29), 0.25, "USD")],
+        ))
+        ledger.set_balance("alice", "AAPL", Decimal("1000"))
+
+        engine = LifecycleEngine(ledger)
+        engine.register("STOCK", stock_contract)
+        engine.register("DEFERRED_CASH", deferred_cash_contract)
+        attribution = PnLAttribution(ledger).attach(engine)
+        prices = {"USD": Decimal("1"), "AAPL": Decimal("170")}
+        engine.run([datetime(2024, 3, 28), datetime(2024, 3, 29), datetime(2024, 3, 30)], lambda ts: prices)
+
+        alice = attribution.cumulative("alice")
+        assert alice["lifecycle"] == Decimal("250")
+        assert alice["trading"] == alice["transfers"] == alice["price"] == Decimal("0")
+        assert attribution.cumulative("treasury")["lifecycle"] == Decimal("-250")
+
+
+class TestReconciliation:
+    """Components sum to the change in NAV."""
+
+    def test_random_trades_and_ticks(self):
+        rng = random.Random(7)
+        ledger = _book()
+        ledger.set_balance("alice", "MSFT", Decimal("20"))
+        engine = LifecycleEngine(ledger)
+        attribution = PnLAttribution(ledger).attach(engine)
+
+        prices = _prices("200")
+        engine.step(T0, prices)
+        start = {wallet: _nav(ledger, wallet, prices) for wallet in ("alice", "bob", "broker")}
+        for day in range(1, 30):
+            for _ in range(rng.randint(0, 3)):
+                buyer, seller = rng.sample(["alice", "bob"], 2)
+                unit = rng.choice(STOCKS)
+                _buy(ledger, buyer, seller, unit, rng.randint(1, 5), rng.randint(150, 450),
+                     fee=rng.choice([None, "1.25"]))
+            if rng.random() < 0.2:
+                ledger.execute(build_transaction(ledger, [
+                    Move(Decimal("100"), "USD", SYSTEM_WALLET, "bob", "deposit_bob")]))
+            prices = _prices(str(rng.randint(150, 250)), str(rng.randint(350, 450)))
+            engine.step(T0 + timedelta(days=day), prices)
+
+        for wallet in ("alice", "bob", "broker"):
+            change = _nav(ledger, wallet, prices) - start[wallet]
+            assert sum(attribution.cumulative(wallet).values()) == change
+            assert sum(attribution.store.totals(wallet).values()) == change
+
+
+class TestPnLStore:
+    """Tests for the columnar store."""
+
+    @pytest.fixture
+    def store(self):
+        store = PnLStore(capacity=2)
+        for day in range(10):
+            for wallet in ("alice", "bob"):
+                store.append(T0 + timedelta(days=day), wallet,
+                             [Decimal(day), Decimal("1"), Decimal("0"), Decimal("-0.5"), Decimal("0")])
+        return store
+
+    def test_query_wallet_and_range(self, store):
+        rows = store.query("alice", T0 + timedelta(days=2), T0 + timedelta(days=4))
+        assert list(rows["price"]) == [2.0, 3.0, 4.0]
+        assert list(rows["wallet"]) == ["alice"] * 3
+        assert list(rows["total"]) == [2.5, 3.5, 4.5]
+        assert rows["timestamp"][0] == T0 + timedelta(days=2)
+        assert set(rows) == {"timestamp", "wallet", "total", *PNL_COMPONENTS}
+
+    def test_query_all_and_unknown(self, store):
+        assert len(store.query()["price"]) == 20
+        assert len(store.query("carol")["price"]) == 0
+        assert len(PnLStore().query()["wallet"]) == 0
+
+    def test_totals_exact(self, store):
+        totals = store.totals("bob", start=T0 + timedelta(days=8))
+        assert totals == {"price": Decimal("17"), "trading": Decimal("2"), "lifecycle": Decimal("0"),
+                          "fees": Decimal("-1.0"), "transfers": Decimal("0")}
+        assert store.totals()["trading"] == Decimal("20")
+        assert store.wallets == ["alice", "bob"]
+        assert len(store) == 20
+
+    def test_truncate(self, store):
+        dropped = store.truncate(T0 + timedelta(days=7))
+        assert len(dropped) == 4
+        assert dropped[0] == ("alice", (Decimal(8), Decimal("1"), Decimal("0"), Decimal("-0.5"), Decimal("0")))
+        assert len(store) == 16
+        assert store.totals("bob")["price"] == Decimal("28")
+        store.append(T0 + timedelta(days=8), "bob", [Decimal("1")] * len(PNL_COMPONENTS))
+        assert len(store.query("bob")["price"]) == 9
+
+    def test_rejects_out_of_order_and_bad_rows(self, store):
+        with pytest.raises(ValueError):
+            store.append(T0, "alice", [Decimal("0")] * len(PNL_COMPONENTS))
+        with pytest.raises(ValueError):
+            store.append(T0 + timedelta(days=20), "alice", [Decimal("0")])
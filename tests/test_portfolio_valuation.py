@@ -0,0 +1,205 @@
+"""
+test_portfolio_valuation.py - Unit tests for portfolio_valuation.py
+
+Tests:
+- Initial valuation matches a from-scratch loop over wallet balances
+- Trades revalue only the touched positions
+- Price ticks (mark / apply_prices) revalue only changed units
+- Unpriced units, excluded wallets, rebuild()
+"""
+
+import random
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from ledger import (
+    Ledger, Move, SYSTEM_WALLET, PortfolioValuation,
+    StaticPricingSource, TimeSeriesPricingSource,
+    build_transaction, cash, create_stock_unit,
+)
+
+
+T0 = datetime(2025, 1, 2)
+STOCKS = ["AAPL", "MSFT", "TSLA"]
+
+
+def _ledger(wallets=("alice", "bob", "carol")):
+    ledger = Ledger("test", initial_time=T0, verbose=False, test_mode=True)
+    ledger.register_unit(cash("USD", "US Dollar"))
+    for symbol in STOCKS + ["PRIVATE"]:
+        ledger.register_unit(create_stock_unit(symbol, symbol, "issuer", "USD"))
+    for wallet in wallets:
+        ledger.register_wallet(wallet)
+    return ledger
+
+
+def _issue(ledger, wallet, unit, quantity, tag="issue"):
+    ledger.execute(build_transaction(ledger, [
+        Move(Decimal(quantity), unit, SYSTEM_WALLET, wallet, f"{tag}_{wallet}_{unit}")
+    ]))
+
+
+def _transfer(ledger, unit, quantity, source, dest, tag):
+    ledger.execute(build_transaction(ledger, [Move(Decimal(quantity), unit, source, dest, tag)]))
+
+
+def _scratch_navs(ledger, source, timestamp):
+    """NAVs the slow way: every wallet x every balance x get_price()."""
+    navs = {}
+    for wallet in ledger.list_wallets() - {SYSTEM_WALLET}:
+        total = Decimal("0")
+        for unit, quantity in ledger.get_wallet_balances(wallet).items():
+            price = source.get_price(unit, timestamp)
+            if quantity and price is not None:
+                total += quantity * price
+        navs[wallet] = total
+    return navs
+
+
+@pytest.fixture
+def book():
+    ledger = _ledger()
+    _issue(ledger, "alice", "USD", 1000)
+    _issue(ledger, "alice", "AAPL", 10)
+    _issue(ledger, "bob", "MSFT", 5)
+    _issue(ledger, "bob", "AAPL", 2)
+    source = StaticPricingSource({"AAPL": Decimal("200"), "MSFT": Decimal("400"), "TSLA": Decimal("250")})
+    return ledger, source
+
+
+class TestInitialValuation:
+    """Tests for the from-scratch build."""
+
+    def test_matches_scratch_loop(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        assert valuation.nav("alice") == Decimal("3000")
+        assert valuation.nav("bob") == Decimal("2400")
+        assert valuation.nav("carol") == Decimal("0")
+        assert valuation.unit_value("AAPL") == Decimal("2400")
+        assert valuation.position_value("bob", "MSFT") == Decimal("2000")
+        assert {w: valuation.nav(w) for w in _scratch_navs(ledger, source, T0)} == _scratch_navs(ledger, source, T0)
+
+    def test_system_wallet_excluded_by_default(self, book):
+        ledger, source = book
+        assert SYSTEM_WALLET not in PortfolioValuation(ledger, source).navs()
+        included = PortfolioValuation(ledger, source, exclude_wallets=())
+        assert included.unit_value("AAPL") == Decimal("0")  # Issuance nets out
+
+
+class TestTrades:
+    """Tests for incremental updates from executed transactions."""
+
+    def test_trade_updates_touched_wallets(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        _transfer(ledger, "AAPL", 4, "alice", "carol", "t1")
+        assert valuation.nav("alice") == Decimal("2200")
+        assert valuation.nav("carol") == Decimal("800")
+        assert valuation.unit_value("AAPL") == Decimal("2400")
+        assert valuation.sync() == 0
+
+    def test_closing_a_position_removes_it(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        _transfer(ledger, "MSFT", 5, "bob", "alice", "t1")
+        assert valuation.position_value("bob", "MSFT") == Decimal("0")
+        assert valuation.nav("bob") == Decimal("400")
+        assert valuation.position_value("alice", "MSFT") == Decimal("2000")
+
+    def test_first_trade_in_new_unit_is_priced(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        _issue(ledger, "carol", "TSLA", 3)
+        assert valuation.nav("carol") == Decimal("750")
+        assert valuation.price("TSLA") == Decimal("250")
+
+
+class TestPriceTicks:
+    """Tests for mark() and apply_prices()."""
+
+    def test_apply_prices_revalues_changed_units_only(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        changed = valuation.apply_prices({"AAPL": Decimal("210"), "MSFT": Decimal("400")})
+        assert changed == {"AAPL"}
+        assert valuation.nav("alice") == Decimal("3100")
+        assert valuation.nav("bob") == Decimal("2420")
+
+    def test_mark_against_time_series(self):
+        ledger = _ledger()
+        _issue(ledger, "alice", "AAPL", 10)
+        _issue(ledger, "bob", "MSFT", 1)
+        source = TimeSeriesPricingSource({
+            "AAPL": [(T0, Decimal("200")), (T0 + timedelta(days=1), Decimal("205"))],
+            "MSFT": [(T0, Decimal("400"))],
+        })
+        valuation = PortfolioValuation(ledger, source)
+        assert valuation.mark(T0 + timedelta(days=1)) == {"AAPL"}
+        assert valuation.nav("alice") == Decimal("2050")
+        assert valuation.timestamp == T0 + timedelta(days=1)
+        expected = _scratch_navs(ledger, source, T0 + timedelta(days=1))
+        assert {wallet: valuation.nav(wallet) for wallet in expected} == expected
+
+    def test_unpriced_units(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        _issue(ledger, "carol", "PRIVATE", 7)
+        assert valuation.unpriced == {"PRIVATE"}
+        assert valuation.nav("carol") == Decimal("0")
+        valuation.apply_prices({"PRIVATE": Decimal("3")})
+        assert valuation.unpriced == set()
+        assert valuation.nav("carol") == Decimal("21")
+
+
+class TestConsistency:
+    """Incremental results always equal a full revaluation."""
+
+    def test_random_trades_and_ticks(self):
+        rng = random.Random(42)
+        wallets = [f"W{i}" for i in range(30)]
+        ledger = _ledger(wallets)
+        for wallet in wallets:
+            _issue(ledger, wallet, "USD", 10000)
+            for stock in STOCKS:
+                _issue(ledger, wallet, stock, rng.randint(0, 20) or 1)
+        source = StaticPricingSource({stock: Decimal(rng.randint(50, 500)) for stock in STOCKS})
+        valuation = PortfolioValuation(ledger, source)
+
+        for i in range(300):
+            if rng.random() < 0.7:
+                source_wallet, dest_wallet = rng.sample(wallets, 2)
+                unit = rng.choice(STOCKS + ["USD"])
+                balance = ledger.get_balance(source_wallet, unit)
+                if balance > 0:
+                    _transfer(ledger, unit, rng.randint(1, int(balance)), source_wallet, dest_wallet, f"t{i}")
+            else:
+                stock = rng.choice(STOCKS)
+                price = Decimal(rng.randint(50, 500)) / 4
+                source.update_price(stock, price)
+                valuation.apply_prices({stock: price})
+            if i % 50 == 0:
+                assert valuation.navs() == _scratch_navs(ledger, source, T0)
+        assert valuation.navs() == _scratch_navs(ledger, source, T0)
+
+    def test_rebuild_after_set_balance(self, book):
+        ledger, source = book
+        valuation = PortfolioValuation(ledger, source)
+        ledger.set_balance("carol", "AAPL", Decimal("1"))
+        assert valuation.nav("carol") == Decimal("0")  # Not in the transaction log
+        valuation.rebuild()
+        assert valuation.nav("carol") == Decimal("200")
+
+    def test_replaced_log_of_same_length_rebuilds(self, book):
+        ledger, source = book
+        other = ledger.clone()
+        valuation = PortfolioValuation(ledger, source)
+        _transfer(ledger, "AAPL", 5, "alice", "carol", "gift")
+        assert valuation.nav("carol") == Decimal("1000")
+
+        # Restore a different state whose log has the same length
+        _transfer(other, "MSFT", 1, "bob", "carol", "gift")
+        ledger.__setstate__(other.__getstate__())
+        assert valuation.sync() == 0
+        assert valuation.navs() == _scratch_navs(ledger, source, T0)
+        assert valuation.nav("carol") == Decimal("400")
@@ -0,0 +1,215 @@
+"""
+test_price_feed.py - Unit tests for price_feed.py
+
+Tests:
+- Wire format parsing and encoding
+- Coalescing and atomic snapshot publication
+- Stream ingestion, replay over a Unix socket, engine consumption
+- Latency benchmark
+"""
+
+import asyncio
+import os
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from ledger import (
+    Ledger, LifecycleEngine, PriceSnapshot,
+    PriceFeedIngestor, FeedReplayer, parse_update, format_update, benchmark_latency,
+    cash, empty_pending_transaction,
+)
+
+
+T0 = datetime(2025, 1, 2, 9, 30)
+
+
+def _lines(n, units=3):
+    return [format_update(T0 + timedelta(seconds=i), {f"U{i % units}": Decimal(100 + i)}) for i in range(n)]
+
+
+class TestWireFormat:
+    """Tests for parse_update() and format_update()."""
+
+    def test_single_unit_line(self):
+        timestamp, prices = parse_update('{"t": "2025-01-02T09:30:00", "unit": "AAPL", "price": "187.25"}')
+        assert timestamp == T0
+        assert prices == {"AAPL": Decimal("187.25")}
+
+    def test_roundtrip(self):
+        line = format_update(T0, {"AAPL": Decimal("1.5"), "MSFT": Decimal("2")})
+        assert parse_update(line) == (T0, {"AAPL": Decimal("1.5"), "MSFT": Decimal("2")})
+
+    @pytest.mark.parametrize("line", ['not json', '{"unit": "A", "price": "1"}',
+                                      '{"t": "2025-01-02", "unit": "A", "price": "x"}', '[1]',
+                                      '{"t": "2025-01-02", "unit": "A", "price": "NaN"}',
+                                      '{"t": "2025-01-02", "unit": "A", "price": "Infinity"}',
+                                      '{"t": "2025-01-02", "prices": {"A": "1", "B": NaN}}'])
+    def test_invalid_lines(self, line):
+        with pytest.raises(ValueError):
+            parse_update(line)
+
+
+class TestPublication:
+    """Tests for submit() / publish()."""
+
+    def test_coalesces_latest_price(self):
+        ingestor = PriceFeedIngestor(initial={"A": Decimal("1"), "B": Decimal("5")}, timestamp=T0)
+        before = ingestor.snapshot
+        ingestor.submit(T0 + timedelta(seconds=1), {"A": Decimal("2")})
+        ingestor.submit(T0 + timedelta(seconds=2), {"A": Decimal("3")})
+        assert ingestor.snapshot is before  # Nothing visible until published
+        snapshot = ingestor.publish()
+        assert ingestor.snapshot is snapshot
+        assert snapshot == {"A": Decimal("3"), "B": Decimal("5")}
+        assert snapshot.timestamp == T0 + timedelta(seconds=2)
+        assert snapshot.version == 1 and snapshot.changed == {"A"}
+        assert before == {"A": Decimal("1"), "B": Decimal("5")}  # Old snapshot unchanged
+        assert ingestor.latency.count == 2
+
+    def test_publish_without_pending(self):
+        ingestor = PriceFeedIngestor()
+        assert ingestor.publish() is None
+        assert ingestor.snapshots_published == 0
+
+    def test_timestamp_never_moves_backwards(self):
+        ingestor = PriceFeedIngestor(initial={"A": 1}, timestamp=T0)
+        ingestor.submit(T0 - timedelta(seconds=5), {"A": Decimal("2")})
+        assert ingestor.publish().timestamp == T0
+
+    def test_max_pending_forces_publish(self):
+        ingestor = PriceFeedIngestor(max_pending=2)
+        ingestor.submit(T0, {"A": Decimal("1")})
+        ingestor.submit(T0, {"A": Decimal("2")})
+        assert ingestor.snapshots_published == 1
+
+    def test_invalid_submitted_price_is_dropped(self):
+        ingestor = PriceFeedIngestor(initial={"A": Decimal("1")}, timestamp=T0)
+        ingestor.submit(T0, {"A": Decimal("NaN"), "B": Decimal("2")})
+        assert ingestor.publish() == {"A": Decimal("1"), "B": Decimal("2")}
+        assert ingestor.rejected_prices == 1
+        ingestor.submit(T0, {"A": Decimal("3")})
+        assert ingestor.publish() == {"A": Decimal("3"), "B": Decimal("2")}
+
+    def test_invalid_max_pending(self):
+        with pytest.raises(ValueError):
+            PriceFeedIngestor(max_pending=0)
+
+
+class TestIngestion:
+    """Tests for stream ingestion."""
+
+    def test_ingest_stream_reader(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            for line in _lines(10):
+                reader.feed_data(line.encode())
+            reader.feed_data(b"garbage\n\n")
+            reader.feed_eof()
+            ingestor = PriceFeedIngestor()
+            await ingestor.ingest(reader)
+            return ingestor
+
+        ingestor = asyncio.run(run())
+        assert ingestor.updates_received == 10
+        assert ingestor.rejected_lines == 1
+        assert ingestor.snapshots_published == 1  # All buffered lines coalesced
+        assert ingestor.snapshot == {"U0": Decimal("109"), "U1": Decimal("107"), "U2": Decimal("108")}
+
+    def test_non_finite_price_line_does_not_block_the_feed(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"t": "2025-01-02T09:30:00", "unit": "AAPL", "price": "NaN"}\n')
+            reader.feed_data(format_update(T0, {"MSFT": Decimal("10")}).encode())
+            reader.feed_eof()
+            ingestor = PriceFeedIngestor()
+            await ingestor.ingest(reader)
+            return ingestor
+
+        ingestor = asyncio.run(run())
+        assert ingestor.rejected_lines == 1
+        assert ingestor.snapshot == {"MSFT": Decimal("10")}
+
+    def test_replay_over_unix_socket(self):
+        async def run(path):
+            ingestor = PriceFeedIngestor()
+            server = asyncio.create_task(FeedReplayer(_lines(50)).serve_unix_socket(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.001)
+            await ingestor.ingest_unix_socket(path)
+            return ingestor, await server
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ingestor, replayed = asyncio.run(run(os.path.join(tmp, "feed.sock")))
+        assert replayed == 50
+        assert ingestor.updates_received == 50
+        assert ingestor.snapshot.timestamp == T0 + timedelta(seconds=49)
+
+    def test_replay_from_file_at_speed(self, tmp_path):
+        feed_file = tmp_path / "feed.jsonl"
+        feed_file.write_text("".join(_lines(3)))
+        replayer = FeedReplayer.from_file(feed_file, speed=200)
+
+        async def run():
+            reader = asyncio.StreamReader()
+
+            class Sink:
+                def write(self, data):
+                    reader.feed_data(data)
+
+                async def drain(self):
+                    pass
+
+            ingestor = PriceFeedIngestor()
+            await replayer.replay(Sink(), close=False)
+            reader.feed_eof()
+            await ingestor.ingest(reader)
+            return ingestor
+
+        assert asyncio.run(run()).updates_received == 3
+
+    def test_engine_consumes_snapshots(self):
+        seen = []
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+
+        def recording_contract(view, symbol, timestamp, prices):
+            seen.append(prices)
+            return empty_pending_transaction(view)
+
+        engine = LifecycleEngine(ledger)
+        engine.register("CASH", recording_contract)
+
+        async def run():
+            reader = asyncio.StreamReader()
+            ingestor = PriceFeedIngestor()
+            ingest = asyncio.create_task(ingestor.ingest(reader))
+            consumed = []
+
+            async def produce():
+                for line in _lines(6):
+                    reader.feed_data(line.encode())
+                    await asyncio.sleep(0)
+                reader.feed_eof()
+
+            producer = asyncio.create_task(produce())
+            async for result in engine.arun_stream(ingestor.snapshots()):
+                consumed.append(result.timestamp)
+            await asyncio.gather(ingest, producer)
+            return consumed
+
+        consumed = asyncio.run(run())
+        assert consumed == sorted(consumed)
+        assert consumed[-1] == T0 + timedelta(seconds=5)
+        assert all(isinstance(prices, PriceSnapshot) for prices in seen)
+        assert seen[-1] == {"U0": Decimal("103"), "U1": Decimal("104"), "U2": Decimal("105")}
+
+
+class TestBenchmark:
+    """Tests for benchmark_latency()."""
+
+    def test_reports_latency(self):
+        result = asyncio.run(benchmark_latency(updates=500, units=10))
+        assert result['updates'] == 500
+        assert 1 <= result['snapshots'] <= 500
+        assert result['latency']['count'] == 500
@@ -0,0 +1,191 @@
+"""
+test_price_snapshot.py - Unit tests for price_snapshot.py
+
+Tests:
+- Construction: validation, Decimal conversion, float64 array and index
+- Immutability and Mapping behaviour
+- Versioning and diff against the previous snapshot, updated()
+- LifecycleEngine integration: one shared snapshot per step
+"""
+
+import pickle
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from ledger import (
+    Ledger, LifecycleEngine, PriceSnapshot,
+    cash, empty_pending_transaction,
+)
+from ledger.units.qis import compute_nav
+
+
+T0 = datetime(2025, 1, 1)
+
+
+class TestConstruction:
+    """Tests for building a PriceSnapshot."""
+
+    def test_converts_to_decimal_once(self):
+        snapshot = PriceSnapshot({"A": 1.5, "B": 2, "C": Decimal("3.25"), "D": "4"}, T0)
+        assert snapshot["A"] == Decimal("1.5")
+        assert all(isinstance(v, Decimal) for v in snapshot.values())
+        assert snapshot.timestamp == T0
+
+    @pytest.mark.parametrize("bad", [float("nan"), Decimal("Infinity"), "abc"])
+    def test_rejects_invalid_prices(self, bad):
+        with pytest.raises(ValueError):
+            PriceSnapshot({"A": bad})
+
+    def test_array_parallel_to_symbols(self):
+        snapshot = PriceSnapshot({"A": Decimal("1.5"), "B": Decimal("2.5")})
+        assert snapshot.symbols == ("A", "B")
+        assert snapshot.array[snapshot.index["B"]] == 2.5
+        assert list(snapshot.float_prices(("B", "A"))) == [2.5, 1.5]
+
+    def test_of_passes_snapshot_through(self):
+        snapshot = PriceSnapshot({"A": 1})
+        assert PriceSnapshot.of(snapshot) is snapshot
+        assert isinstance(PriceSnapshot.of({"A": 1}), PriceSnapshot)
+
+
+class TestMappingBehaviour:
+    """Tests for immutability and dict compatibility."""
+
+    def test_immutable(self):
+        snapshot = PriceSnapshot({"A": 1})
+        with pytest.raises(TypeError):
+            snapshot["A"] = Decimal("2")
+        with pytest.raises(AttributeError):
+            snapshot.version = 5
+        with pytest.raises(ValueError):
+            snapshot.array[0] = 2.0
+
+    def test_equals_dict(self):
+        snapshot = PriceSnapshot({"A": Decimal("1"), "B": Decimal("2")})
+        assert snapshot == {"A": Decimal("1"), "B": Decimal("2")}
+        assert {"A": Decimal("1"), "B": Decimal("2")} == snapshot
+        assert snapshot != {"A": Decimal("1")}
+        assert dict(snapshot) == {"A": Decimal("1"), "B": Decimal("2")}
+        assert snapshot.get("Z") is None and "A" in snapshot and len(snapshot) == 2
+
+    def test_pickle_roundtrip(self):
+        snapshot = PriceSnapshot({"A": Decimal("1.1")}, T0)
+        restored = pickle.loads(pickle.dumps(snapshot))
+        assert restored == snapshot and restored.timestamp == T0
+
+    def test_used_by_contract_functions(self):
+        snapshot = PriceSnapshot({"SPX": 100})
+        assert compute_nav({"SPX": Decimal("2")}, Decimal("10"), snapshot) == Decimal("210")
+
+
+class TestSamePrices:
+    """Tests for comparing raw prices without building a snapshot."""
+
+    def test_matches_snapshot_equality(self):
+        snapshot = PriceSnapshot({"SPX": 100.5, "VIX": Decimal("15")})
+        assert snapshot.same_prices({"SPX": 100.5, "VIX": 15})
+        assert snapshot.same_prices({"SPX": Decimal("100.5"), "VIX": "15"})
+        assert snapshot.same_prices(PriceSnapshot({"SPX": 100.5, "VIX": 15}))
+        assert not snapshot.same_prices({"SPX": 100.6, "VIX": 15})
+        assert not snapshot.same_prices({"SPX": 100.5})
+        assert not snapshot.same_prices({"SPX": 100.5, "VXN": 15})
+        assert not snapshot.same_prices({"SPX": "abc", "VIX": 15})
+        assert not snapshot.same_prices({"SPX": float("nan"), "VIX": 15})
+
+
+class TestVersioning:
+    """Tests for version and diff tracking."""
+
+    def test_first_snapshot_everything_changed(self):
+        snapshot = PriceSnapshot({"A": 1, "B": 2})
+        assert snapshot.version == 0
+        assert snapshot.changed == {"A", "B"}
+        assert snapshot.removed == frozenset()
+
+    def test_diff_against_previous(self):
+        first = PriceSnapshot({"A": 1, "B": 2, "C": 3})
+        second = PriceSnapshot({"A": 1, "B": 5, "D": 4}, previous=first)
+        assert second.version == 1
+        assert second.changed == {"B", "D"}
+        assert second.removed == {"C"}
+
+    def test_parent_identifies_the_previous_snapshot(self):
+        first = PriceSnapshot({"A": 1})
+        second = PriceSnapshot({"A": 2}, previous=first)
+        other = PriceSnapshot({"A": 3})
+        assert first.parent is None
+        assert second.parent == first.serial
+        assert first.updated({"A": 4}).parent == first.serial
+        assert len({first.serial, second.serial, other.serial}) == 3
+        assert other.version == first.version  # Versions repeat across chains; serials do not
+
+    def test_same_universe_shares_index(self):
+        first = PriceSnapshot({"A": 1, "B": 2})
+        second = PriceSnapshot({"A": 1, "B": 3}, previous=first)
+        assert second.index is first.index
+        assert second.changed == {"B"}
+
+    @pytest.mark.parametrize("updates", [{"B": 5}, {"B": 2}, {"B": "5", "D": 4}, {}])
+    def test_updated_matches_full_rebuild(self, updates):
+        first = PriceSnapshot({"A": 1, "B": 2, "C": 3}, T0)
+        updated = first.updated(updates, T0)
+        full = PriceSnapshot({**first, **updates}, T0, previous=first)
+        assert updated == full
+        assert (updated.version, updated.changed, updated.removed) == (full.version, full.changed, full.removed)
+        assert updated.symbols == full.symbols
+        assert updated.index == full.index
+        assert list(updated.array) == list(full.array)
+        assert not updated.array.flags.writeable
+        assert list(first.array) == [1.0, 2.0, 3.0]  # Previous snapshot untouched
+
+    def test_updated_reuses_unchanged_structures(self):
+        first = PriceSnapshot({"A": 1, "B": 2})
+        assert first.updated({"B": 3}).index is first.index
+        assert first.updated({"B": 2}).array is first.array
+        with pytest.raises(ValueError):
+            first.updated({"B": "nan"})
+
+
+class TestEngineIntegration:
+    """The engine builds one snapshot per step and chains them."""
+
+    def _engine(self, seen):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        ledger.register_unit(cash("EUR", "Euro"))
+
+        def recording_contract(view, symbol, timestamp, prices):
+            seen.append((symbol, prices))
+            return empty_pending_transaction(view)
+
+        engine = LifecycleEngine(ledger)
+        engine.register("CASH", recording_contract)
+        return engine
+
+    def test_contracts_share_one_snapshot(self):
+        seen = []
+        engine = self._engine(seen)
+        engine.step(datetime(2025, 1, 1), {"SPX": 100.5})
+        assert len(seen) == 2
+        (_, first), (_, second) = seen
+        assert first is second
+        assert isinstance(first, PriceSnapshot)
+        assert first["SPX"] == Decimal("100.5")
+
+    def test_snapshots_chain_across_steps(self):
+        seen = []
+        engine = self._engine(seen)
+        engine.step(datetime(2025, 1, 1), {"SPX": 100, "VIX": 15})
+        engine.step(datetime(2025, 1, 2), {"SPX": 101, "VIX": 15})
+        last = seen[-1][1]
+        assert last.version == 1
+        assert last.changed == {"SPX"}
+
+    @pytest.mark.parametrize("bad", [float("inf"), float("nan"), "abc", None])
+    def test_invalid_price_rejected_before_polling(self, bad):
+        # step() used to pass such prices through to contracts unchecked
+        seen = []
+        engine = self._engine(seen)
+        with pytest.raises(ValueError):
+            engine.step(datetime(2025, 1, 1), {"SPX": bad})
+        assert seen == []
@@ -0,0 +1,103 @@
+"""
+test_price_store.py - Unit tests for price_store.py
+
+Tests:
+- PriceStoreWriter: layout, partitioning by year
+- DiskPricingSource: point-in-time lookups, exact Decimals, lazy partition loading
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from ledger import (
+    PricingSource,
+    TimeSeriesPricingSource,
+    PriceStoreWriter,
+    DiskPricingSource,
+)
+
+
+T0 = datetime(2022, 12, 30)
+
+
+def _paths():
+    return {
+        'AAPL': [(T0 + timedelta(days=d), Decimal("100.25") + d) for d in range(0, 400, 3)],
+        'TSLA': [(T0 + timedelta(days=d), Decimal("200.125") - d) for d in range(5, 800, 7)],
+        'A/B': [(T0, Decimal("0.1"))],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    with PriceStoreWriter(tmp_path / "store") as writer:
+        for unit, path in _paths().items():
+            writer.write_unit(unit, path)
+    return DiskPricingSource(tmp_path / "store")
+
+
+class TestPriceStoreWriter:
+    """Tests for PriceStoreWriter."""
+
+    def test_partitions_by_year(self, tmp_path, store):
+        years = store._units['AAPL']['years']
+        assert years == [2022, 2023, 2024]
+
+    def test_duplicate_unit_rejected(self, tmp_path):
+        writer = PriceStoreWriter(tmp_path)
+        writer.write_unit('AAPL', [(T0, Decimal("1"))])
+        with pytest.raises(ValueError):
+            writer.write_unit('AAPL', [(T0, Decimal("2"))])
+
+    def test_missing_manifest(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            DiskPricingSource(tmp_path)
+
+
+class TestDiskPricingSource:
+    """Tests for DiskPricingSource."""
+
+    def test_is_pricing_source(self, store):
+        assert isinstance(store, PricingSource)
+
+    def test_matches_in_memory_source(self, store):
+        memory = TimeSeriesPricingSource(_paths())
+        units = {'AAPL', 'TSLA', 'A/B', 'USD', 'MISSING'}
+        for day in range(-3, 900, 11):
+            t = T0 + timedelta(days=day, hours=6)
+            assert store.get_prices(units, t) == memory.get_prices(units, t)
+
+    def test_lookup_across_year_boundary(self, store):
+        # First 2023 observation is Jan 2; Jan 1 must fall back to Dec 30, 2022
+        assert store.get_price('AAPL', datetime(2023, 1, 1)) == Decimal("100.25")
+
+    def test_exact_decimals(self, store):
+        price = store.get_price('TSLA', T0 + timedelta(days=5))
+        assert price == Decimal("195.125")
+        assert store.get_float_price('TSLA', T0 + timedelta(days=5)) == 195.125
+
+    def test_only_touched_partitions_loaded(self, store):
+        store.get_price('AAPL', datetime(2023, 6, 1))
+        assert list(store._open) == [('AAPL', 2023)]
+
+    def test_partition_cache_bounded(self, tmp_path):
+        with PriceStoreWriter(tmp_path) as writer:
+            writer.write_unit('AAPL', _paths()['AAPL'])
+        source = DiskPricingSource(tmp_path, max_open_partitions=1)
+        source.get_price('AAPL', datetime(2023, 6, 1))
+        source.get_price('AAPL', datetime(2024, 1, 20))
+        assert list(source._open) == [('AAPL', 2024)]
+
+    def test_get_all_timestamps(self, store):
+        assert store.get_all_timestamps('AAPL') == [t for t, _ in _paths()['AAPL']]
+        assert store.get_all_timestamps('MISSING') == []
+        assert store.units() == ['A/B', 'AAPL', 'TSLA']
+
+    def test_aware_timestamps_read_back_as_naive_utc(self, tmp_path):
+        est = timezone(timedelta(hours=-5))
+        with PriceStoreWriter(tmp_path) as writer:
+            writer.write_unit('AAPL', [(datetime(2024, 1, 2, 9, 30, tzinfo=est), Decimal("185"))])
+        source = DiskPricingSource(tmp_path)
+        assert source.get_all_timestamps('AAPL') == [datetime(2024, 1, 2, 14, 30)]
+        assert source.get_price('AAPL', datetime(2024, 1, 2, 9, 30, tzinfo=est)) == Decimal("185")
+        assert source.get_price('AAPL', datetime(2024, 1, 2, 14, 29)) is None
@@ -4,14 +4,20 @@ test_pricing_source.py - Unit tests for pricing_source.py
 Tests:
 - StaticPricingSource: static prices, updates
 - TimeSeriesPricingSource: time-varying prices (incremental and batch initialization)
+- Columnar storage: ordering, ties, vectorized get_prices
+- PriceCursor and iter_snapshots: sequential access
 """
 
+import random
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from ledger import (
     StaticPricingSource,
     TimeSeriesPricingSource,
+    PriceColumn,
+    to_epoch_us,
+    from_epoch_us,
 )
 
 
@@ -223,6 +229,160 @@ class TestTimeSeriesWithPaths:
         assert 'TimeSeriesPricingSource' in repr_str
 
 
+class TestTimeSeriesColumnarStorage:
+    """Tests for the columnar storage behind TimeSeriesPricingSource."""
+
+    T0 = datetime(2025, 1, 1)
+
+    def test_epoch_microseconds(self):
+        ts = datetime(2025, 1, 1, 12, 0, 0, 7)
+        assert to_epoch_us(datetime(1970, 1, 1)) == 0
+        assert from_epoch_us(to_epoch_us(ts)) == ts
+        aware = datetime(2025, 1, 1, 7, 0, 0, 7, tzinfo=timezone(timedelta(hours=-5)))
+        assert to_epoch_us(aware) == to_epoch_us(ts)
+        assert from_epoch_us(to_epoch_us(aware)) == ts  # Naive UTC
+
+    def test_out_of_order_add_price(self):
+        source = TimeSeriesPricingSource()
+        for day, price in ((5, "105"), (1, "101"), (3, "103"), (9, "109")):
+            source.add_price('AAPL', self.T0 + timedelta(days=day), Decimal(price))
+        assert source.get_all_timestamps('AAPL') == [
+            self.T0 + timedelta(days=d) for d in (1, 3, 5, 9)
+        ]
+        assert source.get_price('AAPL', self.T0 + timedelta(days=4)) == Decimal("103")
+
+    def test_units_and_column(self):
+        source = TimeSeriesPricingSource({'AAPL': [(self.T0, Decimal("1"))], 'EMPTY': []})
+        source.add_price('MSFT', self.T0, Decimal("2"))
+        assert source.units() == ['AAPL', 'MSFT']
+        column = source.column('MSFT')
+        assert isinstance(column, PriceColumn)
+        assert column.values == [Decimal("2")]
+        assert list(column.time_array()) == [to_epoch_us(self.T0)]
+        assert source.column('EMPTY') is None
+
+    def test_equal_timestamps_return_latest_added(self):
+        source = TimeSeriesPricingSource()
+        source.add_price('AAPL', self.T0, Decimal("1"))
+        source.add_price('AAPL', self.T0, Decimal("2"))
+        assert source.get_price('AAPL', self.T0) == Decimal("2")
+
+    def test_exact_values_preserved(self):
+        price = Decimal("101.123456789012345678901234567")
+        source = TimeSeriesPricingSource({'AAPL': [(self.T0, price)]})
+        assert source.get_price('AAPL', self.T0) is price
+
+    def test_many_appends(self):
+        source = TimeSeriesPricingSource()
+        for i in range(1000):
+            source.add_price('AAPL', self.T0 + timedelta(minutes=i), Decimal(i))
+        assert source.get_price('AAPL', self.T0 + timedelta(minutes=500, seconds=30)) == Decimal(500)
+        assert source.price_history['AAPL'][-1] == (self.T0 + timedelta(minutes=999), Decimal(999))
+
+    def test_vectorized_get_prices_matches_scalar(self):
+        paths = {
+            f"S{i}": [(self.T0 + timedelta(days=d), Decimal(i * 100 + d)) for d in range(i % 7, 30, 3)]
+            for i in range(200)
+        }
+        source = TimeSeriesPricingSource(paths)
+        units = set(paths) | {'USD', 'MISSING'}
+        for day in (0, 2, 5, 17, 40):
+            t = self.T0 + timedelta(days=day, hours=12)
+            expected = {u: source.get_price(u, t) for u in units if source.get_price(u, t) is not None}
+            assert source.get_prices(units, t) == expected
+
+    def test_panel_invalidated_by_add_price(self):
+        source = TimeSeriesPricingSource({f"S{i}": [(self.T0, Decimal(i))] for i in range(100)})
+        units = {f"S{i}" for i in range(100)}
+        assert source.get_prices(units, self.T0)['S1'] == Decimal(1)
+        source.add_price('S1', self.T0 + timedelta(days=1), Decimal("42"))
+        assert source.get_prices(units, self.T0 + timedelta(days=1))['S1'] == Decimal("42")
+
+    def test_in_order_appends_keep_panel(self):
+        source = TimeSeriesPricingSource({f"S{i}": [(self.T0, Decimal(i))] for i in range(100)})
+        units = {f"S{i}" for i in range(100)}
+        source.get_prices(units, self.T0)
+        panel = source._panel
+        for i in range(100):
+            source.add_price(f"S{i}", self.T0 + timedelta(days=1), Decimal(1000 + i))
+        prices = source.get_prices(units, self.T0 + timedelta(days=1))
+        assert source._panel is panel
+        assert prices['S7'] == Decimal(1007)
+        assert source.get_prices(units, self.T0)['S7'] == Decimal(7)
+
+    def test_interleaved_appends_match_scalar(self):
+        rng = random.Random(3)
+        source = TimeSeriesPricingSource({f"S{i}": [(self.T0, Decimal(i))] for i in range(80)})
+        units = {f"S{i}" for i in range(90)} | {'USD'}
+        for step in range(1, 200):
+            now = self.T0 + timedelta(hours=step)
+            for _ in range(rng.randint(1, 30)):
+                unit = f"S{rng.randrange(90)}"
+                when = now - timedelta(hours=rng.choice([0, 0, 0, 1, 5, 50]))  # Mostly in order
+                source.add_price(unit, when, Decimal(rng.randint(1, 10 ** 6)))
+            for t in (now, now - timedelta(minutes=90), self.T0 + timedelta(hours=rng.randrange(step + 1))):
+                expected = {u: source.get_price(u, t) for u in units if source.get_price(u, t) is not None}
+                assert source.get_prices(units, t) == expected
+
+    def test_price_history_is_read_only(self):
+        source = TimeSeriesPricingSource({'AAPL': [(self.T0, Decimal("1"))]})
+        with pytest.raises(TypeError):
+            source.price_history['TSLA'] = [(self.T0, Decimal("2"))]
+        assert source.price_history['AAPL'] == ((self.T0, Decimal("1")),)
+
+
+class TestSequentialAccess:
+    """Tests for PriceCursor and iter_snapshots."""
+
+    T0 = datetime(2025, 1, 1)
+
+    def _source(self):
+        return TimeSeriesPricingSource({
+            'AAPL': [(self.T0 + timedelta(hours=h), Decimal(100 + h)) for h in range(0, 48, 2)],
+            'TSLA': [(self.T0 + timedelta(hours=h), Decimal(200 + h)) for h in range(5, 48, 5)],
+        })
+
+    def test_cursor_matches_get_prices(self):
+        source = self._source()
+        cursor = source.cursor()
+        for minutes in range(0, 50 * 60, 17):
+            t = self.T0 + timedelta(minutes=minutes)
+            assert cursor.advance(t) == source.get_prices({'AAPL', 'TSLA'}, t)
+
+    def test_cursor_large_jump(self):
+        source = self._source()
+        cursor = source.cursor(['AAPL', 'USD'])
+        cursor.advance(self.T0)
+        prices = cursor.advance(self.T0 + timedelta(hours=31))
+        assert prices == {'AAPL': Decimal(130), 'USD': Decimal("1.0")}
+
+    def test_cursor_rejects_backwards(self):
+        cursor = self._source().cursor()
+        cursor.advance(self.T0 + timedelta(hours=5))
+        with pytest.raises(ValueError):
+            cursor.advance(self.T0)
+
+    def test_cursor_sees_appended_prices(self):
+        source = self._source()
+        cursor = source.cursor(['AAPL'])
+        cursor.advance(self.T0 + timedelta(hours=100))
+        source.add_price('AAPL', self.T0 + timedelta(hours=101), Decimal("999"))
+        assert cursor.advance(self.T0 + timedelta(hours=101))['AAPL'] == Decimal("999")
+
+    def test_iter_snapshots_union_timestamps(self):
+        source = self._source()
+        snapshots = list(source.iter_snapshots())
+        assert [t for t, _ in snapshots] == source.get_all_timestamps()
+        for t, prices in snapshots:
+            assert prices == source.get_prices({'AAPL', 'TSLA'}, t)
+
+    def test_iter_snapshots_feeds_engine(self):
+        from ledger import Ledger, LifecycleEngine
+        engine = LifecycleEngine(Ledger("test", verbose=False, test_mode=True))
+        results = list(engine.run_stream(self._source().iter_snapshots(['AAPL'])))
+        assert len(results) == 24
+
+
 class TestPricingSourceIntegration:
     """Integration tests combining multiple pricing sources."""
 
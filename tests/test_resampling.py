@@ -0,0 +1,167 @@
+"""
+test_resampling.py - Unit tests for resampling.py
+
+Tests:
+- Grids: regular and business-daily
+- Step resampling matches get_price() point lookups
+- Linear interpolation (float and exact Decimal)
+- Forward-fill limits
+- Feeding LifecycleEngine.run() / run_stream()
+"""
+
+import random
+import numpy as np
+import pytest
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from ledger import (
+    Ledger, LifecycleEngine, TimeSeriesPricingSource,
+    ResampledPrices, resample, regular_grid, daily_grid,
+    cash, empty_pending_transaction,
+)
+
+
+T0 = datetime(2025, 1, 6, 9, 30)
+
+
+@pytest.fixture
+def pricer():
+    return TimeSeriesPricingSource({
+        'AAPL': [(T0, Decimal("100")), (T0 + timedelta(hours=2), Decimal("104")),
+                 (T0 + timedelta(hours=3), Decimal("101"))],
+        'TSLA': [(T0 + timedelta(hours=1), Decimal("200.5"))],
+    })
+
+
+class TestGrids:
+    """Tests for grid construction."""
+
+    def test_regular_grid_inclusive(self):
+        grid = regular_grid(T0, T0 + timedelta(hours=2), timedelta(hours=1))
+        assert grid == [T0, T0 + timedelta(hours=1), T0 + timedelta(hours=2)]
+
+    def test_regular_grid_invalid_step(self):
+        with pytest.raises(ValueError):
+            regular_grid(T0, T0, timedelta(0))
+
+    def test_daily_grid_skips_weekends_and_holidays(self):
+        grid = daily_grid(date(2025, 1, 3), date(2025, 1, 8), at=time(16), holidays=[date(2025, 1, 7)])
+        assert grid == [datetime(2025, 1, 3, 16), datetime(2025, 1, 6, 16), datetime(2025, 1, 8, 16)]
+
+
+class TestStep:
+    """Tests for step resampling."""
+
+    def test_matches_get_price(self, pricer):
+        grid = regular_grid(T0 - timedelta(minutes=30), T0 + timedelta(hours=4), timedelta(minutes=15))
+        resampled = resample(pricer, grid)
+        assert isinstance(resampled, ResampledPrices)
+        for i, ts in enumerate(grid):
+            expected = pricer.get_prices({'AAPL', 'TSLA'}, ts)
+            assert resampled.prices_at(i) == expected
+            for row, unit in enumerate(resampled.units):
+                if unit in expected:
+                    assert resampled.values[row, i] == float(expected[unit])
+                else:
+                    assert np.isnan(resampled.values[row, i])
+
+    def test_random_histories(self):
+        rng = random.Random(3)
+        paths = {
+            f"U{u}": [(T0 + timedelta(minutes=rng.randrange(600)), Decimal(rng.randrange(1, 500)))
+                      for _ in range(rng.randrange(1, 40))]
+            for u in range(20)
+        }
+        pricer = TimeSeriesPricingSource(paths)
+        grid = regular_grid(T0, T0 + timedelta(hours=10), timedelta(minutes=7))
+        resampled = resample(pricer, grid)
+        for i, ts in enumerate(grid):
+            assert resampled.prices_at(i) == pricer.get_prices(set(paths), ts)
+
+    def test_ffill_limit(self, pricer):
+        grid = [T0 + timedelta(hours=1), T0 + timedelta(hours=1, minutes=30), T0 + timedelta(hours=5)]
+        resampled = resample(pricer, grid, units=['TSLA'], ffill_limit=timedelta(minutes=30))
+        assert [resampled.prices_at(i) for i in range(3)] == [
+            {'TSLA': Decimal("200.5")}, {'TSLA': Decimal("200.5")}, {},
+        ]
+
+    def test_base_currency_and_unknown_units(self, pricer):
+        resampled = resample(pricer, [T0], units=['AAPL', 'USD', 'MISSING'])
+        assert resampled.units == ['AAPL']
+        assert resampled.prices_at(0) == {'AAPL': Decimal("100"), 'USD': Decimal("1.0")}
+
+
+    @pytest.mark.parametrize("method", ['step', 'linear'])
+    def test_copies_only_the_window_used(self, method):
+        pricer = TimeSeriesPricingSource({
+            'AAPL': [(T0 + timedelta(minutes=m), Decimal(m) + Decimal("0.5")) for m in range(10000)],
+        })
+        grid = regular_grid(T0 + timedelta(minutes=5000, seconds=30), T0 + timedelta(minutes=5010), timedelta(minutes=2))
+        resampled = resample(pricer, grid, method=method)
+        assert len(resampled._exact[0]) == (10 if method == 'linear' else 9)
+        for i, ts in enumerate(grid):
+            price = pricer.get_price('AAPL', ts)
+            if method == 'linear':
+                price += Decimal("0.5")  # 30 seconds into each one-minute step
+            assert resampled.prices_at(i) == {'AAPL': price}
+
+
+class TestLinear:
+    """Tests for linear interpolation."""
+
+    def test_interpolates_between_observations(self, pricer):
+        grid = [T0, T0 + timedelta(minutes=30), T0 + timedelta(hours=2, minutes=20)]
+        resampled = resample(pricer, grid, units=['AAPL'], method='linear')
+        assert resampled.values[0].tolist() == pytest.approx([100.0, 101.0, 103.0])
+        assert resampled.prices_at(1)['AAPL'] == Decimal("101")
+        assert resampled.prices_at(2)['AAPL'] == Decimal("103")
+
+    def test_carries_forward_past_last_observation(self, pricer):
+        grid = [T0 + timedelta(hours=4), T0 + timedelta(hours=6)]
+        resampled = resample(pricer, grid, units=['AAPL'], method='linear',
+                             ffill_limit=timedelta(hours=2))
+        assert resampled.prices_at(0) == {'AAPL': Decimal("101")}
+        assert resampled.prices_at(1) == {}
+
+    def test_before_first_observation(self, pricer):
+        resampled = resample(pricer, [T0 - timedelta(hours=1)], method='linear')
+        assert resampled.prices_at(0) == {}
+
+
+class TestValidation:
+    """Tests for argument validation."""
+
+    def test_unknown_method(self, pricer):
+        with pytest.raises(ValueError):
+            resample(pricer, [T0], method='cubic')
+
+    def test_unsorted_grid(self, pricer):
+        with pytest.raises(ValueError):
+            resample(pricer, [T0 + timedelta(hours=1), T0])
+
+
+class TestEngineFeed:
+    """Resampled prices feed the LifecycleEngine."""
+
+    def _engine(self, seen):
+        ledger = Ledger("test", verbose=False, test_mode=True)
+        ledger.register_unit(cash("USD", "US Dollar"))
+
+        def recording_contract(view, symbol, timestamp, prices):
+            seen.append((timestamp, dict(prices)))
+            return empty_pending_transaction(view)
+
+        engine = LifecycleEngine(ledger)
+        engine.register("CASH", recording_contract)
+        return engine
+
+    def test_run_and_run_stream(self, pricer):
+        grid = regular_grid(T0, T0 + timedelta(hours=3), timedelta(hours=1))
+        resampled = resample(pricer, grid)
+
+        seen_run = []
+        self._engine(seen_run).run(grid, resampled.price_fn())
+        seen_stream = []
+        list(self._engine(seen_stream).run_stream(resampled))
+        assert seen_run == seen_stream
+        assert seen_run[-1] == (grid[-1], {'AAPL': Decimal("101"), 'TSLA': Decimal("200.5")})
@@ -0,0 +1,205 @@
+"""
+test_vol_surface.py - Unit tests for vol_surface.py
+
+Tests:
+- VolSurface: knot recovery, PCHIP (no overshoot) and total-variance interpolation,
+  extrapolation, vectorized lookups, validation
+- VolSurfaceCache: rebuild only on changed inputs, versions
+- Delta hedge valuation on a surface
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from ledger import (
+    VolSurface, VolSurfaceCache,
+    compute_rebalance, get_hedge_state, delta_hedge_contract,
+)
+from .fake_view import FakeView
+
+
+STRIKES = [80.0, 90.0, 100.0, 110.0, 120.0]
+EXPIRIES = [21.0, 63.0, 252.0]
+VOLS = [
+    [0.32, 0.27, 0.24, 0.23, 0.25],
+    [0.29, 0.25, 0.22, 0.21, 0.22],
+    [0.26, 0.23, 0.21, 0.20, 0.20],
+]
+
+
+@pytest.fixture
+def surface():
+    return VolSurface("AAPL", STRIKES, EXPIRIES, VOLS)
+
+
+class TestVolSurface:
+    """Tests for VolSurface lookups."""
+
+    def test_recovers_knots(self, surface):
+        k, t = np.meshgrid(STRIKES, EXPIRIES)
+        np.testing.assert_allclose(surface.vol(k, t), VOLS, rtol=0, atol=1e-15)
+
+    def test_pchip_in_strike(self, surface):
+        from scipy.interpolate import PchipInterpolator
+        k = np.linspace(80.0, 120.0, 401)
+        for expiry, row in zip(EXPIRIES, VOLS):
+            np.testing.assert_allclose(surface.vol(k, expiry), PchipInterpolator(STRIKES, row)(k),
+                                       rtol=0, atol=1e-14)
+
+    def test_smile_is_smooth(self, surface):
+        # Continuous first derivative at the inner knots
+        eps = 1e-4
+        for knot in STRIKES[1:-1]:
+            left = surface.vol(np.array([knot - 2 * eps, knot - eps, knot]), 63.0)
+            right = surface.vol(np.array([knot, knot + eps, knot + 2 * eps]), 63.0)
+            assert (left[2] - left[1]) / eps == pytest.approx((right[1] - right[0]) / eps, abs=1e-5)
+
+    def test_total_variance_linear_in_time(self, surface):
+        t = 150.0
+        weight = (t - 63.0) / (252.0 - 63.0)
+        variance = (1 - weight) * 0.22 ** 2 * 63.0 + weight * 0.21 ** 2 * 252.0
+        assert surface.vol(100.0, t) == pytest.approx(np.sqrt(variance / t), abs=1e-15)
+
+    @pytest.mark.parametrize("vols", [
+        [0.8, 0.1, 0.1, 0.6],    # Natural spline dips below zero
+        [0.1, 0.1, 0.1, 0.9],    # Flat wing: natural spline overshoots to 0.66
+    ])
+    def test_no_overshoot(self, vols):
+        strikes = [50.0, 60.0, 100.0, 150.0]
+        surface = VolSurface("X", strikes, [21.0, 63.0], [vols, vols])
+        k = np.linspace(40.0, 160.0, 2401)
+        for t in (21.0, 40.0, 63.0):
+            smile = surface.vol(k, t)
+            assert smile.min() >= min(vols) - 1e-15
+            assert smile.max() <= max(vols) + 1e-15
+        # Between two equal knots the smile is flat
+        np.testing.assert_allclose(surface.vol(np.linspace(60.0, 100.0, 101), 21.0), 0.1, rtol=0, atol=1e-15)
+
+    def test_flat_extrapolation(self, surface):
+        assert surface.vol(50.0, 63.0) == pytest.approx(0.29)
+        assert surface.vol(500.0, 63.0) == pytest.approx(0.22)
+        assert surface.vol(100.0, 5.0) == pytest.approx(0.24)
+        assert surface.vol(100.0, 1000.0) == pytest.approx(0.21)
+
+    def test_vectorized_matches_scalar(self, surface):
+        rng = np.random.default_rng(7)
+        k = rng.uniform(60, 140, 2000)
+        t = rng.uniform(1, 400, 2000)
+        batch = surface.vol(k, t)
+        assert batch.shape == (2000,)
+        assert all(batch[i] == surface.vol(k[i], t[i]) for i in range(0, 2000, 97))
+        assert isinstance(surface.vol(100.0, 30.0), float)
+
+    def test_single_knot_surfaces(self):
+        flat = VolSurface("X", [100.0], [30.0], [[0.3]])
+        np.testing.assert_allclose(flat.vol([50.0, 100.0, 200.0], [5.0, 30.0, 90.0]), 0.3)
+        linear = VolSurface("X", [90.0, 110.0], [30.0], [[0.3, 0.2]])
+        assert linear.vol(100.0, 30.0) == pytest.approx(0.25)
+
+    @pytest.mark.parametrize("strikes, expiries, vols", [
+        ([], [30.0], [[]]),
+        ([100.0, 90.0], [30.0], [[0.2, 0.2]]),
+        ([90.0, 100.0], [30.0], [[0.2]]),
+        ([90.0, 100.0], [30.0], [[0.2, -0.1]]),
+        ([90.0, 100.0], [0.0], [[0.2, 0.2]]),
+    ])
+    def test_invalid_surfaces(self, strikes, expiries, vols):
+        with pytest.raises(ValueError):
+            VolSurface("X", strikes, expiries, vols)
+
+    def test_invalid_lookups(self, surface):
+        with pytest.raises(ValueError):
+            surface.vol(-1.0, 30.0)
+        with pytest.raises(ValueError):
+            surface.vol(100.0, 0.0)
+
+    def test_knots_are_read_only(self, surface):
+        with pytest.raises(ValueError):
+            surface.vols[0, 0] = 1.0
+
+
+class TestVolSurfaceCache:
+    """Tests for VolSurfaceCache."""
+
+    def test_rebuilds_only_on_changed_inputs(self):
+        cache = VolSurfaceCache()
+        first = cache.calibrate("AAPL", STRIKES, EXPIRIES, VOLS)
+        assert cache.calibrate("AAPL", list(STRIKES), tuple(EXPIRIES), np.array(VOLS)) is first
+        assert cache.version("AAPL") == 1
+
+        bumped = [row[:] for row in VOLS]
+        bumped[1][2] = 0.23
+        second = cache.calibrate("AAPL", STRIKES, EXPIRIES, bumped)
+        assert second is not first and cache.version("AAPL") == 2
+        assert cache.surface("AAPL") is second
+        assert cache.vol("AAPL", 100.0, 63.0) == pytest.approx(0.23)
+
+    def test_underlyings_are_independent(self):
+        cache = VolSurfaceCache()
+        cache.calibrate("AAPL", STRIKES, EXPIRIES, VOLS)
+        cache.calibrate("MSFT", [100.0], [30.0], [[0.4]])
+        assert cache.underlyings == ["AAPL", "MSFT"] and len(cache) == 2
+        assert cache.version("MSFT") == 1 and "TSLA" not in cache
+        assert cache.surface("TSLA") is None
+        with pytest.raises(ValueError):
+            cache.vol("TSLA", 100.0, 30.0)
+        cache.remove("MSFT")
+        assert "MSFT" not in cache and cache.version("MSFT") == 1
+
+
+def _hedge_view(volatility):
+    return FakeView(
+        balances={
+            'hedge_fund': {'AAPL': Decimal("0"), 'USD': Decimal("1000000")},
+            'market': {'AAPL': Decimal("100000"), 'USD': Decimal("1000000")},
+        },
+        states={
+            'HEDGE': {
+                'underlying': 'AAPL',
+                'strike': Decimal("110.0"),
+                'maturity': datetime(2025, 4, 1),
+                'volatility': volatility,
+                'risk_free_rate': Decimal("0.0"),
+                'num_options': Decimal("10"),
+                'option_multiplier': Decimal("100"),
+                'currency': 'USD',
+                'strategy_wallet': 'hedge_fund',
+                'market_wallet': 'market',
+                'current_shares': Decimal("0.0"),
+                'cumulative_cash': Decimal("0.0"),
+                'rebalance_count': 0,
+                'liquidated': False,
+            }
+        },
+        time=datetime(2025, 1, 1),
+    )
+
+
+class TestDeltaHedgeOnSurface:
+    """Delta hedge valuation reads the surface instead of the flat volatility."""
+
+    def test_surface_vol_replaces_flat_vol(self, surface):
+        spot = Decimal("100")
+        state = get_hedge_state(_hedge_view(Decimal("0.5")), 'HEDGE', spot, vol_surface=surface)
+        surface_vol = Decimal(str(surface.vol(110.0, state['time_to_maturity_days'])))
+        expected = get_hedge_state(_hedge_view(surface_vol), 'HEDGE', spot)
+        assert state['delta'] == expected['delta']
+        assert state['option_value'] == expected['option_value']
+
+        rebalance = compute_rebalance(_hedge_view(Decimal("0.5")), 'HEDGE', spot, vol_surface=surface)
+        flat = compute_rebalance(_hedge_view(surface_vol), 'HEDGE', spot)
+        assert rebalance.moves == flat.moves
+
+    def test_contract_uses_cached_surface_for_underlying(self):
+        cache = VolSurfaceCache()
+        view = _hedge_view(Decimal("0.5"))
+        prices = {'AAPL': Decimal("100")}
+        without = delta_hedge_contract(vol_surfaces=cache)(view, 'HEDGE', view.current_time, prices)
+        assert without.moves == compute_rebalance(view, 'HEDGE', Decimal("100"), Decimal("0.01")).moves
+
+        surface = cache.calibrate("AAPL", STRIKES, EXPIRIES, VOLS)
+        with_surface = delta_hedge_contract(vol_surfaces=cache)(view, 'HEDGE', view.current_time, prices)
+        expected = compute_rebalance(view, 'HEDGE', Decimal("100"), Decimal("0.01"), surface)
+        assert with_surface.moves == expected.moves
+        assert with_surface.moves != without.moves
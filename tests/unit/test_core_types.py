@@ -6,6 +6,8 @@ Tests:
 - Transaction: creation, validation, state_changes
 - UnitStateChange: creation, immutability
 - Unit: rounding, factories
+- is_terminal_state: lifecycle terminality by unit type
+- merge_pending_transactions: grouping of pending transactions
 """
 
 import pytest
@@ -15,7 +17,7 @@ from decimal import Decimal
 from ledger import (
     Move, Transaction, Unit, UnitStateChange,
     TransactionOrigin, OriginType,
-    cash,
+    PendingTransaction, cash, is_terminal_state, merge_pending_transactions,
 )
 
 
@@ -372,3 +374,58 @@ class TestUnitRounding:
         unit = Unit("NOROUND", "No Rounding", "STOCK", None, decimal_places=None)
         value = Decimal("100.123456789")
         assert unit.round(value) == value
+
+
+class TestTerminalState:
+    """Tests for is_terminal_state()."""
+
+    def test_settled_option_is_terminal(self):
+        assert is_terminal_state("BILATERAL_OPTION", {"settled": True})
+        assert not is_terminal_state("BILATERAL_OPTION", {"settled": False})
+
+    def test_autocallable_terminal_on_either_flag(self):
+        assert is_terminal_state("AUTOCALLABLE", {"autocalled": True, "settled": False})
+        assert is_terminal_state("AUTOCALLABLE", {"autocalled": False, "settled": True})
+
+    def test_borrow_record_uses_status(self):
+        assert is_terminal_state("BORROW_RECORD", {"status": "returned"})
+        assert is_terminal_state("BORROW_RECORD", {"status": "bought_in"})
+        assert not is_terminal_state("BORROW_RECORD", {"status": "recalled"})
+
+    def test_types_without_terminal_state(self):
+        assert not is_terminal_state("CASH", {"settled": True})
+        assert not is_terminal_state("STOCK", {"terminated": True})
+
+
+class TestMergePendingTransactions:
+    """Tests for merge_pending_transactions."""
+
+    T = datetime(2025, 1, 1)
+
+    def _pending(self, contract_id, unit):
+        return PendingTransaction(
+            moves=(Move(Decimal("1"), "USD", "alice", "bob", contract_id),),
+            state_changes=(UnitStateChange(unit, {}, {'settled': True}),),
+            origin=_test_origin(),
+            timestamp=self.T,
+        )
+
+    def test_merge_keeps_moves_and_state_changes(self):
+        origin = TransactionOrigin(OriginType.LIFECYCLE, "grouped")
+        merged = merge_pending_transactions(
+            [self._pending("c1", "OPT1"), self._pending("c2", "OPT2")], origin
+        )
+        assert [m.contract_id for m in merged.moves] == ["c1", "c2"]
+        assert [sc.unit for sc in merged.state_changes] == ["OPT1", "OPT2"]
+        assert merged.origin == origin
+        assert merged.timestamp == self.T
+
+    def test_merge_rejects_duplicate_state_change(self):
+        with pytest.raises(ValueError):
+            merge_pending_transactions(
+                [self._pending("c1", "OPT1"), self._pending("c2", "OPT1")], _test_origin()
+            )
+
+    def test_merge_rejects_empty(self):
+        with pytest.raises(ValueError):
+            merge_pending_transactions([], _test_origin())
@@ -7,17 +7,29 @@ Tests cover:
 3. Event priority ordering
 4. Handler registration and execution
 5. Event factory functions
+6. Event keys, cancellation and rescheduling
+7. CalendarEventScheduler equivalence with the heap backend
+8. Lazy recurring events
+9. Scheduler snapshots
+10. Concurrent handler execution
 """
 
 import pytest
+from dataclasses import replace
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 from ledger.scheduled_events import (
     Event,
     EventScheduler,
+    CalendarEventScheduler,
+    event_key,
+    RecurrenceRule,
+    RecurringEvent,
+    SchedulerSnapshot,
     dividend_event,
     coupon_event,
+    recurring_coupon_event,
     maturity_event,
     expiry_event,
     settlement_event,
@@ -142,6 +154,14 @@ class TestEventScheduler:
         assert scheduler.pending_count() == 1
         assert event_id == event.event_id
 
+    def test_event_id_is_cached(self):
+        """event_id is built once per event and survives replace() correctly."""
+        event = Event(trigger_time=datetime(2024, 6, 15), symbol="AAPL", action="dividend")
+        assert event.event_id is event.event_id
+        moved = replace(event, trigger_time=datetime(2024, 6, 16))
+        assert moved.event_id != event.event_id
+        assert moved == Event(trigger_time=datetime(2024, 6, 16), symbol="AAPL", action="dividend")
+
     def test_get_due_events(self):
         """get_due returns events due at or before timestamp."""
         scheduler = EventScheduler()
@@ -283,6 +303,394 @@ class TestEventScheduler:
         assert scheduler.pending_count() == 3
 
 
+class TestEventCancellation:
+    """Tests for event keys, cancel/reschedule and the executed set."""
+
+    def _event(self, symbol="BOND", day=15, action="coupon"):
+        return Event(trigger_time=datetime(2024, 6, day), symbol=symbol, action=action)
+
+    def test_event_key_is_deterministic(self):
+        """key is a stable 64-bit hash of event_id."""
+        event = self._event()
+        assert event.key == self._event().key == event_key(event.event_id)
+        assert 0 <= event.key < 2 ** 64
+        assert event.key != self._event(day=16).key
+
+    def test_schedule_duplicate_is_noop(self):
+        """Scheduling an already-pending event does not add it twice."""
+        scheduler = EventScheduler()
+        scheduler.schedule(self._event())
+        scheduler.schedule(self._event())
+        assert scheduler.pending_count() == 1
+        assert len(scheduler.get_due(datetime(2024, 6, 30))) == 1
+
+    def test_cancel(self):
+        """Cancelled events are not returned by get_due or peek_next."""
+        scheduler = EventScheduler()
+        first = self._event(day=15)
+        scheduler.schedule(first)
+        scheduler.schedule(self._event(day=16))
+
+        assert scheduler.cancel(first) is True
+        assert scheduler.cancel(first.event_id) is False
+        assert scheduler.pending_count() == 1
+        assert scheduler.peek_next().trigger_time == datetime(2024, 6, 16)
+        assert [e.trigger_time.day for e in scheduler.get_due(datetime(2024, 6, 30))] == [16]
+
+    def test_cancel_symbol(self):
+        """cancel_symbol drops every pending event for one symbol."""
+        scheduler = EventScheduler()
+        scheduler.schedule_many([self._event("BOND", d) for d in (15, 16, 17)])
+        scheduler.schedule(self._event("OTHER", 15))
+
+        cancelled = scheduler.cancel_symbol("BOND")
+        assert [e.trigger_time.day for e in cancelled] == [15, 16, 17]
+        assert scheduler.pending_for("BOND") == []
+        assert [e.symbol for e in scheduler.get_due(datetime(2024, 6, 30))] == ["OTHER"]
+
+    def test_reschedule(self):
+        """reschedule moves a pending event to a new time."""
+        scheduler = EventScheduler()
+        event = self._event(day=15)
+        scheduler.schedule(event)
+        scheduler.reschedule(event, datetime(2024, 6, 20))
+
+        assert scheduler.get_due(datetime(2024, 6, 19)) == []
+        due = scheduler.get_due(datetime(2024, 6, 20))
+        assert [e.trigger_time for e in due] == [datetime(2024, 6, 20)]
+
+    def test_reschedule_unknown_raises(self):
+        """Rescheduling an event that is not pending raises KeyError."""
+        with pytest.raises(KeyError):
+            EventScheduler().reschedule(self._event(), datetime(2024, 6, 20))
+
+    def test_stale_entries_compacted(self):
+        """Mass cancellation does not leave the heap growing."""
+        scheduler = EventScheduler()
+        events = [self._event(f"S{i}") for i in range(1000)]
+        scheduler.schedule_many(events)
+        for event in events[:900]:
+            scheduler.cancel(event)
+        assert scheduler.pending_count() == 100
+        assert len(scheduler._heap) < 500
+
+    def test_executed_set_is_bounded(self):
+        """Only the most recent max_executed keys are remembered."""
+        scheduler = EventScheduler(max_executed=2)
+        scheduler.register("coupon", lambda event, view, prices: None)
+        events = [self._event(day=d) for d in (15, 16, 17)]
+        for event in events:
+            scheduler.execute(event, None, {})
+        assert not scheduler.was_executed(events[0])
+        assert scheduler.was_executed(events[1]) and scheduler.was_executed(events[2])
+        assert list(scheduler._executed) == [events[1].key, events[2].key]
+
+    def test_executed_event_not_returned_again(self):
+        """Re-scheduling an executed event does not make it due again."""
+        scheduler = EventScheduler()
+        scheduler.register("coupon", lambda event, view, prices: None)
+        event = self._event()
+        scheduler.schedule(event)
+        for due in scheduler.get_due(datetime(2024, 6, 30)):
+            scheduler.execute(due, None, {})
+        scheduler.schedule(event)
+        assert scheduler.get_due(datetime(2024, 6, 30)) == []
+
+
+class TestCalendarEventScheduler:
+    """CalendarEventScheduler must behave exactly like EventScheduler."""
+
+    def _events(self, n=300):
+        import random
+        rng = random.Random(7)
+        start = datetime(2024, 1, 1)
+        return [
+            Event(
+                trigger_time=start + timedelta(days=rng.randrange(60), hours=rng.randrange(24)),
+                priority=rng.choice((0, 30, 40)),
+                symbol=f"S{rng.randrange(40)}",
+                action=rng.choice(("dividend", "coupon")),
+                params=(("i", str(i)),),
+            )
+            for i in range(n)
+        ]
+
+    def _drain(self, scheduler, step_days=3):
+        order = []
+        as_of = datetime(2024, 1, 1)
+        while scheduler.pending_count():
+            as_of += timedelta(days=step_days)
+            order.extend(e.event_id for e in scheduler.get_due(as_of))
+        return order
+
+    def test_same_order_as_heap_backend(self):
+        events = self._events()
+        heap, calendar = EventScheduler(), CalendarEventScheduler()
+        heap.schedule_many(events)
+        calendar.schedule_many(events)
+        assert self._drain(calendar) == self._drain(heap)
+
+    def test_interleaved_operations_match(self):
+        """Inserts into earlier days, cancels and reschedules mid-drain."""
+        events = self._events()
+        heap, calendar = EventScheduler(), CalendarEventScheduler()
+        for scheduler in (heap, calendar):
+            scheduler.schedule_many(events[:200])
+        orders = []
+        for scheduler in (heap, calendar):
+            order = [e.event_id for e in scheduler.get_due(datetime(2024, 1, 10, 12))]
+            for event in events[200:]:
+                scheduler.schedule(event)
+            for event in events[:200:7]:
+                scheduler.cancel(event)
+            scheduler.cancel_symbol("S3")
+            order.extend(e.event_id for e in scheduler.get_due(datetime(2024, 1, 20)))
+            order.extend(self._drain(scheduler))
+            orders.append(order)
+        assert orders[0] == orders[1]
+
+    def test_peek_and_count(self):
+        calendar = CalendarEventScheduler()
+        calendar.schedule(Event(datetime(2024, 6, 16), symbol="B", action="dividend"))
+        calendar.schedule(Event(datetime(2024, 6, 15, 12), symbol="A", action="dividend"))
+        assert calendar.peek_next().symbol == "A"
+        assert calendar.pending_count() == 2
+
+    def test_copy_preserves_backend(self):
+        calendar = CalendarEventScheduler()
+        calendar.schedule_many(self._events(20))
+        cloned = calendar.copy()
+        assert isinstance(cloned, CalendarEventScheduler)
+        assert self._drain(cloned) == self._drain(calendar)
+
+    def test_create_default_scheduler_calendar(self):
+        scheduler = create_default_scheduler(calendar=True)
+        assert isinstance(scheduler, CalendarEventScheduler)
+        assert "dividend" in scheduler._handlers
+
+
+class TestRecurringEvents:
+    """Lazy recurring events must match their fully expanded schedules."""
+
+    def test_month_end_does_not_drift(self):
+        rule = RecurrenceRule(start=datetime(2024, 1, 31), months=1, count=3)
+        assert list(rule.occurrences()) == [
+            datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31),
+        ]
+
+    def test_until_is_inclusive(self):
+        rule = RecurrenceRule(start=datetime(2024, 1, 1), days=7, until=datetime(2024, 1, 15))
+        assert [d.day for d in rule.occurrences()] == [1, 8, 15]
+
+    def test_invalid_rule(self):
+        with pytest.raises(ValueError):
+            RecurrenceRule(start=datetime(2024, 1, 1))
+        with pytest.raises(ValueError):
+            RecurrenceRule(start=datetime(2024, 1, 1), months=1, days=1)
+
+    def test_recurring_coupon_matches_coupon_event(self):
+        recurring = recurring_coupon_event("BOND", datetime(2024, 3, 15), Decimal("2.5"), "USD",
+                                           months=6, count=4)
+        expected = [
+            coupon_event("BOND", datetime(2024, 3, 15), Decimal("2.5"), "USD"),
+            coupon_event("BOND", datetime(2024, 9, 15), Decimal("2.5"), "USD"),
+            coupon_event("BOND", datetime(2025, 3, 15), Decimal("2.5"), "USD"),
+            coupon_event("BOND", datetime(2025, 9, 15), Decimal("2.5"), "USD"),
+        ]
+        assert recurring.expand() == expected
+
+    def test_only_next_occurrence_is_pending(self):
+        scheduler = EventScheduler()
+        scheduler.schedule_recurring(RecurringEvent(
+            RecurrenceRule(start=datetime(2024, 1, 1), months=1), symbol="S", action="dividend",
+        ))
+        assert scheduler.pending_count() == 1
+        due = scheduler.get_due(datetime(2024, 3, 1))
+        assert [e.trigger_time.month for e in due] == [1, 2, 3]
+        assert scheduler.peek_next().trigger_time == datetime(2024, 4, 1)
+
+    def test_lazy_order_identical_to_expanded(self):
+        recurring = [
+            RecurringEvent(RecurrenceRule(start=datetime(2024, 1, d), days=d + 3, count=12),
+                           symbol=f"S{d % 3}", action="coupon", priority=30 if d % 2 else 0,
+                           params=(("series", str(d)),))
+            for d in range(1, 10)
+        ]
+        one_offs = [Event(datetime(2024, 1, 1) + timedelta(days=i), symbol=f"S{i % 3}",
+                          action="dividend") for i in range(0, 90, 4)]
+
+        def drain(scheduler):
+            order, as_of = [], datetime(2024, 1, 1)
+            while scheduler.pending_count():
+                as_of += timedelta(days=5)
+                order.extend(e.event_id for e in scheduler.get_due(as_of))
+            return order
+
+        for cls in (EventScheduler, CalendarEventScheduler):
+            lazy, expanded = cls(), cls()
+            lazy.schedule_many(one_offs[:10])
+            expanded.schedule_many(one_offs[:10])
+            for r in recurring:
+                lazy.schedule_recurring(r)
+                expanded.schedule_many(r.expand())
+            lazy.schedule_many(one_offs[10:])
+            expanded.schedule_many(one_offs[10:])
+            assert drain(lazy) == drain(expanded)
+
+    def test_cancel_ends_recurrence(self):
+        scheduler = EventScheduler()
+        scheduler.schedule_recurring(RecurringEvent(
+            RecurrenceRule(start=datetime(2024, 1, 1), months=1, count=5), symbol="B", action="coupon",
+        ))
+        scheduler.get_due(datetime(2024, 2, 1))
+        assert len(scheduler.cancel_symbol("B")) == 1
+        assert scheduler.get_due(datetime(2025, 1, 1)) == []
+
+    def test_reschedule_moves_one_occurrence(self):
+        scheduler = EventScheduler()
+        scheduler.schedule_recurring(RecurringEvent(
+            RecurrenceRule(start=datetime(2024, 1, 1), months=1, count=3), symbol="B", action="coupon",
+        ))
+        scheduler.reschedule(scheduler.peek_next(), datetime(2024, 1, 2))
+        due = scheduler.get_due(datetime(2024, 12, 31))
+        assert [e.trigger_time for e in due] == [
+            datetime(2024, 1, 2), datetime(2024, 2, 1), datetime(2024, 3, 1),
+        ]
+
+    def test_copy_keeps_recurrence(self):
+        scheduler = EventScheduler()
+        scheduler.schedule_recurring(RecurringEvent(
+            RecurrenceRule(start=datetime(2024, 1, 1), months=1, count=3), symbol="B", action="coupon",
+        ))
+        cloned = scheduler.copy()
+        assert len(cloned.get_due(datetime(2024, 12, 31))) == 3
+        assert scheduler.pending_count() == 1
+
+
+class TestSchedulerSnapshot:
+    """Snapshot/restore of scheduler state."""
+
+    def _scheduler(self, cls=EventScheduler):
+        scheduler = cls()
+        scheduler.register("coupon", lambda event, view, prices: None)
+        scheduler.schedule_many([
+            coupon_event(f"B{i}", datetime(2024, 1, 1) + timedelta(days=10 * i), Decimal("1"), "USD")
+            for i in range(10)
+        ])
+        scheduler.schedule_recurring(recurring_coupon_event(
+            "R", datetime(2024, 1, 5), Decimal("2"), "USD", months=1, count=12,
+        ))
+        for event in scheduler.get_due(datetime(2024, 2, 1)):
+            scheduler.execute(event, None, {})
+        return scheduler
+
+    def _drain(self, scheduler):
+        return [e.event_id for e in scheduler.get_due(datetime(2030, 1, 1))]
+
+    def test_round_trip_bytes(self):
+        scheduler = self._scheduler()
+        snapshot = scheduler.snapshot(ledger_sequence=7)
+        decoded = SchedulerSnapshot.from_bytes(snapshot.to_bytes())
+        assert decoded == snapshot
+
+    def test_restore_continues_identically(self):
+        for cls in (EventScheduler, CalendarEventScheduler):
+            original = self._scheduler(cls)
+            data = original.snapshot(ledger_sequence=3).to_bytes()
+
+            restored = cls()
+            restored.restore(SchedulerSnapshot.from_bytes(data), ledger_sequence=3)
+            assert restored.pending_count() == original.pending_count()
+            assert self._drain(restored) == self._drain(original)
+
+    def test_restore_keeps_executed(self):
+        original = self._scheduler()
+        executed = Event(datetime(2024, 1, 1), priority=30, symbol="B0", action="coupon",
+                         params=(("coupon_amount", "1"), ("currency", "USD")))
+        assert original.was_executed(executed)
+
+        restored = EventScheduler()
+        restored.restore(original.snapshot(0))
+        assert restored.was_executed(executed)
+        restored.schedule(executed)
+        assert restored.get_due(datetime(2024, 1, 1)) == []
+
+    def test_sequence_mismatch_raises(self):
+        from ledger import LedgerError
+        snapshot = self._scheduler().snapshot(ledger_sequence=5)
+        with pytest.raises(LedgerError):
+            EventScheduler().restore(snapshot, ledger_sequence=6)
+
+
+class TestConcurrentHandlers:
+    """step() with an executor returns the same transactions in the same order."""
+
+    T = datetime(2024, 6, 15)
+
+    def _ledger(self):
+        from ledger import Ledger, cash
+        ledger = Ledger("test", verbose=False, test_mode=True, initial_time=self.T)
+        ledger.register_unit(cash("USD", "US Dollar"))
+        return ledger
+
+    def _handler(self, event, view, prices):
+        from ledger import Move, build_transaction
+        if event.symbol == "FAIL":
+            raise ValueError("handler failed")
+        return build_transaction(view, [
+            Move(Decimal(event.params_dict["amount"]), "USD", "issuer", event.symbol, event.event_id)
+        ])
+
+    def _scheduler(self, executor=None):
+        scheduler = EventScheduler(executor=executor)
+        scheduler.register("pay", self._handler)
+        scheduler.schedule_many([
+            Event(self.T, priority=p, symbol=f"S{i}", action="pay", params=(("amount", str(i + 1 + p)),))
+            for p in (0, 30) for i in range(50)
+        ])
+        return scheduler
+
+    def test_same_results_as_sequential(self):
+        from concurrent.futures import ThreadPoolExecutor
+        ledger = self._ledger()
+        sequential = self._scheduler().step(self.T, ledger, {})
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            concurrent = self._scheduler(pool).step(self.T, ledger, {})
+        assert [tx.intent_id for tx in concurrent] == [tx.intent_id for tx in sequential]
+        assert len(concurrent) == 100
+
+    def test_independent_batches(self):
+        due = [
+            Event(self.T, 0, "A", "pay"), Event(self.T, 0, "B", "pay"),
+            Event(self.T, 0, "A", "pay", (("n", "2"),)),
+            Event(self.T, 30, "C", "pay"),
+        ]
+        batches = EventScheduler._independent_batches(due)
+        assert [[e.symbol for e in b] for b in batches] == [["A", "B"], ["A"], ["C"]]
+
+    def test_first_exception_in_order_propagates(self):
+        from concurrent.futures import ThreadPoolExecutor
+        events = [Event(self.T, 0, sym, "pay", (("amount", "1"),)) for sym in ("A", "FAIL", "Z")]
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            scheduler = EventScheduler(executor=pool)
+            scheduler.register("pay", self._handler)
+            scheduler.schedule_many(events)
+            with pytest.raises(ValueError, match="handler failed"):
+                scheduler.step(self.T, self._ledger(), {})
+        # As with sequential execution: A ran, FAIL and Z did not complete
+        assert scheduler.was_executed(events[0])
+        assert not scheduler.was_executed(events[1])
+        assert not scheduler.was_executed(events[2])
+
+    def test_copy_and_pickle(self):
+        import pickle
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            scheduler = EventScheduler(executor=pool)
+            assert scheduler.copy().executor is pool
+            assert pickle.loads(pickle.dumps(scheduler)).executor is None
+
+
 class TestEventFactoryFunctions:
     """Tests for event factory functions."""
 